@@ -0,0 +1,6 @@
+"""Benchmarks.
+
+Run a benchmark module from the repository root, e.g.::
+
+    python -m benchmarks.signature
+"""
@@ -0,0 +1,74 @@
+"""Bulk load: fixed and adaptive concurrency against an overloaded gateway.
+
+Runs `get_payment_statuses` against the mock server with injected latency
+and a capacity, over which the calls are responded with HTTP 503, and
+reports the calls served per second, the overloaded calls and the final
+adaptive limit::
+
+    python -m benchmarks.bulk_load --capacity 8 --latency 0.02
+"""
+
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+from httprest.http.errors import HTTPError
+
+from csobpg.v19.api import APIClient
+from csobpg.v19.bulk import Concurrency
+from csobpg.v19.concurrency import AdaptiveConcurrency
+from csobpg.v19.mock import MockGateway, MockServer
+
+from .fixtures import PRIVATE_KEY, PUBLIC_KEY
+
+
+def run(client: APIClient, calls: int, concurrency: Concurrency) -> str:
+    """Run the bulk statuses and return the report line."""
+    started = time.perf_counter()
+    overloaded = sum(
+        isinstance(result.error, HTTPError)
+        for result in client.get_payment_statuses(
+            (f"pid{i}" for i in range(calls)), concurrency
+        )
+    )
+    elapsed = time.perf_counter() - started
+    if isinstance(concurrency, AdaptiveConcurrency):
+        name = f"adaptive (limit {concurrency.limit})"
+    else:
+        name = f"fixed {concurrency}"
+    return (
+        f"{name:<40} {(calls - overloaded) / elapsed:10.1f} served/s"
+        f" {overloaded / calls:8.1%} overloaded"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bulk_load", description=__doc__
+    )
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--capacity", type=int, default=8)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[4, 16, 64]
+    )
+    parser.add_argument("--max-limit", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    # the responses are verified with the fixtures' public key
+    gateway = MockGateway(
+        PUBLIC_KEY, PRIVATE_KEY, latency=args.latency, capacity=args.capacity
+    )
+    with MockServer(gateway) as server:
+        client = APIClient("mid", PRIVATE_KEY, PUBLIC_KEY, server.url)
+        for concurrency in args.concurrency:
+            print(run(client, args.calls, concurrency))
+        adaptive = AdaptiveConcurrency(max_limit=args.max_limit)
+        print(run(client, args.calls, adaptive))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Per-call cost of signing and verification per crypto backend.
+
+The OpenSSL backend is skipped if the `cryptography` package is not
+installed.
+"""
+
+import timeit
+
+from csobpg.v19.crypto import CryptoBackend, PycryptodomeBackend
+from csobpg.v19.key import RAMRSAKey
+from csobpg.v19.signature import sign, verify
+
+PRIVATE_KEY_PATH = "tests/v19/data/merchant.key"
+PUBLIC_KEY_PATH = "tests/v19/data/merchant.pub"
+TEXT = b"merchantId|payId|20240101000000"
+NUMBER = 500
+
+
+def _report(name: str, seconds: float) -> None:
+    print(f"{name:<40} {seconds / NUMBER * 1e6:10.1f} us/call")
+
+
+def _bench(name: str, backend: CryptoBackend) -> None:
+    signer = backend.signer(RAMRSAKey(PRIVATE_KEY_PATH))
+    verifier = backend.signer(RAMRSAKey(PUBLIC_KEY_PATH))
+    signature = sign(TEXT, signer)
+
+    _report(
+        f"sign ({name})",
+        timeit.timeit(lambda: sign(TEXT, signer), number=NUMBER),
+    )
+    _report(
+        f"verify ({name})",
+        timeit.timeit(
+            lambda: verify(signature, TEXT, verifier), number=NUMBER
+        ),
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    _bench("pycryptodome", PycryptodomeBackend())
+    try:
+        # pylint:disable=import-outside-toplevel
+        from csobpg.v19.crypto.openssl import OpenSSLBackend
+    except ImportError:
+        print("cryptography is not installed, skipping OpenSSL")
+        return
+    _bench("OpenSSL", OpenSSLBackend())
+
+
+if __name__ == "__main__":
+    main()
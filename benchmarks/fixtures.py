@@ -0,0 +1,291 @@
+"""Realistic requests and signed responses for the benchmarks."""
+
+import copy
+from typing import Callable, Dict, List, Tuple, Type
+
+from csobpg.v19 import request as _request
+from csobpg.v19 import response as _response
+from csobpg.v19.key import RAMRSAKey
+from csobpg.v19.models import customer, order
+from csobpg.v19.models.cart import Cart, CartItem
+from csobpg.v19.models.currency import Currency
+from csobpg.v19.models.fingerprint import Browser, Fingerprint
+from csobpg.v19.request.base import BaseRequest
+from csobpg.v19.response.base import Response
+from csobpg.v19.signature import sign
+
+PRIVATE_KEY = RAMRSAKey("tests/v19/data/merchant.key")
+PUBLIC_KEY = RAMRSAKey("tests/v19/data/merchant.pub")
+
+MERCHANT_ID = "A1029DTmM7"
+PAY_ID = "d165e3c4b8ab9AB"
+RETURN_URL = "https://shop.example.com/checkout/return"
+DTTM = "20240101120000"
+
+
+def _cart() -> Cart:
+    return Cart(
+        [
+            CartItem("Wireless headphones", 1, 249900, "Noise cancelling"),
+            CartItem("Shipping", 1, 9900, "DPD courier"),
+        ]
+    )
+
+
+def _customer() -> customer.CustomerData:
+    return customer.CustomerData(
+        "Jan Novák",
+        "jan.novak@example.com",
+        mobile_phone=customer.PhoneNumber("420", "800123456"),
+        account=customer.AccountData(
+            "2022-06-01T10:00:00+02:00",
+            "2023-11-20T08:15:00+01:00",
+            order_history=12,
+            payment_day=1,
+            payment_year=7,
+        ),
+        login=customer.LoginData(
+            customer.AuthMethod.ACCOUNT, "2024-01-01T11:55:00+01:00"
+        ),
+    )
+
+
+def _order() -> order.OrderData:
+    address = order.AddressData(
+        "Karlova 1", "CZE", "Praha 1", "11000", address2="3. patro"
+    )
+    return order.OrderData(
+        order.OrderType.PURCHASE,
+        order.OrderAvailability.NOW,
+        order.DeliveryData(
+            order.DeliveryIndicator.SHIPPING_VERIFIED,
+            order.DeliveryMode.NEXT_DAY,
+        ),
+        name_match=True,
+        address_match=True,
+        billing=address,
+        shipping=address,
+        reorder=False,
+    )
+
+
+def _fingerprint() -> Fingerprint:
+    return Fingerprint(
+        Browser(
+            "Mozilla/5.0 (X11; Linux x86_64; rv:120.0) Firefox/120.0",
+            "text/html,application/xhtml+xml",
+            "cs-CZ",
+            True,
+            color_depth=24,
+            screen_height=1080,
+            screen_width=1920,
+            timezone=60,
+        )
+    )
+
+
+#: request builders by request class name
+REQUESTS: Dict[str, Callable[[], BaseRequest]] = {
+    "PaymentInitRequest": lambda: _request.PaymentInitRequest(
+        MERCHANT_ID,
+        PRIVATE_KEY,
+        "5547",
+        259800,
+        RETURN_URL,
+        cart=_cart(),
+        customer=_customer(),
+        order=_order(),
+        merchant_data=b"order-5547",
+        customer_id="customer-1234",
+    ),
+    "PaymentStatusRequest": lambda: _request.PaymentStatusRequest(
+        MERCHANT_ID, PRIVATE_KEY, PAY_ID
+    ),
+    "PaymentProcessRequest": lambda: _request.PaymentProcessRequest(
+        MERCHANT_ID, PRIVATE_KEY, PAY_ID
+    ),
+    "PaymentCloseRequest": lambda: _request.PaymentCloseRequest(
+        MERCHANT_ID, PRIVATE_KEY, PAY_ID, 259800
+    ),
+    "PaymentReverseRequest": lambda: _request.PaymentReverseRequest(
+        MERCHANT_ID, PRIVATE_KEY, PAY_ID
+    ),
+    "PaymentRefundRequest": lambda: _request.PaymentRefundRequest(
+        MERCHANT_ID, PRIVATE_KEY, PAY_ID, 9900
+    ),
+    "EchoRequest": lambda: _request.EchoRequest(MERCHANT_ID, PRIVATE_KEY),
+    "OneClickEchoRequest": lambda: _request.OneClickEchoRequest(
+        MERCHANT_ID, PRIVATE_KEY, PAY_ID
+    ),
+    "OneClickPaymentInitRequest": lambda: _request.OneClickPaymentInitRequest(
+        MERCHANT_ID,
+        PRIVATE_KEY,
+        PAY_ID,
+        "5548",
+        RETURN_URL,
+        client_ip="203.0.113.10",
+        total_amount=259800,
+        currency=Currency.CZK,
+        close_payment=True,
+        customer=_customer(),
+        order=_order(),
+        merchant_data=b"order-5548",
+    ),
+    "OneClickPaymentProcessRequest": lambda: (
+        _request.OneClickPaymentProcessRequest(
+            MERCHANT_ID, PRIVATE_KEY, PAY_ID, _fingerprint()
+        )
+    ),
+    "GooglePayEchoRequest": lambda: _request.GooglePayEchoRequest(
+        MERCHANT_ID, PRIVATE_KEY
+    ),
+    "GooglePayInitRequest": lambda: _request.GooglePayInitRequest(
+        MERCHANT_ID,
+        PRIVATE_KEY,
+        "5549",
+        RETURN_URL,
+        client_ip="203.0.113.10",
+        total_amount=259800,
+        currency=Currency.CZK,
+        close_payment=True,
+        payload='{"signature":"MEUCIQ","protocolVersion":"ECv2"}',
+        customer=_customer(),
+        order=_order(),
+    ),
+    "GooglePayProcessRequest": lambda: _request.GooglePayProcessRequest(
+        MERCHANT_ID, PRIVATE_KEY, PAY_ID, _fingerprint()
+    ),
+    "ApplePayEchoRequest": lambda: _request.ApplePayEchoRequest(
+        MERCHANT_ID, PRIVATE_KEY
+    ),
+    "ApplePayInitRequest": lambda: _request.ApplePayInitRequest(
+        MERCHANT_ID,
+        PRIVATE_KEY,
+        "5550",
+        RETURN_URL,
+        client_ip="203.0.113.10",
+        total_amount=259800,
+        currency=Currency.CZK,
+        close_payment=True,
+        payload='{"version":"EC_v1","data":"3+f4oOTwPa6f1UZ6tG"}',
+        customer=_customer(),
+        order=_order(),
+    ),
+    "ApplePayProcessRequest": lambda: _request.ApplePayProcessRequest(
+        MERCHANT_ID, PRIVATE_KEY, PAY_ID, _fingerprint()
+    ),
+}
+
+_ACTIONS = {
+    "fingerprint": {
+        "browserInit": {"url": "https://acs.example.com/3ds/fingerprint"},
+    },
+    "authenticate": {
+        "browserChallenge": {
+            "url": "https://acs.example.com/3ds/challenge",
+            "method": "POST",
+            "vars": {"creq": "ewogICJtZXNzYWdlVHlwZSIgOiAiQ1JlcSIK"},
+        },
+    },
+}
+
+_GOOGLEPAY_INIT_PARAMS = {
+    "apiVersion": 2,
+    "apiVersionMinor": 0,
+    "paymentMethodType": "CARD",
+    "allowedCardNetworks": ["VISA", "MASTERCARD"],
+    "allowedCardAuthMethods": ["CRYPTOGRAM_3DS"],
+    "assuranceDetailsRequired": True,
+    "billingAddressRequired": True,
+    "billingAddressParametersFormat": "FULL",
+    "tokenizationSpecificationType": "PAYMENT_GATEWAY",
+    "gateway": "csob",
+    "gatewayMerchantId": MERCHANT_ID,
+    "googlepayMerchantId": "01234567890123456789",
+    "merchantName": "Example shop",
+    "environment": "TEST",
+    "totalPriceStatus": "FINAL",
+    "countryCode": "CZ",
+}
+
+
+def _payment(status: int, **fields) -> dict:
+    return {"payId": PAY_ID, "paymentStatus": status, **fields}
+
+
+#: unsigned response bodies by response class
+_RESPONSES: List[Tuple[Type[Response], dict]] = [
+    (_response.PaymentInitResponse, _payment(1)),
+    (
+        _response.PaymentStatusResponse,
+        _payment(4, authCode="637413", statusDetail="OK", actions=_ACTIONS),
+    ),
+    (
+        _response.PaymentProcessResponse,
+        _payment(
+            4,
+            authCode="637413",
+            merchantData="b3JkZXItNTU0Nw==",
+            statusDetail="OK",
+        ),
+    ),
+    (_response.PaymentCloseResponse, _payment(7, authCode="637413")),
+    (_response.PaymentReverseResponse, _payment(5)),
+    (_response.PaymentRefundResponse, _payment(9, authCode="637413")),
+    (_response.OneClickEchoResponse, {"origPayId": PAY_ID}),
+    (
+        _response.OneClickPaymentInitResponse,
+        _payment(1, statusDetail="OK", actions=_ACTIONS),
+    ),
+    (
+        _response.OneClickPaymentProcessResponse,
+        _payment(2, statusDetail="OK", actions=_ACTIONS),
+    ),
+    (_response.GooglePayEchoResponse, {"initParams": _GOOGLEPAY_INIT_PARAMS}),
+    (
+        _response.GooglePayInitResponse,
+        _payment(1, statusDetail="OK", actions=_ACTIONS),
+    ),
+    (
+        _response.GooglePayProcessResponse,
+        _payment(2, statusDetail="OK", actions=_ACTIONS),
+    ),
+    (
+        _response.ApplePayEchoResponse,
+        {"initParams": "countryCode=CZ|VISA|MASTERCARD|supports3DS"},
+    ),
+    (
+        _response.ApplePayInitResponse,
+        _payment(1, statusDetail="OK", actions=_ACTIONS),
+    ),
+    (
+        _response.ApplePayProcessResponse,
+        _payment(2, statusDetail="OK", actions=_ACTIONS),
+    ),
+]
+
+#: response classes whose signature is not verified by `from_json`
+_UNVERIFIED = (_response.GooglePayEchoResponse, _response.ApplePayEchoResponse)
+
+
+def _signed(response_cls: Type[Response], fields: dict) -> dict:
+    body = {"dttm": DTTM, "resultCode": 0, "resultMessage": "OK", **fields}
+    if issubclass(response_cls, _UNVERIFIED):
+        body["signature"] = "unverified"
+    else:
+        # pylint:disable=protected-access
+        obj = response_cls._from_json(
+            copy.deepcopy(body), DTTM, 0, "OK"
+        )  # type: ignore
+        body["signature"] = sign(obj.to_sign_text().encode(), PRIVATE_KEY)
+    return body
+
+
+def responses() -> Dict[str, Tuple[Type[Response], dict]]:
+    """Return signed response bodies by response class name.
+
+    `Response.from_json` pops the signature, so pass a copy of the body.
+    """
+    return {
+        cls.__name__: (cls, _signed(cls, fields)) for cls, fields in _RESPONSES
+    }
@@ -0,0 +1,203 @@
+"""Per-call hot paths: request build, sign, serialize, parse and verify.
+
+Measures throughput (ops/sec) and the peak memory allocated by a single
+call of every case, writes the results as JSON and compares them against a
+stored baseline::
+
+    python -m benchmarks.hot_paths --output results.json
+    python -m benchmarks.hot_paths --baseline benchmarks/baseline.json
+    python -m benchmarks.hot_paths --save-baseline benchmarks/baseline.json
+
+The exit code is 1 if any case regressed by more than the threshold.
+Throughput depends on the machine, so regenerate the baseline on the
+machine the comparison runs on.
+"""
+
+import argparse
+import copy
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from csobpg.v19.signature import sign, verify, verify_many
+
+from . import fixtures
+
+Case = Tuple[str, Callable[[], object]]
+
+
+def _request_cases() -> Iterator[Case]:
+    for name, build in fixtures.REQUESTS.items():
+        request = build()
+        # payment/status and payment/process are signed when built
+        yield f"build/{name}", build
+        yield f"to_sign_text/{name}", request.to_sign_text
+        yield f"as_json/{name}", request._as_json  # pylint:disable=W0212
+        yield f"to_json/{name}", request.to_json
+
+
+def _signature_cases() -> Iterator[Case]:
+    short = fixtures.REQUESTS["PaymentStatusRequest"]()
+    long = fixtures.REQUESTS["PaymentInitRequest"]()
+    for size, request in (("short", short), ("long", long)):
+        text = request.to_sign_text().encode()
+        signature = sign(text, fixtures.PRIVATE_KEY)
+        yield f"sign/{size}", lambda t=text: sign(t, fixtures.PRIVATE_KEY)
+        yield f"verify/{size}", lambda s=signature, t=text: verify(
+            s, t, fixtures.PUBLIC_KEY
+        )
+        yield f"verify_many/{size}x100", lambda i=[(signature, text)] * 100: (
+            verify_many(i, fixtures.PUBLIC_KEY)
+        )
+
+
+def _response_cases() -> Iterator[Case]:
+    for name, (cls, body) in fixtures.responses().items():
+        yield f"from_json/{name}", lambda c=cls, b=body: c.from_json(
+            copy.deepcopy(b), fixtures.PUBLIC_KEY
+        )
+
+
+def cases() -> List[Case]:
+    """Return all benchmark cases."""
+    return [*_request_cases(), *_signature_cases(), *_response_cases()]
+
+
+def _ops_per_sec(func: Callable, min_time: float, repeat: int) -> float:
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed))
+    best = min([elapsed, *timer.repeat(repeat - 1, number)])
+    return number / best
+
+
+def _alloc_bytes(func: Callable) -> int:
+    func()  # warm up caches
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - start
+
+
+def run(
+    selected: List[Case], min_time: float = 0.05, repeat: int = 5
+) -> Dict[str, dict]:
+    """Run the benchmark cases.
+
+    :param min_time: minimal duration of a single timing run in seconds
+    :param repeat: number of timing runs. The best one is reported
+    """
+    results = {}
+    for name, func in selected:
+        results[name] = {
+            "ops_per_sec": round(_ops_per_sec(func, min_time, repeat), 1),
+            "alloc_bytes": _alloc_bytes(func),
+        }
+        print(
+            f"{name:<48} {results[name]['ops_per_sec']:>12.1f} ops/s"
+            f" {results[name]['alloc_bytes']:>9} B",
+            file=sys.stderr,
+        )
+    return results
+
+
+def compare(
+    results: Dict[str, dict], baseline: Dict[str, dict], threshold: float
+) -> List[str]:
+    """Return regressions of results against the baseline.
+
+    :param threshold: allowed relative slowdown or allocation growth
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        speed = result["ops_per_sec"] / base["ops_per_sec"]
+        if speed < 1 - threshold:
+            regressions.append(
+                f"{name}: {result['ops_per_sec']:.1f} ops/s, "
+                f"{(1 - speed) * 100:.0f}% slower than baseline"
+            )
+        # small absolute differences are interpreter noise
+        growth = result["alloc_bytes"] - base["alloc_bytes"]
+        if growth > 256 and growth > base["alloc_bytes"] * threshold:
+            regressions.append(
+                f"{name}: {result['alloc_bytes']} B allocated, "
+                f"{growth} B more than baseline"
+            )
+    return regressions
+
+
+def _dump(path: str, results: Dict[str, dict]) -> None:
+    with open(path, "w", encoding="utf8") as file:
+        json.dump(
+            {"python": platform.python_version(), "results": results},
+            file,
+            indent=2,
+            sort_keys=True,
+        )
+        file.write("\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.hot_paths", description=__doc__
+    )
+    parser.add_argument(
+        "-k", "--filter", help="run only cases containing this substring"
+    )
+    parser.add_argument("--output", help="file to write JSON results to")
+    parser.add_argument("--baseline", help="baseline JSON to compare with")
+    parser.add_argument(
+        "--save-baseline", metavar="PATH", help="write results as baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed relative regression (default: %(default)s)",
+    )
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    selected = [
+        case for case in cases() if not args.filter or args.filter in case[0]
+    ]
+    results = run(selected, args.min_time, args.repeat)
+
+    if args.output:
+        _dump(args.output, results)
+    if args.save_baseline:
+        _dump(args.save_baseline, results)
+    if not args.output and not args.save_baseline:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
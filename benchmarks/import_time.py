@@ -0,0 +1,84 @@
+"""Cold start: import time of the package in a new interpreter.
+
+Every case runs in fresh interpreters and the best run is reported. The
+exit code is 1 if any case takes longer than its target::
+
+    python -m benchmarks.import_time
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import List, NamedTuple, Optional
+
+from .fixtures import PRIVATE_KEY
+
+
+class Case(NamedTuple):
+    """Import time case."""
+
+    name: str
+    code: str
+    #: maximal import time in milliseconds
+    target_ms: float
+
+
+CASES = [
+    Case("import csobpg.v19", "import csobpg.v19", 20),
+    Case("APIClient", "from csobpg.v19 import APIClient", 60),
+    Case("AsyncAPIClient", "from csobpg.v19 import AsyncAPIClient", 80),
+    Case(
+        "first signed request",
+        "from csobpg.v19.key import RAMRSAKey\n"
+        "from csobpg.v19.request import PaymentStatusRequest\n"
+        f"PaymentStatusRequest('m', RAMRSAKey({PRIVATE_KEY.path!r}), 'p')",
+        100,
+    ),
+]
+
+_TIMER = """
+import time
+started = time.perf_counter()
+exec({code!r})
+print(time.perf_counter() - started)
+"""
+
+
+def import_ms(code: str, runs: int) -> float:
+    """Return the best time of the code in new interpreters in ms."""
+    return min(
+        float(
+            subprocess.run(
+                [sys.executable, "-c", _TIMER.format(code=code)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        )
+        * 1000
+        for _ in range(runs)
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.import_time", description=__doc__
+    )
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for case in CASES:
+        elapsed = import_ms(case.code, args.runs)
+        over = elapsed > case.target_ms
+        failed |= over
+        print(
+            f"{case.name:<40} {elapsed:8.1f} ms"
+            f" (target {case.target_ms:.0f} ms){' OVER' if over else ''}"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Memory held by models and responses kept in memory in bulk.
+
+Reports the bytes allocated per object, including its nested models but
+not the values shared with the parsed JSON, e.g. strings::
+
+    python -m benchmarks.memory
+"""
+
+import argparse
+import sys
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from csobpg.v19.models.actions import Actions, Endpoint
+from csobpg.v19.models.cart import CartItem
+from csobpg.v19.response import PaymentStatusResponse
+
+from . import fixtures
+
+
+def _status_body() -> dict:
+    _, body = fixtures.responses()["PaymentStatusResponse"]
+    return body
+
+
+def cases() -> Dict[str, Callable[[], object]]:
+    """Return object factories by name."""
+    body = _status_body()
+    actions = body["actions"]
+    challenge = actions["authenticate"]["browserChallenge"]
+    # pylint:disable=protected-access
+    return {
+        "PaymentStatusResponse": lambda: PaymentStatusResponse._from_json(
+            body, body["dttm"], 0, "OK"
+        ),
+        "Actions": lambda: Actions.from_json(actions),
+        "Endpoint": lambda: Endpoint.from_json(challenge),
+        "CartItem": lambda: CartItem("Shipping", 1, 9900, "DPD courier"),
+    }
+
+
+def bytes_per_object(factory: Callable[[], object], number: int) -> float:
+    """Return bytes allocated per object created by the factory."""
+    factory()  # warm up caches
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        objects = [factory() for _ in range(number)]
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (current - start - sys.getsizeof(objects)) / number
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.memory", description=__doc__
+    )
+    parser.add_argument("--number", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    for name, factory in cases().items():
+        print(
+            f"{name:<40} {bytes_per_object(factory, args.number):10.1f}"
+            " B/object"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
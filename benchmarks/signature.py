@@ -0,0 +1,57 @@
+"""Per-call cost of signing and verification.
+
+Compares passing the PEM text (the key is read and parsed on every call)
+against passing an `RSAKey` (the parsed key is cached).
+"""
+
+import timeit
+
+from csobpg.v19.key import FileRSAKey, RAMRSAKey
+from csobpg.v19.signature import sign, verify
+
+PRIVATE_KEY_PATH = "tests/v19/data/merchant.key"
+PUBLIC_KEY_PATH = "tests/v19/data/merchant.pub"
+TEXT = b"merchantId|payId|20240101000000"
+NUMBER = 200
+
+
+def _report(name: str, seconds: float) -> None:
+    print(f"{name:<40} {seconds / NUMBER * 1e6:10.1f} us/call")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    private_key = FileRSAKey(PRIVATE_KEY_PATH)
+    public_key = RAMRSAKey(PUBLIC_KEY_PATH)
+    signature = sign(TEXT, private_key)
+
+    def read_pem(path: str) -> str:
+        with open(path, encoding="utf8") as file:
+            return file.read()
+
+    _report(
+        "sign (read + parse PEM per call)",
+        timeit.timeit(
+            lambda: sign(TEXT, read_pem(PRIVATE_KEY_PATH)), number=NUMBER
+        ),
+    )
+    _report(
+        "sign (cached RSAKey)",
+        timeit.timeit(lambda: sign(TEXT, private_key), number=NUMBER),
+    )
+    _report(
+        "verify (parse PEM per call)",
+        timeit.timeit(
+            lambda: verify(signature, TEXT, str(public_key)), number=NUMBER
+        ),
+    )
+    _report(
+        "verify (cached RSAKey)",
+        timeit.timeit(
+            lambda: verify(signature, TEXT, public_key), number=NUMBER
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
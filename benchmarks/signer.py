@@ -0,0 +1,45 @@
+"""Signing throughput of the process pool signer.
+
+Compares signing in threads of the current process (serialized by the GIL)
+against `ProcessPoolSigner` with one worker process per CPU.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from csobpg.v19.key import RAMRSAKey
+from csobpg.v19.signature import KeyType, sign
+from csobpg.v19.signer import ProcessPoolSigner
+
+PRIVATE_KEY_PATH = "tests/v19/data/merchant.key"
+TEXT = b"merchantId|payId|20240101000000"
+NUMBER = 2000
+
+
+def _throughput(key: KeyType, threads: int) -> float:
+    with ThreadPoolExecutor(threads) as executor:
+        started = time.perf_counter()
+        for _ in executor.map(lambda _: sign(TEXT, key), range(NUMBER)):
+            pass
+        return NUMBER / (time.perf_counter() - started)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    cpus = os.cpu_count() or 1
+    key = RAMRSAKey(PRIVATE_KEY_PATH)
+    print(f"in-process, {cpus} callers {_throughput(key, cpus):10.1f} ops/s")
+
+    with ProcessPoolExecutor(cpus) as pool:
+        signer = ProcessPoolSigner(key, pool)
+        _throughput(signer, cpus)  # start the workers and load the key
+        for callers in sorted({1, cpus // 2, cpus} - {0}):
+            print(
+                f"process pool, {callers} callers "
+                f"{_throughput(signer, callers):10.1f} ops/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
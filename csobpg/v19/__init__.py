@@ -1,7 +1,22 @@
-"""Client for API v.1.9."""
+"""Client for API v.1.9.
 
-from .api import APIClient
+The clients are imported on first use to keep the import of the package
+fast.
+"""
+
+from typing import TYPE_CHECKING
+
+from .lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .api import APIClient
+    from .async_api import AsyncAPIClient
 
 __all__ = [
     "APIClient",
+    "AsyncAPIClient",
 ]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__, {"APIClient": ".api", "AsyncAPIClient": ".async_api"}
+)
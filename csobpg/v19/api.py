@@ -1,11 +1,28 @@
 """API client."""
 
 import logging
-from typing import Optional, Union
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    NoReturn,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 from httprest import API
-from httprest.http import HTTPClient
-from olc.grid3.validator.validators import Number
+from httprest.http import HTTPClient, HTTPResponse
 
 from csobpg.v19.models.cart import Cart
 from csobpg.v19.models.currency import Currency
@@ -21,36 +38,306 @@ from csobpg.v19.models.webpage import WebPageAppearanceConfig, WebPageLanguage
 
 from . import request as _request
 from . import response as _response
+from .breaker import BreakerState, CircuitBreaker
+from .bulk import BulkResult, Concurrency, run_bounded
+from .cache import STATUS_OPERATION, StatusCache
+from .crypto import CryptoBackend
+from .errors import APICircuitOpenError, APIClientError
 from .key import FileRSAKey, RAMRSAKey, RSAKey
+from .ratelimit import RateLimiter
+from .request.base import BaseRequest
+from .response.base import PaymentStatus, Response, _parse_result_code
+from .retry import (
+    STATUS_BEFORE_OPERATIONS,
+    RetryMode,
+    RetryPolicy,
+    applied_response,
+    status_conclusive,
+)
+from .signature import Signer, verify_many
+from .singleflight import SingleFlight
+from .timing import CallTiming, TimingHook
 
+DEFAULT_BASE_URL = "https://api.platebnibrana.csob.cz/api/v1.9"
 
-class APIClient(API):
-    """API client."""
+
+class _Call(NamedTuple):
+    """API call.
+
+    The request is built (and signed) by `build_request`, so that the
+    client decides where and when the signing happens.
+    """
+
+    operation: str
+    http_method: str
+    build_request: Callable[[], BaseRequest]
+    response_cls: Optional[Type[Response]]
+    pay_id: Optional[str] = None
+    #: identical concurrent calls (the same operation and key) may be
+    #: coalesced. None if the call must always be sent
+    coalesce_key: Optional[str] = None
+
+    def prepare(
+        self, timing: Optional[CallTiming] = None
+    ) -> Tuple[BaseRequest, Optional[dict]]:
+        """Build the request and its JSON body.
+
+        :param timing: record to store the build and sign durations in
+        """
+        started = time.perf_counter() if timing else 0.0
+        request = self.build_request()
+        json = None if self.http_method == "get" else request.to_json()
+        if timing:
+            timing.sign = request.sign_seconds
+            timing.build = time.perf_counter() - started - timing.sign
+            timing.set_request(request.endpoint, json)
+        return request, json
+
+
+class BaseAPIClient(ABC):
+    """Base API client.
+
+    Implements all API operations. Subclasses define how the calls are
+    executed.
+    """
 
     def __init__(
         self,
         merchant_id: str,
-        private_key: Union[str, RSAKey],
-        public_key: Union[str, RSAKey],
-        base_url: str = "https://api.platebnibrana.csob.cz/api/v1.9",
-        http_client: Optional[HTTPClient] = None,
+        private_key: Union[str, RSAKey, Signer],
+        public_key: Union[str, RSAKey, Signer],
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        timing_hooks: Optional[Sequence[TimingHook]] = None,
+        crypto: Optional[CryptoBackend] = None,
+        status_cache: Optional[StatusCache] = None,
+        coalesce: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
     ) -> None:
         # pylint:disable=too-many-arguments
-        super().__init__(base_url, http_client)
         self.merchant_id = merchant_id
+        self.retry = retry
+        self.breaker = breaker
+        self.timing_hooks = list(timing_hooks or ())
+        self.status_cache = status_cache
+        self.coalesce = coalesce
+        self.rate_limiter = rate_limiter
 
         if isinstance(private_key, str):
-            self.private_key = FileRSAKey(private_key)
+            self.private_key: Union[RSAKey, Signer] = FileRSAKey(private_key)
         else:
             self.private_key = private_key
 
         if isinstance(public_key, str):
-            self.public_key = RAMRSAKey(public_key)
+            self.public_key: Union[RSAKey, Signer] = RAMRSAKey(public_key)
         else:
             self.public_key = public_key
 
+        if crypto is not None:
+            if not isinstance(self.private_key, Signer):
+                self.private_key = crypto.signer(self.private_key)
+            if not isinstance(self.public_key, Signer):
+                self.public_key = crypto.signer(self.public_key)
+
         self._log = logging.getLogger(str(self))
 
+    @abstractmethod
+    def _execute(self, call: _Call) -> Any:
+        """Execute the API call.
+
+        Return the parsed response (or None if the call has no response
+        class).
+        """
+
+    @abstractmethod
+    def _execute_caching(self, call: _Call) -> Any:
+        """Execute the API call bypassing the cache lookup and coalescing.
+
+        The response is still stored in the cache.
+        """
+
+    @abstractmethod
+    def _parse_response(self, response_cls: Type[Response], data: dict) -> Any:
+        """Parse and verify the response data."""
+
+    @abstractmethod
+    def _build_url(self, endpoint: str) -> str:
+        """Build URL for the endpoint."""
+
+    def breaker_states(self) -> Dict[str, BreakerState]:
+        """Return circuit breaker states per endpoint group.
+
+        Empty if the client has no circuit breaker.
+        """
+        if self.breaker is None:
+            return {}
+        return self.breaker.states()
+
+    def add_timing_hook(self, hook: TimingHook) -> None:
+        """Install a hook receiving a `CallTiming` record for each call."""
+        self.timing_hooks.append(hook)
+
+    def remove_timing_hook(self, hook: TimingHook) -> None:
+        """Remove a previously installed timing hook."""
+        self.timing_hooks.remove(hook)
+
+    def _emit_timing(self, timing: CallTiming) -> None:
+        for hook in self.timing_hooks:
+            try:
+                hook(timing)
+            except Exception:  # pylint:disable=broad-except
+                self._log.exception("Timing hook %s failed", hook)
+
+    @staticmethod
+    def _response_data(response: HTTPResponse) -> dict:
+        data = response.json
+        if data is None and response.status_code >= 500:
+            response.raise_for_status()
+        return data or {}
+
+    def _echo_call(self) -> _Call:
+        build = partial(
+            _request.EchoRequest, self.merchant_id, self.private_key
+        )
+        return _Call("echo", "post", build, None)
+
+    def _status_call(self, pay_id: str) -> _Call:
+        build = partial(
+            _request.PaymentStatusRequest,
+            self.merchant_id,
+            self.private_key,
+            pay_id,
+        )
+        return _Call(
+            STATUS_OPERATION,
+            "get",
+            build,
+            _response.PaymentStatusResponse,
+            pay_id=pay_id,
+            coalesce_key=pay_id,
+        )
+
+    def _flight_key(self, call: _Call) -> Optional[Tuple[str, str]]:
+        """Return key of the call to coalesce identical calls by."""
+        if not self.coalesce or call.coalesce_key is None:
+            return None
+        return call.operation, call.coalesce_key
+
+    def _cached_response(self, call: _Call) -> Optional[Response]:
+        """Return the cached status for a status call.
+
+        Invalidate the cached status of the payment the call operates on.
+        """
+        if self.status_cache is None or call.pay_id is None:
+            return None
+        if call.operation != STATUS_OPERATION:
+            self.status_cache.invalidate(call.pay_id)
+            return None
+        response = self.status_cache.get(call.pay_id)
+        if response is not None:
+            self._log.debug("Using cached status of pay_id=%s", call.pay_id)
+        return response
+
+    def _begin_caching(self, call: _Call) -> Optional[int]:
+        """Register a status call about to be sent with the cache.
+
+        Return the generation of the payment to pass to `_cache_response`.
+        """
+        if (
+            self.status_cache is None
+            or call.pay_id is None
+            or call.operation != STATUS_OPERATION
+        ):
+            return None
+        return self.status_cache.begin(call.pay_id)
+
+    def _cache_response(
+        self, call: _Call, response: Any, generation: Optional[int]
+    ) -> None:
+        """Cache the response of a finished status call.
+
+        Invalidate the cached status of the payment the call operated on.
+        The response is None if the call failed.
+        """
+        if self.status_cache is None or call.pay_id is None:
+            return
+        if call.operation != STATUS_OPERATION:
+            self.status_cache.invalidate(call.pay_id)
+        elif generation is not None:
+            self.status_cache.finish(call.pay_id, generation, response)
+
+    def _probe_failed(self, group: str, error: Exception) -> NoReturn:
+        self._log.warning('Probe of "%s" circuit failed: %r', group, error)
+        self.breaker.reopen(group)  # type: ignore
+        raise APICircuitOpenError(
+            group, self.breaker.reset_timeout  # type: ignore
+        ) from error
+
+    def _retry_on(self) -> Tuple[Type[Exception], ...]:
+        return self.retry.retry_on if self.retry else ()
+
+    def _should_retry(
+        self, call: _Call, error: Exception, attempt: int
+    ) -> bool:
+        if self.retry is None or not self.retry.should_retry(
+            call.operation, error, attempt
+        ):
+            return False
+
+        self._log.warning(
+            'Attempt %s of "%s" failed, retrying: %r',
+            attempt,
+            call.operation,
+            error,
+        )
+        return True
+
+    def _must_check_status(self, call: _Call) -> bool:
+        return (
+            self.retry is not None
+            and call.pay_id is not None
+            and call.response_cls is not None
+            and self.retry.mode(call.operation) == RetryMode.CHECK_STATUS
+        )
+
+    def _needs_status_before(self, call: _Call) -> bool:
+        return (
+            self._must_check_status(call)
+            and call.operation in STATUS_BEFORE_OPERATIONS
+        )
+
+    def _check_conclusive(
+        self,
+        call: _Call,
+        error: Exception,
+        before: Optional[PaymentStatus],
+    ) -> None:
+        """Raise the error if the status cannot show the call was applied."""
+        if status_conclusive(call.operation, before):
+            return
+        self._log.warning(
+            'Cannot check whether "%s" was applied to pay_id=%s in %s, '
+            "not retrying",
+            call.operation,
+            call.pay_id,
+            before,
+        )
+        raise error
+
+    def _applied_response(
+        self, call: _Call, status: "_response.PaymentStatusResponse"
+    ) -> Optional[Response]:
+        response = applied_response(
+            call.operation, call.response_cls, status  # type: ignore
+        )
+        if response is not None:
+            self._log.info(
+                '"%s" has already been applied to pay_id=%s',
+                call.operation,
+                call.pay_id,
+            )
+        return response
+
     def init_payment(
         self,
         order_no: str,
@@ -70,7 +357,7 @@ class APIClient(API):
         payment_expiry: Optional[int] = None,
         # pylint:disable=line-too-long, too-many-locals
         page_appearance: WebPageAppearanceConfig = WebPageAppearanceConfig(),
-    ) -> _response.PaymentInitResponse:
+    ) -> "_response.PaymentInitResponse":
         """Init payment."""
         self._log.info(
             'Initializing payment: order_no="%s", total_amount=%s, '
@@ -93,9 +380,10 @@ class APIClient(API):
             customer_id,
             payment_expiry,
         )
-        request = _request.PaymentInitRequest(
+        build = partial(
+            _request.PaymentInitRequest,
             self.merchant_id,
-            str(self.private_key),
+            self.private_key,
             order_no=order_no,
             total_amount=total_amount,
             return_url=return_url,
@@ -113,10 +401,9 @@ class APIClient(API):
             payment_expiry=payment_expiry,
             page_appearance=page_appearance,
         )
-        return _response.PaymentInitResponse.from_json(
-            self._call_api("post", request.endpoint, json=request.to_json()),
-            str(self.public_key),
-        )  # type: ignore
+        return self._execute(
+            _Call("payment/init", "post", build, _response.PaymentInitResponse)
+        )
 
     def oneclick_init_payment(
         # pylint:disable=line-too-long, too-many-locals
@@ -136,7 +423,7 @@ class APIClient(API):
         merchant_data: Optional[bytes] = None,
         ttl_sec: Optional[int] = None,
         language: WebPageLanguage = WebPageLanguage.CS,
-    ) -> _response.OneClickPaymentInitResponse:
+    ) -> "_response.OneClickPaymentInitResponse":
         """Init OneClick payment.
 
         :param template_id: OneClick template ID. Corresponds to the payId
@@ -161,9 +448,10 @@ class APIClient(API):
             order,
             sdk_used,
         )
-        request = _request.OneClickPaymentInitRequest(
+        build = partial(
+            _request.OneClickPaymentInitRequest,
             self.merchant_id,
-            str(self.private_key),
+            self.private_key,
             template_id=template_id,
             order_no=order_no,
             total_amount=total_amount,
@@ -180,34 +468,59 @@ class APIClient(API):
             sdk_used=sdk_used,
             language=language,
         )
-        return _response.OneClickPaymentInitResponse.from_json(
-            self._call_api("post", request.endpoint, json=request.to_json()),
-            str(self.public_key),
-        )  # type: ignore
+        return self._execute(
+            _Call(
+                "oneclick/init",
+                "post",
+                build,
+                _response.OneClickPaymentInitResponse,
+            )
+        )
 
     def oneclick_process(
         self, pay_id: str, fingerprint: Optional[Fingerprint] = None
-    ) -> _response.OneClickPaymentProcessResponse:
+    ) -> "_response.OneClickPaymentProcessResponse":
         """Start OneClick payment processing."""
-        self._log.info("Starting OneClick payment processing for pay_id=%s", pay_id)
-        request = _request.OneClickPaymentProcessRequest(
-            self.merchant_id, str(self.private_key), pay_id, fingerprint
+        self._log.info(
+            "Starting OneClick payment processing for pay_id=%s", pay_id
+        )
+        build = partial(
+            _request.OneClickPaymentProcessRequest,
+            self.merchant_id,
+            self.private_key,
+            pay_id,
+            fingerprint,
+        )
+        return self._execute(
+            _Call(
+                "oneclick/process",
+                "post",
+                build,
+                _response.OneClickPaymentProcessResponse,
+                pay_id=pay_id,
+            )
         )
-        return _response.OneClickPaymentProcessResponse.from_json(
-            self._call_api("post", request.endpoint, request.to_json()),
-            str(self.public_key),
-        )  # type: ignore
 
-    def oneclick_echo(self, template_id: str) -> _response.OneClickEchoResponse:
+    def oneclick_echo(
+        self, template_id: str
+    ) -> "_response.OneClickEchoResponse":
         """Make an OneClick echo request."""
         self._log.info('OneClick echo request for "%s"', template_id)
-        request = _request.OneClickEchoRequest(
-            self.merchant_id, str(self.private_key), template_id
+        build = partial(
+            _request.OneClickEchoRequest,
+            self.merchant_id,
+            self.private_key,
+            template_id,
+        )
+        return self._execute(
+            _Call(
+                "oneclick/echo",
+                "post",
+                build,
+                _response.OneClickEchoResponse,
+                coalesce_key=template_id,
+            )
         )
-        return _response.OneClickEchoResponse.from_json(
-            self._call_api("post", request.endpoint, request.to_json()),
-            str(self.public_key),
-        )  # type: ignore
 
     def googlepay_init(
         # pylint:disable=line-too-long, too-many-locals
@@ -226,7 +539,7 @@ class APIClient(API):
         merchant_data: Optional[bytes] = None,
         ttl_sec: Optional[int] = None,
         language: WebPageLanguage = WebPageLanguage.CS,
-    ) -> _response.GooglePayInitResponse:
+    ) -> "_response.GooglePayInitResponse":
         """Init GooglePay payment."""
         self._log.info(
             'Initializing GooglePay payment using the "%s" payload: '
@@ -246,9 +559,10 @@ class APIClient(API):
             order,
             sdk_used,
         )
-        request = _request.GooglePayInitRequest(
+        build = partial(
+            _request.GooglePayInitRequest,
             self.merchant_id,
-            str(self.private_key),
+            self.private_key,
             order_no=order_no,
             total_amount=total_amount,
             return_url=return_url,
@@ -264,32 +578,56 @@ class APIClient(API):
             sdk_used=sdk_used,
             language=language,
         )
-        return _response.GooglePayInitResponse.from_json(
-            self._call_api("post", request.endpoint, json=request.to_json()),
-            str(self.public_key),
-        )  # type: ignore
+        return self._execute(
+            _Call(
+                "googlepay/init",
+                "post",
+                build,
+                _response.GooglePayInitResponse,
+            )
+        )
 
     def googlepay_process(
         self, pay_id: str, fingerprint: Optional[Fingerprint] = None
-    ) -> _response.GooglePayProcessResponse:
+    ) -> "_response.GooglePayProcessResponse":
         """Start GooglePay processing."""
-        self._log.info("Starting GooglePay payment processing for pay_id=%s", pay_id)
-        request = _request.GooglePayProcessRequest(
-            self.merchant_id, str(self.private_key), pay_id, fingerprint
+        self._log.info(
+            "Starting GooglePay payment processing for pay_id=%s", pay_id
+        )
+        build = partial(
+            _request.GooglePayProcessRequest,
+            self.merchant_id,
+            self.private_key,
+            pay_id,
+            fingerprint,
+        )
+        return self._execute(
+            _Call(
+                "googlepay/process",
+                "post",
+                build,
+                _response.GooglePayProcessResponse,
+                pay_id=pay_id,
+            )
         )
-        return _response.GooglePayProcessResponse.from_json(
-            self._call_api("post", request.endpoint, request.to_json()),
-            str(self.public_key),
-        )  # type: ignore
 
-    def googlepay_echo(self) -> _response.GooglePayEchoResponse:
+    def googlepay_echo(self) -> "_response.GooglePayEchoResponse":
         """Make an GooglePay echo request."""
         self._log.info("GooglePay echo request")
-        request = _request.GooglePayEchoRequest(self.merchant_id, str(self.private_key))
-        return _response.GooglePayEchoResponse.from_json(
-            self._call_api("post", request.endpoint, request.to_json()),
-            str(self.public_key),
-        )  # type: ignore
+        build = partial(
+            _request.GooglePayEchoRequest,
+            self.merchant_id,
+            self.private_key,
+        )
+        return self._execute(
+            _Call(
+                "googlepay/echo",
+                "post",
+                build,
+                _response.GooglePayEchoResponse,
+                coalesce_key="",
+            )
+        )
 
     def applepay_init(
         # pylint:disable=line-too-long, too-many-locals
@@ -308,7 +646,7 @@ class APIClient(API):
         merchant_data: Optional[bytes] = None,
         ttl_sec: Optional[int] = None,
         language: WebPageLanguage = WebPageLanguage.CS,
-    ) -> _response.ApplePayInitResponse:
+    ) -> "_response.ApplePayInitResponse":
         """Init ApplePay payment."""
         self._log.info(
             'Initializing ApplePay payment using the "%s" payload: '
@@ -328,9 +666,10 @@ class APIClient(API):
             order,
             sdk_used,
         )
-        request = _request.ApplePayInitRequest(
+        build = partial(
+            _request.ApplePayInitRequest,
             self.merchant_id,
-            str(self.private_key),
+            self.private_key,
             order_no=order_no,
             total_amount=total_amount,
             return_url=return_url,
@@ -346,63 +685,95 @@ class APIClient(API):
             sdk_used=sdk_used,
             language=language,
         )
-        print("ApplePayInitResponse")  # noqa: T201
-        print(request.to_json())  # noqa: T201
-
-        return _response.ApplePayInitResponse.from_json(
-            self._call_api("post", request.endpoint, json=request.to_json()),
-            str(self.public_key),
-        )  # type: ignore
+        return self._execute(
+            _Call(
+                "applepay/init", "post", build, _response.ApplePayInitResponse
+            )
+        )
 
     def applepay_process(
         self, pay_id: str, fingerprint: Optional[Fingerprint] = None
-    ) -> _response.ApplePayProcessResponse:
+    ) -> "_response.ApplePayProcessResponse":
         """Start GooglePay processing."""
-        self._log.info("Starting GooglePay payment processing for pay_id=%s", pay_id)
-        request = _request.ApplePayProcessRequest(
-            self.merchant_id, str(self.private_key), pay_id, fingerprint
+        self._log.info(
+            "Starting GooglePay payment processing for pay_id=%s", pay_id
+        )
+        build = partial(
+            _request.ApplePayProcessRequest,
+            self.merchant_id,
+            self.private_key,
+            pay_id,
+            fingerprint,
+        )
+        return self._execute(
+            _Call(
+                "applepay/process",
+                "post",
+                build,
+                _response.OneClickPaymentProcessResponse,
+                pay_id=pay_id,
+            )
         )
-        return _response.OneClickPaymentProcessResponse.from_json(
-            self._call_api("post", request.endpoint, request.to_json()),
-            str(self.public_key),
-        )  # type: ignore
 
-    def applepay_echo(self) -> _response.GooglePayEchoResponse:
+    def applepay_echo(self) -> "_response.GooglePayEchoResponse":
         """Make an GooglePay echo request."""
         self._log.info("GooglePay echo request")
-        request = _request.ApplePayEchoRequest(self.merchant_id, str(self.private_key))
-        return _response.ApplePayEchoResponse.from_json(
-            self._call_api("post", request.endpoint, request.to_json()),
-            str(self.public_key),
-        )  # type: ignore
-
-    def get_payment_status(self, pay_id: str) -> _response.PaymentStatusResponse:
-        """Request payment status information."""
-        self._log.info("Requesting payment status for pay_id=%s", pay_id)
-        request = _request.PaymentStatusRequest(
-            self.merchant_id, str(self.private_key), pay_id
+        build = partial(
+            _request.ApplePayEchoRequest,
+            self.merchant_id,
+            self.private_key,
+        )
+        return self._execute(
+            _Call(
+                "applepay/echo",
+                "post",
+                build,
+                _response.ApplePayEchoResponse,
+                coalesce_key="",
+            )
         )
-        return _response.PaymentStatusResponse.from_json(
-            self._call_api("get", request.endpoint), str(self.public_key)
-        )  # type: ignore
 
-    def reverse_payment(self, pay_id: str) -> _response.PaymentReverseResponse:
+    def get_payment_status(
+        self, pay_id: str, cached: bool = True
+    ) -> "_response.PaymentStatusResponse":
+        """Request payment status information.
+
+        :param cached: whether the status may be served from the
+          `status_cache` or shared with an identical concurrent call. If
+          False, the status is requested from the gateway (and cached)
+        """
+        self._log.info("Requesting payment status for pay_id=%s", pay_id)
+        if not cached:
+            return self._execute_caching(self._status_call(pay_id))
+        return self._execute(self._status_call(pay_id))
+
+    def reverse_payment(
+        self, pay_id: str
+    ) -> "_response.PaymentReverseResponse":
         """Reverse payment.
 
         :param pay_id: payment ID
         """
         self._log.info("Reversing payment for pay_id=%s", pay_id)
-        request = _request.PaymentReverseRequest(
-            self.merchant_id, str(self.private_key), pay_id
+        build = partial(
+            _request.PaymentReverseRequest,
+            self.merchant_id,
+            self.private_key,
+            pay_id,
+        )
+        return self._execute(
+            _Call(
+                "payment/reverse",
+                "put",
+                build,
+                _response.PaymentReverseResponse,
+                pay_id=pay_id,
+            )
         )
-        return _response.PaymentReverseResponse.from_json(
-            self._call_api("put", request.endpoint, request.to_json()),
-            str(self.public_key),
-        )  # type: ignore
 
     def close_payment(
         self, pay_id: str, total_amount: Optional[int] = None
-    ) -> _response.PaymentCloseResponse:
+    ) -> "_response.PaymentCloseResponse":
         """Close payment (move to settlement).
 
         :param total_amount: close the payment with this amount. It must be
@@ -414,17 +785,26 @@ class APIClient(API):
             pay_id,
             total_amount,
         )
-        request = _request.PaymentCloseRequest(
-            self.merchant_id, str(self.private_key), pay_id, total_amount
+        build = partial(
+            _request.PaymentCloseRequest,
+            self.merchant_id,
+            self.private_key,
+            pay_id,
+            total_amount,
+        )
+        return self._execute(
+            _Call(
+                "payment/close",
+                "put",
+                build,
+                _response.PaymentCloseResponse,
+                pay_id=pay_id,
+            )
         )
-        return _response.PaymentCloseResponse.from_json(
-            self._call_api("put", request.endpoint, json=request.to_json()),
-            str(self.public_key),
-        )  # type: ignore
 
     def refund_payment(
         self, pay_id: str, amount: Optional[int] = None
-    ) -> _response.PaymentRefundResponse:
+    ) -> "_response.PaymentRefundResponse":
         """Refund payment.
 
         :param pay_id: payment ID
@@ -432,14 +812,25 @@ class APIClient(API):
           original amount and provided in hundredths of the base currency.
           If not provided, the full amount will be refunded.
         """
-        self._log.info("Refunding payment for pay_id=%s, amount=%s", pay_id, amount)
-        request = _request.PaymentRefundRequest(
-            self.merchant_id, str(self.private_key), pay_id, amount
+        self._log.info(
+            "Refunding payment for pay_id=%s, amount=%s", pay_id, amount
+        )
+        build = partial(
+            _request.PaymentRefundRequest,
+            self.merchant_id,
+            self.private_key,
+            pay_id,
+            amount,
+        )
+        return self._execute(
+            _Call(
+                "payment/refund",
+                "put",
+                build,
+                _response.PaymentRefundResponse,
+                pay_id=pay_id,
+            )
         )
-        return _response.PaymentRefundResponse.from_json(
-            self._call_api("put", request.endpoint, request.to_json()),
-            str(self.public_key),
-        )  # type: ignore
 
     def get_payment_process_url(self, pay_id: str) -> str:
         """Build payment URL.
@@ -450,34 +841,276 @@ class APIClient(API):
         self._log.info("Building payment URL for pay_id=%s", pay_id)
         return self._build_url(
             _request.PaymentProcessRequest(
-                self.merchant_id, str(self.private_key), pay_id
+                self.merchant_id, self.private_key, pay_id
             ).endpoint
         )
 
     def echo(self) -> None:
         """Make an echo request."""
         self._log.info("Making echo request")
-        request = _request.EchoRequest(self.merchant_id, str(self.private_key))
-        self._call_api("post", request.endpoint, request.to_json())
+        return self._execute(self._echo_call())
 
     def process_gateway_return(
         self, datadict: dict
-    ) -> _response.PaymentProcessResponse:
+    ) -> "_response.PaymentProcessResponse":
         """Process gateway return."""
         self._log.info("Processing gateway return %s", datadict)
-        data = {}
+        return self._parse_response(
+            _response.PaymentProcessResponse, self._gateway_return(datadict)
+        )
+
+    def verify_gateway_returns(
+        self, datadicts: Iterable[dict], executor: Optional[Executor] = None
+    ) -> List[bool]:
+        """Verify signatures of many gateway returns.
+
+        Intended for replaying gateway return callbacks. Unlike
+        `process_gateway_return`, an invalid return does not raise.
+
+        :param executor: executor to verify in (see `verify_many`)
+        :return: whether each return is valid, in the order of datadicts
+        """
+        valid: List[bool] = []
+        items = []
+        for datadict in datadicts:
+            try:
+                data = self._gateway_return(datadict)
+                # pylint:disable=protected-access
+                obj = _response.PaymentProcessResponse._from_json(
+                    data,
+                    data.get("dttm", ""),
+                    _parse_result_code(data),
+                    data.get("resultMessage", ""),
+                )
+            except (APIClientError, KeyError, ValueError):
+                valid.append(False)
+                continue
+            valid.append(True)
+            items.append(
+                (data.get("signature", ""), obj.to_sign_text().encode())
+            )
 
-        for key in datadict:
-            data[key] = (
-                int(datadict[key]) if key in ("paymentStatus",) else datadict[key]
+        verified = iter(verify_many(items, self.public_key, executor))
+        return [ok and next(verified) for ok in valid]
+
+    @staticmethod
+    def _gateway_return(datadict: dict) -> dict:
+        return {
+            key: int(value) if key in ("paymentStatus",) else value
+            for key, value in datadict.items()
+        }
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(merchant_id='{self.merchant_id}')"
+
+
+class APIClient(BaseAPIClient, API):
+    """API client."""
+
+    def __init__(
+        self,
+        merchant_id: str,
+        private_key: Union[str, RSAKey, Signer],
+        public_key: Union[str, RSAKey, Signer],
+        base_url: str = DEFAULT_BASE_URL,
+        http_client: Optional[HTTPClient] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        timing_hooks: Optional[Sequence[TimingHook]] = None,
+        crypto: Optional[CryptoBackend] = None,
+        status_cache: Optional[StatusCache] = None,
+        coalesce: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        """Init the client.
+
+        :param retry: retry policy. Failed calls are not retried if not
+          provided
+        :param breaker: circuit breaker. Calls to an endpoint group fail fast
+          with `APICircuitOpenError` while its circuit is open
+        :param timing_hooks: hooks receiving a `CallTiming` record for each
+          call. Calls are not timed if there are no hooks
+        :param crypto: backend to sign and verify with. The keys are used
+          directly (with `pycryptodome`) if not provided
+        :param status_cache: cache of the payment statuses. Statuses are not
+          cached if not provided
+        :param coalesce: whether identical concurrent calls of the payment
+          status and echo operations share a single gateway call
+        :param rate_limiter: limiter of the calls sent to the gateway. Calls
+          are not limited if not provided
+        """
+        # pylint:disable=too-many-arguments
+        API.__init__(self, base_url, http_client)
+        BaseAPIClient.__init__(
+            self,
+            merchant_id,
+            private_key,
+            public_key,
+            retry,
+            breaker,
+            timing_hooks,
+            crypto,
+            status_cache,
+            coalesce,
+            rate_limiter,
+        )
+        self._flights = SingleFlight()
+
+    def get_payment_statuses(
+        self, pay_ids: Iterable[str], concurrency: Concurrency = 8
+    ) -> Iterator[BulkResult]:
+        """Request payment statuses for many payments.
+
+        Statuses are requested concurrently in a thread pool and yielded as
+        they complete. API and HTTP errors are reported per payment in
+        `BulkResult.error`.
+
+        :param pay_ids: payment IDs. Consumed lazily
+        :param concurrency: maximum number of requests in flight, or an
+          `AdaptiveConcurrency` adjusting it to the gateway load
+        """
+        return run_bounded(self.get_payment_status, pay_ids, concurrency)
+
+    def _execute(self, call: _Call) -> Any:
+        response = self._cached_response(call)
+        if response is not None:
+            return response
+        key = self._flight_key(call)
+        if key is None:
+            return self._execute_caching(call)
+        return self._flights.do(key, partial(self._execute_caching, call))
+
+    def _execute_caching(self, call: _Call) -> Any:
+        generation = self._begin_caching(call)
+        response = None
+        try:
+            response = self._execute_retried(call)
+        finally:
+            self._cache_response(call, response, generation)
+        return response
+
+    def _execute_retried(self, call: _Call) -> Any:
+        retry_on = self._retry_on()
+        before = self._status_before(call)
+        attempt = 1
+        while True:
+            try:
+                return self._execute_once(call)
+            except retry_on as exc:
+                if not self._should_retry(call, exc, attempt):
+                    raise
+                time.sleep(self.retry.delay(attempt))  # type: ignore
+                if self._must_check_status(call):
+                    response = self._check_status(call, exc, before)
+                    if response is not None:
+                        return response
+                attempt += 1
+
+    def _execute_once(self, call: _Call) -> Any:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(self.merchant_id, call.operation)
+        if self.breaker is None:
+            return self._send(call)
+
+        group = self.breaker.group(call.operation)
+        if self.breaker.acquire(group):
+            self._probe(group)
+        return self._send_recorded(group, call)
+
+    def _probe(self, group: str) -> None:
+        started = time.monotonic()
+        try:
+            self._send(self._echo_call())
+        except Exception as exc:  # pylint:disable=broad-except
+            self._probe_failed(group, exc)
+        self.breaker.record(  # type: ignore
+            group, time.monotonic() - started, started=started
+        )
+
+    def _send_recorded(self, group: str, call: _Call) -> Any:
+        started = time.monotonic()
+        try:
+            result = self._send(call)
+        except Exception as exc:
+            self.breaker.record(  # type: ignore
+                group, time.monotonic() - started, exc, started
             )
+            raise
+        self.breaker.record(  # type: ignore
+            group, time.monotonic() - started, started=started
+        )
+        return result
+
+    def _send(self, call: _Call) -> Any:
+        if self.timing_hooks:
+            return self._send_timed(call)
+
+        request, json = call.prepare()
+        data = self._call_api(call.http_method, request.endpoint, json)
+        if call.response_cls is None:
+            return None
+        return self._parse_response(call.response_cls, data)
 
-        return _response.PaymentProcessResponse.from_json(data, str(self.public_key))  # type: ignore
+    def _send_timed(self, call: _Call) -> Any:
+        timing = CallTiming(call.operation, call.http_method)
+        try:
+            request, json = call.prepare(timing)
+
+            started = time.perf_counter()
+            try:
+                response = self._request(
+                    call.http_method, request.endpoint, json
+                )
+            finally:
+                timing.http = time.perf_counter() - started
+            timing.response_bytes = len(response.body)
+            data = self._response_data(response)
+            timing.set_result_code(data)
+            if call.response_cls is None:
+                return None
+
+            started = time.perf_counter()
+            try:
+                return self._parse_response(call.response_cls, data)
+            finally:
+                timing.verify = time.perf_counter() - started
+        except Exception as exc:
+            timing.error = exc
+            raise
+        finally:
+            self._emit_timing(timing)
+
+    def _status_before(self, call: _Call) -> Optional[PaymentStatus]:
+        if not self._needs_status_before(call):
+            return None
+        status = self._execute_retried(
+            self._status_call(call.pay_id)  # type: ignore
+        )
+        return status.payment_status
+
+    def _check_status(
+        self,
+        call: _Call,
+        error: Exception,
+        before: Optional[PaymentStatus],
+    ) -> Optional[Response]:
+        self._check_conclusive(call, error, before)
+        try:
+            # the cache is bypassed, the status must be current
+            status = self._execute_retried(
+                self._status_call(call.pay_id)  # type: ignore
+            )
+        except self._retry_on() as exc:
+            raise error from exc
+        return self._applied_response(call, status)
+
+    def _parse_response(self, response_cls: Type[Response], data: dict) -> Any:
+        return response_cls.from_json(data, self.public_key)
 
     def _call_api(
         self, method: str, endpoint: str, json: Optional[dict] = None
     ) -> dict:
-        return self._request(method, endpoint, json).json or {}
+        return self._response_data(self._request(method, endpoint, json))
 
-    def __str__(self) -> str:
-        return f"{self.__class__.__name__}(merchant_id='{self.merchant_id}')"
+    def _build_url(self, endpoint: str) -> str:
+        return API._build_url(self, endpoint)
@@ -0,0 +1,302 @@
+"""Asynchronous API client."""
+
+import asyncio
+import time
+from concurrent.futures import Executor
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from .api import DEFAULT_BASE_URL, BaseAPIClient, _Call
+from .breaker import CircuitBreaker
+from .bulk import BulkResult, Concurrency, arun_bounded
+from .cache import StatusCache
+from .crypto import CryptoBackend
+from .key import RSAKey
+from .ratelimit import RateLimiter
+from .response.base import PaymentStatus, Response
+from .retry import RetryPolicy
+from .signature import Signer
+from .singleflight import AsyncSingleFlight
+from .timing import CallTiming, TimingHook
+from .transport.aio import AsyncHTTPClient, ExecutorAsyncHTTPClient
+
+_T = TypeVar("_T")
+
+
+class AsyncAPIClient(BaseAPIClient):
+    """Asynchronous API client.
+
+    Provides the same operations as `APIClient`. Every operation which
+    communicates with the API (or verifies a signature) returns an awaitable:
+
+    .. code-block:: python
+
+        response = await client.init_payment(...)
+
+    `get_payment_process_url` stays synchronous.
+    """
+
+    def __init__(
+        self,
+        merchant_id: str,
+        private_key: Union[str, RSAKey, Signer],
+        public_key: Union[str, RSAKey, Signer],
+        base_url: str = DEFAULT_BASE_URL,
+        http_client: Optional[AsyncHTTPClient] = None,
+        executor: Optional[Executor] = None,
+        offload_crypto: bool = True,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        timing_hooks: Optional[Sequence[TimingHook]] = None,
+        crypto: Optional[CryptoBackend] = None,
+        status_cache: Optional[StatusCache] = None,
+        coalesce: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        """Init the client.
+
+        :param http_client: asynchronous HTTP client. If not provided, the
+          default `httprest` client is run in the executor
+        :param executor: executor to build and sign requests and to verify
+          responses in. The event loop's default executor is used if not
+          provided
+        :param offload_crypto: whether to sign and verify in the executor.
+          If False, signing and verification run in the event loop
+        :param retry: retry policy. Failed calls are not retried if not
+          provided
+        :param breaker: circuit breaker. Calls to an endpoint group fail fast
+          with `APICircuitOpenError` while its circuit is open
+        :param timing_hooks: hooks receiving a `CallTiming` record for each
+          call. Calls are not timed if there are no hooks
+        :param crypto: backend to sign and verify with. The keys are used
+          directly (with `pycryptodome`) if not provided
+        :param status_cache: cache of the payment statuses. Statuses are not
+          cached if not provided
+        :param coalesce: whether identical concurrent calls of the payment
+          status and echo operations share a single gateway call
+        :param rate_limiter: limiter of the calls sent to the gateway. Calls
+          are not limited if not provided
+        """
+        # pylint:disable=too-many-arguments
+        self._base_url = base_url.rstrip("/")
+        self._http_client = http_client or ExecutorAsyncHTTPClient()
+        self._executor = executor
+        self._offload_crypto = offload_crypto
+        super().__init__(
+            merchant_id,
+            private_key,
+            public_key,
+            retry,
+            breaker,
+            timing_hooks,
+            crypto,
+            status_cache,
+            coalesce,
+            rate_limiter,
+        )
+        self._flights = AsyncSingleFlight()
+
+    async def close(self) -> None:
+        """Close the HTTP client."""
+        await self._http_client.close()
+
+    async def __aenter__(self) -> "AsyncAPIClient":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    def get_payment_statuses(
+        self,
+        pay_ids: Union[Iterable[str], AsyncIterable[str]],
+        concurrency: Concurrency = 8,
+    ) -> AsyncIterator[BulkResult]:
+        """Request payment statuses for many payments.
+
+        Statuses are yielded as they complete. API and HTTP errors are
+        reported per payment in `BulkResult.error`:
+
+        .. code-block:: python
+
+            async for result in client.get_payment_statuses(pay_ids):
+                ...
+
+        :param pay_ids: payment IDs. Consumed lazily
+        :param concurrency: maximum number of requests in flight, or an
+          `AdaptiveConcurrency` adjusting it to the gateway load
+        """
+        return arun_bounded(self.get_payment_status, pay_ids, concurrency)
+
+    async def _execute(self, call: _Call) -> Any:
+        # pylint:disable=invalid-overridden-method
+        response = self._cached_response(call)
+        if response is not None:
+            return response
+        key = self._flight_key(call)
+        if key is None:
+            return await self._execute_caching(call)
+        return await self._flights.do(
+            key, partial(self._execute_caching, call)
+        )
+
+    async def _execute_caching(self, call: _Call) -> Any:
+        # pylint:disable=invalid-overridden-method
+        generation = self._begin_caching(call)
+        response = None
+        try:
+            response = await self._execute_retried(call)
+        finally:
+            self._cache_response(call, response, generation)
+        return response
+
+    async def _execute_retried(self, call: _Call) -> Any:
+        retry_on = self._retry_on()
+        before = await self._status_before(call)
+        attempt = 1
+        while True:
+            try:
+                return await self._execute_once(call)
+            except retry_on as exc:
+                if not self._should_retry(call, exc, attempt):
+                    raise
+                await asyncio.sleep(self.retry.delay(attempt))  # type: ignore
+                if self._must_check_status(call):
+                    response = await self._check_status(call, exc, before)
+                    if response is not None:
+                        return response
+                attempt += 1
+
+    async def _execute_once(self, call: _Call) -> Any:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.aacquire(self.merchant_id, call.operation)
+        if self.breaker is None:
+            return await self._send(call)
+
+        group = self.breaker.group(call.operation)
+        if self.breaker.acquire(group):
+            await self._probe(group)
+        return await self._send_recorded(group, call)
+
+    async def _probe(self, group: str) -> None:
+        started = time.monotonic()
+        try:
+            await self._send(self._echo_call())
+        except Exception as exc:  # pylint:disable=broad-except
+            self._probe_failed(group, exc)
+        self.breaker.record(  # type: ignore
+            group, time.monotonic() - started, started=started
+        )
+
+    async def _send_recorded(self, group: str, call: _Call) -> Any:
+        started = time.monotonic()
+        try:
+            result = await self._send(call)
+        except Exception as exc:
+            self.breaker.record(  # type: ignore
+                group, time.monotonic() - started, exc, started
+            )
+            raise
+        self.breaker.record(  # type: ignore
+            group, time.monotonic() - started, started=started
+        )
+        return result
+
+    async def _send(self, call: _Call) -> Any:
+        if self.timing_hooks:
+            return await self._send_timed(call)
+
+        request, json = await self._run_crypto(call.prepare)
+        data = await self._call_api(call.http_method, request.endpoint, json)
+        if call.response_cls is None:
+            return None
+        return await self._parse_response(call.response_cls, data)
+
+    async def _send_timed(self, call: _Call) -> Any:
+        timing = CallTiming(call.operation, call.http_method)
+        try:
+            request, json = await self._run_crypto(call.prepare, timing)
+
+            started = time.perf_counter()
+            try:
+                response = await self._http_client.request(
+                    call.http_method, self._build_url(request.endpoint), json
+                )
+            finally:
+                timing.http = time.perf_counter() - started
+            timing.response_bytes = len(response.body)
+            data = self._response_data(response)
+            timing.set_result_code(data)
+            if call.response_cls is None:
+                return None
+
+            started = time.perf_counter()
+            try:
+                return await self._parse_response(call.response_cls, data)
+            finally:
+                timing.verify = time.perf_counter() - started
+        except Exception as exc:
+            timing.error = exc
+            raise
+        finally:
+            self._emit_timing(timing)
+
+    async def _status_before(self, call: _Call) -> Optional[PaymentStatus]:
+        if not self._needs_status_before(call):
+            return None
+        status = await self._execute_retried(
+            self._status_call(call.pay_id)  # type: ignore
+        )
+        return status.payment_status
+
+    async def _check_status(
+        self,
+        call: _Call,
+        error: Exception,
+        before: Optional[PaymentStatus],
+    ) -> Optional[Response]:
+        self._check_conclusive(call, error, before)
+        try:
+            # the cache is bypassed, the status must be current
+            status = await self._execute_retried(
+                self._status_call(call.pay_id)  # type: ignore
+            )
+        except self._retry_on() as exc:
+            raise error from exc
+        return self._applied_response(call, status)
+
+    async def _parse_response(
+        self, response_cls: Type[Response], data: dict
+    ) -> Any:
+        # pylint:disable=invalid-overridden-method
+        return await self._run_crypto(
+            response_cls.from_json, data, self.public_key
+        )
+
+    async def _call_api(
+        self, method: str, endpoint: str, json: Optional[dict] = None
+    ) -> dict:
+        response = await self._http_client.request(
+            method, self._build_url(endpoint), json
+        )
+        return self._response_data(response)
+
+    async def _run_crypto(self, func: Callable[..., _T], *args) -> _T:
+        if not self._offload_crypto:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, func, *args
+        )
+
+    def _build_url(self, endpoint: str) -> str:
+        return f"{self._base_url}/{endpoint.strip('/')}"
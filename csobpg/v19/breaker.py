@@ -0,0 +1,207 @@
+"""Circuit breaker.
+
+The breaker tracks calls per endpoint group (`payment`, `oneclick`,
+`googlepay`, `applepay`, `echo`). Once a group fails too many times in a
+row, its circuit opens and the calls are rejected immediately with
+`APICircuitOpenError`. After `reset_timeout` the circuit is half-open: a
+single call probes the gateway with `echo()`. The circuit closes if the
+probe succeeds and opens again otherwise. Results of calls admitted before
+the circuit opened do not change its state.
+"""
+
+import logging
+import threading
+import time
+from enum import Enum
+from typing import Callable, Dict, Optional, Tuple, Type
+
+from httprest.http.errors import HTTPRequestError
+
+from .errors import APICircuitOpenError, APIInternalError
+
+#: errors counted as failures
+FAILURE_ERRORS: Tuple[Type[Exception], ...] = (
+    HTTPRequestError,
+    APIInternalError,
+)
+
+
+class BreakerState(Enum):
+    """Circuit state."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def default_group(operation: str) -> str:
+    """Return endpoint group of the operation.
+
+    E.g. "payment" for "payment/close".
+    """
+    return operation.split("/", 1)[0]
+
+
+class _Circuit:
+    """Circuit of a single endpoint group."""
+
+    def __init__(self) -> None:
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at = 0.0
+
+
+class CircuitBreaker:
+    """Circuit breaker per endpoint group.
+
+    The breaker is thread-safe and may be shared by several clients.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        latency_threshold: Optional[float] = None,
+        failure_errors: Tuple[Type[Exception], ...] = FAILURE_ERRORS,
+        group: Callable[[str], str] = default_group,
+    ) -> None:
+        """Init the breaker.
+
+        :param failure_threshold: number of consecutive failures which opens
+          the circuit
+        :param reset_timeout: seconds to wait before probing an open circuit
+        :param latency_threshold: calls slower than this (in seconds) are
+          counted as failures
+        :param failure_errors: errors counted as failures. Other errors (e.g.
+          a payment not found) mean that the gateway works
+        :param group: function returning endpoint group of an operation
+        """
+        # pylint:disable=too-many-arguments
+        if failure_threshold < 1:
+            raise ValueError('"failure_threshold" must be >= 1')
+        if reset_timeout < 0:
+            raise ValueError('"reset_timeout" must be >= 0')
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency_threshold = latency_threshold
+        self.failure_errors = failure_errors
+        self.group = group
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+        self._log = logging.getLogger(str(self))
+
+    def acquire(self, group: str) -> bool:
+        """Acquire permission to call the group.
+
+        :return: whether the caller must probe the gateway first
+        :raises APICircuitOpenError: if the circuit is open
+        """
+        now = time.monotonic()
+        with self._lock:
+            circuit = self._circuit(group)
+            if circuit.state == BreakerState.CLOSED:
+                return False
+
+            if circuit.state == BreakerState.OPEN:
+                since = circuit.opened_at
+            else:
+                # a probe which never finished (e.g. cancelled) is replaced
+                since = circuit.probe_started_at
+
+            retry_after = since + self.reset_timeout - now
+            if retry_after > 0:
+                raise APICircuitOpenError(group, retry_after)
+
+            circuit.state = BreakerState.HALF_OPEN
+            circuit.probe_started_at = now
+        self._log.info('Circuit for "%s" is half-open, probing', group)
+        return True
+
+    def record(
+        self,
+        group: str,
+        elapsed: float,
+        error: Optional[Exception] = None,
+        started: Optional[float] = None,
+    ) -> None:
+        """Record a finished call.
+
+        :param elapsed: call duration in seconds
+        :param error: error raised by the call
+        :param started: `time.monotonic()` the call was admitted at. Results
+          of calls admitted before the probe of a half-open circuit are
+          ignored
+        """
+        failed = isinstance(error, self.failure_errors) or (
+            self.latency_threshold is not None
+            and elapsed > self.latency_threshold
+        )
+        with self._lock:
+            circuit = self._circuit(group)
+            if circuit.state == BreakerState.OPEN or (
+                circuit.state == BreakerState.HALF_OPEN
+                and started is not None
+                and started < circuit.probe_started_at
+            ):
+                # a late result of a call admitted before the circuit opened
+                return
+            if not failed:
+                circuit.failures = 0
+                if circuit.state == BreakerState.CLOSED:
+                    return
+                circuit.state = BreakerState.CLOSED
+                self._log.info('Circuit for "%s" is closed', group)
+                return
+
+            circuit.failures += 1
+            if (
+                circuit.state == BreakerState.CLOSED
+                and circuit.failures < self.failure_threshold
+            ):
+                return
+            circuit.state = BreakerState.OPEN
+            circuit.opened_at = time.monotonic()
+        self._log.warning(
+            'Circuit for "%s" is open after %s failures, last: error=%r, '
+            "elapsed=%.3fs",
+            group,
+            circuit.failures,
+            error,
+            elapsed,
+        )
+
+    def reopen(self, group: str) -> None:
+        """Open the circuit of the group again, e.g. after a failed probe."""
+        with self._lock:
+            circuit = self._circuit(group)
+            circuit.state = BreakerState.OPEN
+            circuit.opened_at = time.monotonic()
+
+    def state(self, group: str) -> BreakerState:
+        """Return circuit state of the group."""
+        with self._lock:
+            return self._circuit(group).state
+
+    def states(self) -> Dict[str, BreakerState]:
+        """Return circuit states of all groups called so far."""
+        with self._lock:
+            return {
+                group: circuit.state
+                for group, circuit in self._circuits.items()
+            }
+
+    def _circuit(self, group: str) -> _Circuit:
+        circuit = self._circuits.get(group)
+        if circuit is None:
+            circuit = self._circuits[group] = _Circuit()
+        return circuit
+
+    def __str__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"failure_threshold={self.failure_threshold}, "
+            f"reset_timeout={self.reset_timeout}, "
+            f"latency_threshold={self.latency_threshold})"
+        )
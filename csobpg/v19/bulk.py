@@ -0,0 +1,202 @@
+"""Bulk operations.
+
+Helpers to run an API operation for many payments with bounded concurrency.
+Results are yielded as soon as they complete, and the input is consumed
+lazily, so memory usage does not depend on the input size.
+
+The input items are the payment IDs, or any items (e.g. rows of a file)
+with a `key` function returning their payment IDs.
+
+The concurrency is either a fixed number of calls in flight or an
+`AdaptiveConcurrency` limit adjusted by the outcome of the calls.
+"""
+
+import time
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import wait as _wait
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Set,
+    TypeVar,
+    Union,
+)
+
+from httprest.http.errors import HTTPRequestError
+
+from .concurrency import AdaptiveConcurrency
+from .errors import APIClientError, APIError
+
+#: Errors which are reported per item instead of being raised
+BULK_ERRORS = (APIError, APIClientError, HTTPRequestError)
+
+
+class BulkResult(NamedTuple):
+    """Result of a bulk operation for a single payment."""
+
+    pay_id: str
+    response: Optional[Any] = None
+    error: Optional[Exception] = None
+    #: input item the operation ran for
+    item: Optional[Any] = None
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the operation succeeded."""
+        return self.error is None
+
+
+#: end of the input, None may be an item
+_END = object()
+
+_T = TypeVar("_T")
+
+#: Number of calls in flight, fixed or adaptive
+Concurrency = Union[int, AdaptiveConcurrency]
+
+
+def _adaptive(concurrency: Concurrency) -> Optional[AdaptiveConcurrency]:
+    if isinstance(concurrency, AdaptiveConcurrency):
+        return concurrency
+    if concurrency < 1:
+        raise ValueError('"concurrency" must be >= 1')
+    return None
+
+
+def _result(
+    item: Any,
+    key: Optional[Callable[[Any], str]],
+    adaptive: Optional[AdaptiveConcurrency],
+    started: float,
+    response: Any = None,
+    error: Optional[Exception] = None,
+) -> BulkResult:
+    # pylint:disable=too-many-arguments
+    if adaptive is not None:
+        adaptive.record(started, error)
+    pay_id = item if key is None else key(item)
+    return BulkResult(pay_id, response, error, item)
+
+
+def run_bounded(
+    func: Callable[[_T], Any],
+    items: Iterable[_T],
+    concurrency: Concurrency,
+    key: Optional[Callable[[_T], str]] = None,
+) -> Iterator[BulkResult]:
+    """Run `func` for each item in a thread pool.
+
+    At most `concurrency` calls are in flight at any time. Results are
+    yielded in the order of completion.
+
+    :param key: function returning the payment ID of an item. By default the
+      items are the payment IDs
+    """
+    adaptive = _adaptive(concurrency)
+
+    def call(item: _T) -> BulkResult:
+        started = time.monotonic()
+        try:
+            response = func(item)
+        except BULK_ERRORS as exc:
+            return _result(item, key, adaptive, started, error=exc)
+        return _result(item, key, adaptive, started, response)
+
+    def limit() -> int:
+        return concurrency if adaptive is None else adaptive.limit
+
+    source = iter(items)
+    workers = limit() if adaptive is None else adaptive.max_limit
+    with ThreadPoolExecutor(workers) as executor:
+        pending = set()
+
+        def submit() -> None:
+            while len(pending) < limit():
+                item = next(source, _END)
+                if item is _END:
+                    return
+                pending.add(executor.submit(call, item))
+
+        submit()
+        while pending:
+            done, _ = _wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.remove(future)
+                yield future.result()
+            submit()
+
+
+async def arun_bounded(
+    func: Callable[[_T], Awaitable[Any]],
+    items: Union[Iterable[_T], AsyncIterable[_T]],
+    concurrency: Concurrency,
+    key: Optional[Callable[[_T], str]] = None,
+) -> AsyncIterator[BulkResult]:
+    """Run the coroutine function `func` for each item.
+
+    At most `concurrency` calls are in flight at any time. Results are
+    yielded in the order of completion.
+
+    :param key: function returning the payment ID of an item. By default the
+      items are the payment IDs
+    """
+    # imported here to keep asyncio out of the package import, the caller
+    # runs an event loop already
+    import asyncio  # pylint:disable=import-outside-toplevel
+
+    adaptive = _adaptive(concurrency)
+
+    async def call(item: _T) -> BulkResult:
+        started = time.monotonic()
+        try:
+            response = await func(item)
+        except BULK_ERRORS as exc:
+            return _result(item, key, adaptive, started, error=exc)
+        return _result(item, key, adaptive, started, response)
+
+    def limit() -> int:
+        return concurrency if adaptive is None else adaptive.limit
+
+    async def aiter_items() -> AsyncIterator[_T]:
+        if isinstance(items, AsyncIterable):
+            async for item in items:
+                yield item
+        else:
+            for item in items:
+                yield item
+
+    source = aiter_items()
+    pending: Set["asyncio.Future[BulkResult]"] = set()
+    exhausted = False
+
+    async def submit() -> None:
+        nonlocal exhausted
+        while len(pending) < limit() and not exhausted:
+            try:
+                item = await source.__anext__()
+            except StopAsyncIteration:
+                exhausted = True
+                return
+            pending.add(asyncio.ensure_future(call(item)))
+
+    try:
+        await submit()
+        while pending:
+            done, _ = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                pending.remove(future)
+                yield future.result()
+            await submit()
+    finally:
+        for future in pending:
+            future.cancel()
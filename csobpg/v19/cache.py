@@ -0,0 +1,285 @@
+"""Payment status cache.
+
+`get_payment_status` of a client with a `StatusCache` returns the cached
+status until its TTL expires. The TTL depends on the payment status:
+final statuses never change unless the payment is operated on, while
+initiated and in-progress payments change within seconds. Any other call
+with the pay ID (close, reverse, refund, process) invalidates its cached
+status before and after the call. A status requested before the payment was
+invalidated (e.g. while it was being closed) is not cached, since it may
+have changed since. This holds for the calls made in the same process.
+
+The cache stores the statuses in a backend: `MemoryCacheBackend` (LRU in
+the process memory) or `SQLiteCacheBackend` (shared by the processes
+using the same database file).
+"""
+
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .response.base import PaymentStatus
+from .response.payment_status import PaymentStatusResponse
+
+#: operation of the cached calls
+STATUS_OPERATION = "payment/status"
+
+#: statuses which change only when the payment is operated on
+FINAL_STATUSES = frozenset(
+    {
+        PaymentStatus.CANCELLED,
+        PaymentStatus.REVERSED,
+        PaymentStatus.DENIED,
+        PaymentStatus.SETTLED,
+        PaymentStatus.RETURNED,
+    }
+)
+
+#: statuses which change within seconds
+PENDING_STATUSES = frozenset(
+    {PaymentStatus.INITIATED, PaymentStatus.IN_PROGRESS}
+)
+
+
+class CacheBackend(ABC):
+    """Storage of the cached values.
+
+    The backend must be thread-safe.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value or None if it is missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store the value for `ttl` seconds."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Delete the value if present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Delete all values."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Least recently used values in the process memory."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """Init the backend.
+
+        :param maxsize: maximum number of values. The least recently used
+          value is evicted when exceeded
+        """
+        if maxsize < 1:
+            raise ValueError('"maxsize" must be >= 1')
+        self.maxsize = maxsize
+        self._values: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._values.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._values[key]
+                return None
+            self._values.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._values[key] = (time.monotonic() + ttl, value)
+            self._values.move_to_end(key)
+            if len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Values in an SQLite database.
+
+    Processes using the same database file share the values. The values
+    are pickled, so the file must be writable by trusted processes only.
+    Expiration uses the wall clock.
+    """
+
+    def __init__(self, path: str, table: str = "payment_status") -> None:
+        """Init the backend.
+
+        :param path: database file. The table is created if missing
+        :param table: table of the values
+        """
+        if not table.isidentifier():
+            raise ValueError(f'Invalid table name "{table}"')
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            path, timeout=5, isolation_level=None, check_same_thread=False
+        )
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value BLOB)"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT expires_at, value FROM {self.table} WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] <= time.time():
+                self._db.execute(
+                    f"DELETE FROM {self.table} WHERE key = ? "
+                    "AND expires_at <= ?",
+                    (key, row[0]),
+                )
+                return None
+        return pickle.loads(row[1])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(key, expires_at, value) VALUES (?, ?, ?)",
+                (key, time.time() + ttl, data),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute(f"DELETE FROM {self.table}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+
+class StatusCache:
+    """Payment status cache with TTLs per payment status."""
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        final_ttl: float = 3600.0,
+        pending_ttl: float = 2.0,
+        default_ttl: float = 30.0,
+        ttls: Optional[Dict[PaymentStatus, float]] = None,
+    ) -> None:
+        """Init the cache.
+
+        :param backend: storage of the statuses. `MemoryCacheBackend` if not
+          provided
+        :param final_ttl: seconds to cache the `FINAL_STATUSES` for
+        :param pending_ttl: seconds to cache the `PENDING_STATUSES` for
+        :param default_ttl: seconds to cache the other statuses for (e.g.
+          confirmed or waiting for settlement)
+        :param ttls: TTLs of particular statuses overriding the above. A
+          status with the TTL of 0 is not cached
+        """
+        # pylint:disable=too-many-arguments
+        self.backend = MemoryCacheBackend() if backend is None else backend
+        self.default_ttl = default_ttl
+        self.ttls: Dict[PaymentStatus, float] = {
+            **{status: final_ttl for status in FINAL_STATUSES},
+            **{status: pending_ttl for status in PENDING_STATUSES},
+            **(ttls or {}),
+        }
+        self._lock = threading.Lock()
+        # generation and number of the status requests in flight per pay ID
+        self._requests: Dict[str, List[int]] = {}
+
+    def ttl(self, status: Optional[PaymentStatus]) -> float:
+        """Return seconds to cache the status for."""
+        if status is None:
+            return 0
+        return self.ttls.get(status, self.default_ttl)
+
+    def get(self, pay_id: str) -> Optional[PaymentStatusResponse]:
+        """Return the cached status of the payment."""
+        return self.backend.get(pay_id)
+
+    def put(self, response: PaymentStatusResponse) -> None:
+        """Cache the status for the TTL of its payment status."""
+        ttl = self.ttl(response.payment_status)
+        if ttl > 0 and response.success:
+            self.backend.set(response.pay_id, response, ttl)
+
+    def begin(self, pay_id: str) -> int:
+        """Register a status request of the payment about to be sent.
+
+        :return: generation of the payment to pass to `finish`
+        """
+        with self._lock:
+            entry = self._requests.setdefault(pay_id, [0, 0])
+            entry[1] += 1
+            return entry[0]
+
+    def finish(
+        self,
+        pay_id: str,
+        generation: int,
+        response: Optional[PaymentStatusResponse] = None,
+    ) -> None:
+        """Finish the status request and cache its response.
+
+        The response is not cached if the payment was invalidated since the
+        request began.
+
+        :param generation: generation returned by `begin`
+        :param response: None if the request failed
+        """
+        with self._lock:
+            entry = self._requests[pay_id]
+            entry[1] -= 1
+            if not entry[1]:
+                del self._requests[pay_id]
+            if response is not None and entry[0] == generation:
+                self.put(response)
+
+    def invalidate(self, pay_id: str) -> None:
+        """Remove the cached status of the payment."""
+        with self._lock:
+            entry = self._requests.get(pay_id)
+            if entry is not None:
+                entry[0] += 1
+            self.backend.delete(pay_id)
+
+    def clear(self) -> None:
+        """Remove all cached statuses."""
+        self.backend.clear()
+
+    def __str__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"backend={self.backend.__class__.__name__}, "
+            f"default_ttl={self.default_ttl})"
+        )
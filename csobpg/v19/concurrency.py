@@ -0,0 +1,122 @@
+"""Adaptive concurrency of bulk operations.
+
+`AdaptiveConcurrency` adjusts the number of calls in flight with additive
+increase and multiplicative decrease (AIMD), as TCP does with its
+congestion window:
+
+* after `limit` successful calls in a row, the limit grows by one
+* a call which fails with an overload error (HTTP errors, timeouts, API
+  internal errors) or is slower than `latency_threshold` multiplies the
+  limit by `backoff`. The calls started before the previous decrease do not
+  decrease the limit again, so a burst of failures counts once
+
+Pass it as the concurrency of a bulk operation:
+
+.. code-block:: python
+
+    concurrency = AdaptiveConcurrency(initial=8, max_limit=64)
+    for result in client.get_payment_statuses(pay_ids, concurrency):
+        ...
+    metrics.gauge("csob.concurrency", concurrency.limit)
+"""
+
+import logging
+import threading
+import time
+from typing import Optional, Tuple, Type
+
+from .breaker import FAILURE_ERRORS
+
+
+class AdaptiveConcurrency:
+    """Concurrency limit adjusted by AIMD.
+
+    The limit is thread-safe and may be shared by several bulk operations.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        latency_threshold: Optional[float] = None,
+        overload_errors: Tuple[Type[Exception], ...] = FAILURE_ERRORS,
+    ) -> None:
+        """Init the limit.
+
+        :param initial: initial number of calls in flight
+        :param min_limit: the limit never decreases below this
+        :param max_limit: the limit never grows over this
+        :param backoff: factor to multiply the limit with on overload
+        :param latency_threshold: calls slower than this (in seconds) mean
+          overload
+        :param overload_errors: errors meaning overload. Other errors (e.g.
+          a payment not found) mean that the gateway copes
+        """
+        # pylint:disable=too-many-arguments
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError(
+                '"min_limit" <= "initial" <= "max_limit" must be >= 1'
+            )
+        if not 0 < backoff < 1:
+            raise ValueError('"backoff" must be in (0, 1)')
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_threshold = latency_threshold
+        self.overload_errors = overload_errors
+        self._limit = initial
+        self._successes = 0
+        self._decreased_at = float("-inf")
+        self._lock = threading.Lock()
+        self._log = logging.getLogger(str(self))
+
+    @property
+    def limit(self) -> int:
+        """Return current number of calls allowed in flight."""
+        return self._limit
+
+    def record(
+        self, started: float, error: Optional[Exception] = None
+    ) -> None:
+        """Record a finished call.
+
+        :param started: `time.monotonic()` when the call started
+        :param error: error raised by the call
+        """
+        now = time.monotonic()
+        overloaded = isinstance(error, self.overload_errors) or (
+            self.latency_threshold is not None
+            and now - started > self.latency_threshold
+        )
+        with self._lock:
+            if not overloaded:
+                self._successes += 1
+                if (
+                    self._successes < self._limit
+                    or self._limit >= self.max_limit
+                ):
+                    return
+                self._successes = 0
+                self._limit += 1
+                return
+
+            self._successes = 0
+            if started < self._decreased_at:
+                return
+            limit = max(self.min_limit, int(self._limit * self.backoff))
+            self._decreased_at = now
+            if limit == self._limit:
+                return
+            self._limit = limit
+        self._log.info("Concurrency decreased to %s: error=%r", limit, error)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"min_limit={self.min_limit}, max_limit={self.max_limit}, "
+            f"backoff={self.backoff}, "
+            f"latency_threshold={self.latency_threshold})"
+        )
@@ -0,0 +1,114 @@
+"""Crypto backends for RSA SHA-256 PKCS#1 v1.5 signatures.
+
+The default backend uses `pycryptodome`. `csobpg.v19.crypto.openssl`
+provides a backend on top of OpenSSL (the `cryptography` package). Choose
+the backend when constructing the client:
+
+.. code-block:: python
+
+    from csobpg.v19.crypto.openssl import OpenSSLBackend
+
+    client = APIClient(..., crypto=OpenSSLBackend())
+"""
+
+import binascii
+from abc import ABC, abstractmethod
+from base64 import b64decode, b64encode
+from typing import TYPE_CHECKING, Any, Optional, Tuple, Union
+
+from ..errors import APIInvalidSignatureError
+from ..key import RSAKey, key_text
+from ..signature import Signer
+
+if TYPE_CHECKING:
+    from Crypto.PublicKey.RSA import RsaKey
+
+# pylint:disable=import-outside-toplevel
+
+
+class CryptoBackend(ABC):
+    """Crypto backend."""
+
+    @abstractmethod
+    def load_key(self, text: str) -> Any:
+        """Parse PEM private or public key."""
+
+    @abstractmethod
+    def sign(self, text: bytes, key: Any) -> bytes:
+        """Sign the text with the parsed private key."""
+
+    @abstractmethod
+    def verify(self, signature: bytes, text: bytes, key: Any) -> bool:
+        """Return whether the signature of the text is valid.
+
+        :param key: parsed public (or private) key
+        """
+
+    def signer(self, key: Union[str, "RsaKey", RSAKey]) -> "BackendSigner":
+        """Return signer with the key."""
+        return BackendSigner(self, key)
+
+
+class PycryptodomeBackend(CryptoBackend):
+    """`pycryptodome` backend."""
+
+    def load_key(self, text: str) -> "RsaKey":
+        from Crypto.PublicKey import RSA
+
+        return RSA.import_key(text)
+
+    def sign(self, text: bytes, key: "RsaKey") -> bytes:
+        from Crypto.Hash import SHA256
+        from Crypto.Signature import PKCS1_v1_5
+
+        return PKCS1_v1_5.new(key).sign(SHA256.new(text))
+
+    def verify(self, signature: bytes, text: bytes, key: "RsaKey") -> bool:
+        from Crypto.Hash import SHA256
+        from Crypto.Signature import PKCS1_v1_5
+
+        # pylint:disable=not-callable
+        return PKCS1_v1_5.new(key).verify(SHA256.new(text), signature)
+
+
+class BackendSigner(Signer):
+    """Signer using a crypto backend.
+
+    The key is parsed once and then re-parsed only if its text changes.
+    """
+
+    def __init__(
+        self, backend: CryptoBackend, key: Union[str, "RsaKey", RSAKey]
+    ) -> None:
+        self.backend = backend
+        self.key = key
+        self._parsed: Optional[Tuple[str, Any]] = None
+
+    @property
+    def parsed(self) -> Any:
+        """Return the key parsed by the backend."""
+        text = key_text(self.key)
+        if self._parsed is None or self._parsed[0] != text:
+            self._parsed = (text, self.backend.load_key(text))
+        return self._parsed[1]
+
+    def sign(self, text: bytes) -> str:
+        return b64encode(self.backend.sign(text, self.parsed)).decode()
+
+    def verify(self, signature: str, text: bytes) -> None:
+        try:
+            sig_as_bytes = b64decode(signature)
+        except binascii.Error as exc:
+            raise APIInvalidSignatureError(
+                f"Failed to decode base64: {exc}"
+            ) from exc
+
+        if not self.backend.verify(sig_as_bytes, text, self.parsed):
+            raise APIInvalidSignatureError("Invalid signature")
+
+
+__all__ = [
+    "BackendSigner",
+    "CryptoBackend",
+    "PycryptodomeBackend",
+]
@@ -0,0 +1,39 @@
+"""Crypto backend which uses OpenSSL via `cryptography` under the hood.
+
+The `cryptography` package must be installed to use this module.
+"""
+
+from typing import Union
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+from . import CryptoBackend
+
+_Key = Union[rsa.RSAPrivateKey, rsa.RSAPublicKey]
+
+
+class OpenSSLBackend(CryptoBackend):
+    """OpenSSL (`cryptography`) backend."""
+
+    def load_key(self, text: str) -> _Key:
+        if "PRIVATE KEY" in text:
+            key = serialization.load_pem_private_key(text.encode(), None)
+        else:
+            key = serialization.load_pem_public_key(text.encode())
+        if not isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+            raise ValueError("RSA key expected")
+        return key
+
+    def sign(self, text: bytes, key: rsa.RSAPrivateKey) -> bytes:
+        return key.sign(text, padding.PKCS1v15(), hashes.SHA256())
+
+    def verify(self, signature: bytes, text: bytes, key: _Key) -> bool:
+        if isinstance(key, rsa.RSAPrivateKey):
+            key = key.public_key()
+        try:
+            key.verify(signature, text, padding.PKCS1v15(), hashes.SHA256())
+        except InvalidSignature:
+            return False
+        return True
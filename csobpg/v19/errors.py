@@ -9,6 +9,41 @@ class APIInvalidSignatureError(APIClientError):
     """API returned invalid signature."""
 
 
+class APICircuitOpenError(APIClientError):
+    """Calls to the API are rejected by the circuit breaker."""
+
+    def __init__(self, group: str, retry_after: float) -> None:
+        """Init the error.
+
+        :param group: endpoint group whose circuit is open
+        :param retry_after: seconds until the next probe
+        """
+        self.group = group
+        self.retry_after = retry_after
+        super().__init__(
+            f'Circuit for "{group}" is open, retry after {retry_after:.1f}s'
+        )
+
+
+class APIRateLimitedError(APIClientError):
+    """Calls to the API are rejected by the client-side rate limiter."""
+
+    def __init__(self, merchant_id: str, family: str, retry_after: float):
+        """Init the error.
+
+        :param merchant_id: merchant whose calls are limited
+        :param family: endpoint family whose limit is exceeded
+        :param retry_after: seconds until a call is allowed
+        """
+        self.merchant_id = merchant_id
+        self.family = family
+        self.retry_after = retry_after
+        super().__init__(
+            f'Rate limit of "{family}" for merchant "{merchant_id}" is '
+            f"exceeded, retry after {retry_after:.1f}s"
+        )
+
+
 class APIError(Exception):
     """API error."""
 
@@ -1,36 +1,73 @@
 """RSA keys."""
 
+import os
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from Crypto.PublicKey.RSA import RsaKey
 
 
 class RSAKey(ABC):
     """RSA key."""
 
+    _parsed: Optional[Tuple[str, "RsaKey"]] = None
+
     @abstractmethod
     def __str__(self) -> str:
         """Return key object."""
 
+    @property
+    def parsed(self) -> "RsaKey":
+        """Return parsed key object.
+
+        The key is parsed once and then re-parsed only if its text changes.
+        """
+        text = str(self)
+        if self._parsed is None or self._parsed[0] != text:
+            # pylint:disable=import-outside-toplevel
+            from Crypto.PublicKey import RSA
+
+            self._parsed = (text, RSA.import_key(text))
+        return self._parsed[1]
+
 
 class FileRSAKey(RSAKey):
-    """RSA key from file."""
+    """RSA key from file.
+
+    The file is re-read only when its modification time changes.
+    """
 
     def __init__(self, path: str) -> None:
         self.path = path
+        self._text = ""
+        self._mtime_ns: Optional[int] = None
 
     def __str__(self) -> str:
-        with open(self.path, encoding="utf8") as file:
-            return file.read()
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        if mtime_ns != self._mtime_ns:
+            with open(self.path, encoding="utf8") as file:
+                self._text = file.read()
+            self._mtime_ns = mtime_ns
+
+        return self._text
 
 
 class RAMRSAKey(FileRSAKey):
-    """RAM cached RSA key."""
+    """RAM cached RSA key.
 
-    def __init__(self, path: str) -> None:
-        super().__init__(path)
-        self._key = None
+    The file is read only once.
+    """
 
     def __str__(self) -> str:
-        if not self._key:
-            self._key = super().__str__()
+        if self._mtime_ns is None:
+            return super().__str__()
+
+        return self._text
+
 
-        return self._key
+def key_text(key: Union[str, "RsaKey", RSAKey]) -> str:
+    """Return the PEM text of the key."""
+    if isinstance(key, (str, RSAKey)):
+        return str(key)
+    return key.export_key().decode()
@@ -0,0 +1,40 @@
+"""Lazy import of package attributes.
+
+Packages export their public names through a module `__getattr__`, so a
+submodule is imported only when one of its names is used:
+
+.. code-block:: python
+
+    __getattr__, __dir__ = lazy_attributes(__name__, {"EchoRequest": ".echo"})
+"""
+
+import sys
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_attributes(
+    package: str, names: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Return module `__getattr__` and `__dir__` functions.
+
+    :param package: name of the package
+    :param names: modules of the lazy attributes, relative to the package
+    """
+
+    def __getattr__(name: str) -> Any:  # pylint:disable=invalid-name
+        try:
+            module = names[name]
+        except KeyError:
+            raise AttributeError(
+                f"module {package!r} has no attribute {name!r}"
+            ) from None
+        value = getattr(import_module(module, package), name)
+        # next time the attribute is found without calling __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:  # pylint:disable=invalid-name
+        return sorted({*vars(sys.modules[package]), *names})
+
+    return __getattr__, __dir__
@@ -0,0 +1,25 @@
+"""Mock ČSOB payment gateway for load testing.
+
+Run it from the command line (see `python -m csobpg.v19.mock --help`) or
+embed it in tests:
+
+.. code-block:: python
+
+    gateway = MockGateway(
+        RAMRSAKey("merchant.pub"), RAMRSAKey("gateway.key"), latency=0.05
+    )
+    with MockServer(gateway) as server:
+        client = APIClient(
+            "merchantId", "merchant.key", "gateway.pub", base_url=server.url
+        )
+"""
+
+from .gateway import MockGateway, MockResponse
+from .server import MockHTTPClient, MockServer
+
+__all__ = [
+    "MockGateway",
+    "MockHTTPClient",
+    "MockResponse",
+    "MockServer",
+]
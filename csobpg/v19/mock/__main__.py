@@ -0,0 +1,119 @@
+"""Run the mock gateway server.
+
+Example::
+
+    python -m csobpg.v19.mock --merchant-public-key merchant.pub \\
+        --gateway-public-key-out gateway.pub --latency 0.05 \\
+        --error-rate 0.01 --result-code payment/close=900 --capacity 50
+"""
+
+import argparse
+import logging
+from typing import Dict, List, Optional
+
+from ..key import RAMRSAKey
+from .gateway import MockGateway
+from .server import MockServer
+
+
+def _parse_result_codes(values: List[str]) -> Dict[str, int]:
+    result = {}
+    for value in values:
+        operation, _, code = value.partition("=")
+        try:
+            result[operation] = int(code)
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f'Invalid result code "{value}", expected OPERATION=CODE'
+            ) from None
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the mock gateway server."""
+    parser = argparse.ArgumentParser(
+        prog="python -m csobpg.v19.mock", description="Mock ČSOB gateway"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--merchant-public-key",
+        required=True,
+        help="merchant public key to verify request signatures with",
+    )
+    parser.add_argument(
+        "--gateway-private-key",
+        help="key to sign responses with. Generated if not provided",
+    )
+    parser.add_argument(
+        "--gateway-public-key-out",
+        help="file to write the gateway public key to",
+    )
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="probability of responding with HTTP 500",
+    )
+    parser.add_argument(
+        "--result-code",
+        action="append",
+        default=[],
+        metavar="OPERATION=CODE",
+        help='result code to respond with, e.g. "payment/close=900" or '
+        '"*=900". May be repeated',
+    )
+    parser.add_argument("--result-code-rate", type=float, default=1.0)
+    parser.add_argument(
+        "--settle-after",
+        type=float,
+        help="seconds after which closed payments are settled",
+    )
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--capacity",
+        type=int,
+        help="calls served at once, the others are responded with HTTP 503",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        result_codes = _parse_result_codes(args.result_code)
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+
+    logging.basicConfig(level=logging.INFO)
+    gateway = MockGateway(
+        RAMRSAKey(args.merchant_public_key),
+        (
+            RAMRSAKey(args.gateway_private_key)
+            if args.gateway_private_key
+            else None
+        ),
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        result_codes=result_codes,
+        result_code_rate=args.result_code_rate,
+        settle_after=args.settle_after,
+        seed=args.seed,
+        capacity=args.capacity,
+    )
+    if args.gateway_public_key_out:
+        with open(args.gateway_public_key_out, "w", encoding="utf8") as file:
+            file.write(gateway.public_key)
+
+    server = MockServer(gateway, args.host, args.port)
+    logging.info("Serving %s on %s", gateway, server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
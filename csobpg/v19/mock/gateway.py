@@ -0,0 +1,706 @@
+"""Mock payment gateway.
+
+The gateway keeps payments in memory and moves them through the states of
+`PaymentStatus`:
+
+* `payment/init` (and the OneClick, GooglePay and ApplePay inits) creates a
+  payment in the INITIATED state
+* `payment/process` (or the `*/process` operations) authorizes it:
+  CONFIRMED, or WAITING_SETTLEMENT if the payment is closed automatically
+* `payment/close` moves a CONFIRMED payment to WAITING_SETTLEMENT
+* `payment/reverse` reverses a CONFIRMED or WAITING_SETTLEMENT payment
+* `payment/refund` refunds a SETTLED payment (REFUND_PROCESSING)
+* `settle()` simulates the daily settlement: WAITING_SETTLEMENT payments
+  become SETTLED and REFUND_PROCESSING ones become RETURNED
+
+Request signatures are verified with the merchant public key and responses
+are signed with the gateway key, using the same sign text rules as the
+client.
+"""
+
+import random
+import secrets
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import unquote_plus, urlencode
+
+from Crypto.PublicKey import RSA
+
+from .. import response as _response
+from ..errors import APIError, APIInvalidSignatureError
+from ..request.dttm import get_dttm
+from ..response.base import PaymentStatus, Response
+from ..signature import KeyType, _str_or_jsbool, sign, verify
+
+#: order of the top-level request fields in the sign text per operation.
+#: Nested objects are signed in the order of their JSON fields
+REQUEST_SIGN_ORDER: Dict[str, Tuple[str, ...]] = {
+    "payment/init": (
+        "merchantId",
+        "orderNo",
+        "dttm",
+        "payOperation",
+        "payMethod",
+        "totalAmount",
+        "currency",
+        "closePayment",
+        "returnUrl",
+        "returnMethod",
+        "cart",
+        "customer",
+        "order",
+        "merchantData",
+        "customerId",
+        "language",
+        "ttlSec",
+        "logoVersion",
+        "colorSchemeVersion",
+        "customExpiry",
+    ),
+    "payment/close": ("merchantId", "payId", "dttm", "totalAmount"),
+    "payment/reverse": ("merchantId", "payId", "dttm"),
+    "payment/refund": ("merchantId", "payId", "dttm", "amount"),
+    "oneclick/init": (
+        "merchantId",
+        "origPayId",
+        "orderNo",
+        "dttm",
+        "payMethod",
+        "clientIp",
+        "totalAmount",
+        "currency",
+        "closePayment",
+        "returnUrl",
+        "returnMethod",
+        "customer",
+        "order",
+        "clientInitiated",
+        "sdkUsed",
+        "merchantData",
+        "language",
+        "ttlSec",
+    ),
+    "oneclick/process": ("merchantId", "payId", "dttm", "fingerprint"),
+    "oneclick/echo": ("merchantId", "origPayId", "dttm"),
+    "echo": ("merchantId", "dttm"),
+}
+for _wallet in ("googlepay", "applepay"):
+    REQUEST_SIGN_ORDER[f"{_wallet}/init"] = (
+        "merchantId",
+        "orderNo",
+        "dttm",
+        "clientIp",
+        "totalAmount",
+        "currency",
+        "closePayment",
+        "payload",
+        "returnUrl",
+        "returnMethod",
+        "customer",
+        "order",
+        "sdkUsed",
+        "merchantData",
+        "language",
+        "ttlSec",
+    )
+    REQUEST_SIGN_ORDER[f"{_wallet}/process"] = REQUEST_SIGN_ORDER[
+        "oneclick/process"
+    ]
+    REQUEST_SIGN_ORDER[f"{_wallet}/echo"] = REQUEST_SIGN_ORDER["echo"]
+
+#: operations with parameters in the URL: merchantId/payId/dttm/signature
+_URL_OPERATIONS = ("payment/status", "payment/process")
+
+#: response attributes and their JSON fields
+_RESPONSE_FIELDS = (
+    ("pay_id", "payId"),
+    ("template_id", "origPayId"),
+    ("payment_status", "paymentStatus"),
+    ("auth_code", "authCode"),
+    ("customer_code", "customerCode"),
+    ("status_detail", "statusDetail"),
+    ("_merchant_data", "merchantData"),
+    ("init_params", "initParams"),
+)
+
+_AUTHORIZED = (
+    PaymentStatus.CONFIRMED,
+    PaymentStatus.WAITING_SETTLEMENT,
+    PaymentStatus.SETTLED,
+)
+
+
+def flatten_sign_values(value: Any) -> List[str]:
+    """Return sign text items of a JSON value.
+
+    Objects are flattened in the order of their fields, arrays in the order
+    of their items. Nulls are skipped.
+    """
+    if value is None:
+        return []
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, list):
+        return [item for val in value for item in flatten_sign_values(val)]
+    return [_str_or_jsbool(value)]
+
+
+def request_sign_text(operation: str, body: dict) -> str:
+    """Build sign text of the request body."""
+    return "|".join(
+        item
+        for key in REQUEST_SIGN_ORDER[operation]
+        for item in flatten_sign_values(body.get(key))
+    )
+
+
+class MockResponse(NamedTuple):
+    """Response of the mock gateway."""
+
+    status_code: int
+    body: Optional[dict] = None
+    headers: Optional[Dict[str, str]] = None
+
+
+class _ResultResponse(Response):
+    """Response with the result only (echo and errors)."""
+
+    def __init__(
+        self,
+        dttm: str,
+        result_code: int,
+        result_message: str,
+        pay_id: Optional[str] = None,
+        init_params: Optional[dict] = None,
+    ) -> None:
+        # pylint:disable=too-many-arguments
+        super().__init__(dttm, result_code, result_message)
+        self.pay_id = pay_id
+        self.init_params = init_params
+
+    @classmethod
+    def _from_json(
+        cls, response: dict, dttm: str, result_code: int, result_message: str
+    ) -> "_ResultResponse":
+        return cls(
+            dttm,
+            result_code,
+            result_message,
+            response.get("payId"),
+            response.get("initParams"),
+        )
+
+    def _get_params_sequence(self) -> tuple:
+        return (
+            self.pay_id,
+            "|".join(flatten_sign_values(self.init_params)) or None,
+            self.dttm,
+            self.result_code,
+            self.result_message,
+        )
+
+
+class _Payment:
+    """Payment kept by the gateway."""
+
+    def __init__(
+        self, pay_id: str, merchant_id: str, body: dict, one_click: bool
+    ) -> None:
+        self.pay_id = pay_id
+        self.merchant_id = merchant_id
+        self.order_no = body.get("orderNo")
+        self.total_amount = body.get("totalAmount") or 0
+        self.close_payment = body.get("closePayment", True)
+        self.return_url = body.get("returnUrl")
+        self.merchant_data = body.get("merchantData")
+        self.one_click = one_click
+        self.status = PaymentStatus.INITIATED
+        self.auth_code: Optional[str] = None
+        self.refunded = 0
+        self.closed_at: Optional[float] = None
+
+
+_Handler = Callable[[str, dict], Union[Response, MockResponse]]
+
+
+class MockGateway:
+    """Mock ČSOB payment gateway.
+
+    Handles API calls in memory. Use `MockServer` to serve it over HTTP, or
+    `MockHTTPClient` to call it in-process. The gateway is thread-safe.
+    """
+
+    def __init__(
+        self,
+        merchant_public_key: KeyType,
+        gateway_private_key: Optional[KeyType] = None,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        result_codes: Optional[Dict[str, int]] = None,
+        result_code_rate: float = 1.0,
+        settle_after: Optional[float] = None,
+        seed: Optional[int] = None,
+        capacity: Optional[int] = None,
+    ) -> None:
+        """Init the gateway.
+
+        :param merchant_public_key: key to verify request signatures with
+        :param gateway_private_key: key to sign responses with. A new key is
+          generated if not provided (see `public_key`)
+        :param latency: seconds to wait before responding
+        :param latency_jitter: random seconds (up to) added to the latency
+        :param error_rate: probability of responding with HTTP 500 and an
+          empty body
+        :param result_codes: result codes to respond with per operation, e.g.
+          {"payment/close": 900}. Use "*" for all operations
+        :param result_code_rate: probability of responding with the result
+          code from `result_codes`
+        :param settle_after: seconds after which closed payments are settled
+          automatically. Payments are settled only by `settle()` if None
+        :param seed: seed of the random generator
+        :param capacity: maximum number of calls served at once (see
+          `respond`). Unlimited if None
+        """
+        # pylint:disable=too-many-arguments
+        for name, rate in (
+            ("error_rate", error_rate),
+            ("result_code_rate", result_code_rate),
+        ):
+            if not 0 <= rate <= 1:
+                raise ValueError(f'"{name}" must be in [0, 1]')
+
+        self._merchant_key = merchant_public_key
+        if gateway_private_key is None:
+            gateway_private_key = RSA.generate(2048)
+        self._gateway_key = gateway_private_key
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.result_codes = dict(result_codes or {})
+        self.result_code_rate = result_code_rate
+        self.settle_after = settle_after
+        self.capacity = capacity
+        self._in_flight = 0
+        self._random = random.Random(seed)
+        self._payments: Dict[str, _Payment] = {}
+        self._lock = threading.RLock()
+        self._handlers: Dict[Tuple[str, str], _Handler] = {
+            ("post", "payment/init"): self._init,
+            ("get", "payment/process"): self._process_redirect,
+            ("get", "payment/status"): self._status,
+            ("put", "payment/close"): self._close,
+            ("put", "payment/reverse"): self._reverse,
+            ("put", "payment/refund"): self._refund,
+            ("post", "oneclick/init"): self._oneclick_init,
+            ("post", "oneclick/process"): self._process,
+            ("post", "oneclick/echo"): self._oneclick_echo,
+            ("post", "googlepay/init"): self._init,
+            ("post", "googlepay/process"): self._process,
+            ("post", "googlepay/echo"): self._googlepay_echo,
+            ("post", "applepay/init"): self._init,
+            ("post", "applepay/process"): self._process,
+            ("post", "applepay/echo"): self._applepay_echo,
+            ("post", "echo"): self._echo,
+        }
+
+    @property
+    def public_key(self) -> str:
+        """Return gateway public key (PEM) to verify responses with."""
+        key = self._gateway_key
+        if not isinstance(key, RSA.RsaKey):
+            key = RSA.import_key(str(key))
+        return key.public_key().export_key().decode()
+
+    def delay(self) -> float:
+        """Return seconds to wait before responding."""
+        if not self.latency_jitter:
+            return self.latency
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.latency_jitter)
+
+    def respond(
+        self, method: str, path: str, body: Optional[dict] = None
+    ) -> MockResponse:
+        """Handle an API call and wait the latency before responding.
+
+        The calls over the capacity are responded with HTTP 503, as an
+        overloaded gateway would.
+        """
+        with self._lock:
+            self._in_flight += 1
+            overloaded = (
+                self.capacity is not None and self._in_flight > self.capacity
+            )
+        try:
+            if overloaded:
+                response = MockResponse(503)
+            else:
+                response = self.handle(method, path, body)
+            delay = self.delay()
+            if delay:
+                time.sleep(delay)
+            return response
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def handle(
+        self, method: str, path: str, body: Optional[dict] = None
+    ) -> MockResponse:
+        """Handle an API call.
+
+        :param method: HTTP method
+        :param path: path relative to the API base URL, e.g. "payment/init"
+        """
+        method = method.lower()
+        path = path.strip("/")
+        operation = next(
+            (op for op in _URL_OPERATIONS if path.startswith(op + "/")), path
+        )
+        handler = self._handlers.get((method, operation))
+        if handler is None:
+            return MockResponse(404)
+
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+            forced_code = self.result_codes.get(
+                operation, self.result_codes.get("*")
+            )
+            forced = (
+                forced_code is not None
+                and self._random.random() < self.result_code_rate
+            )
+        if failed:
+            return MockResponse(500)
+
+        try:
+            if operation in _URL_OPERATIONS:
+                body = self._parse_url(operation, path)
+            body = body or {}
+            self._verify(operation, body)
+            if forced:
+                raise APIError(forced_code, "Injected error")  # type: ignore
+            result = handler(operation, body)
+        except APIError as exc:
+            return self._reply(
+                _ResultResponse(
+                    get_dttm(),
+                    exc.code,
+                    exc.message,
+                    (body or {}).get("payId"),
+                )
+            )
+        if isinstance(result, MockResponse):
+            return result
+        return self._reply(result)
+
+    def authorize(self, pay_id: str, approve: bool = True) -> PaymentStatus:
+        """Authorize the payment as if the customer paid.
+
+        :param approve: whether to approve (or deny) the payment
+        :return: new payment status
+        """
+        with self._lock:
+            payment = self._get_payment(pay_id)
+            self._check_status(payment, PaymentStatus.INITIATED)
+            if not approve:
+                payment.status = PaymentStatus.DENIED
+            elif payment.close_payment:
+                payment.status = PaymentStatus.WAITING_SETTLEMENT
+                payment.closed_at = time.monotonic()
+            else:
+                payment.status = PaymentStatus.CONFIRMED
+            if approve:
+                payment.auth_code = f"{self._random.randrange(10**6):06d}"
+            return payment.status
+
+    def settle(self) -> None:
+        """Settle closed payments and finish refunds."""
+        with self._lock:
+            for payment in self._payments.values():
+                self._settle(payment, force=True)
+
+    def payment_status(self, pay_id: str) -> PaymentStatus:
+        """Return status of the payment."""
+        with self._lock:
+            payment = self._get_payment(pay_id)
+            self._settle(payment)
+            return payment.status
+
+    def _settle(self, payment: _Payment, force: bool = False) -> None:
+        if payment.status == PaymentStatus.REFUND_PROCESSING and force:
+            payment.status = PaymentStatus.RETURNED
+        elif payment.status == PaymentStatus.WAITING_SETTLEMENT and (
+            force
+            or self.settle_after is not None
+            and time.monotonic() - payment.closed_at  # type: ignore
+            >= self.settle_after
+        ):
+            payment.status = PaymentStatus.SETTLED
+
+    def _verify(self, operation: str, body: dict) -> None:
+        for key in ("merchantId", "dttm", "signature"):
+            if not body.get(key):
+                raise APIError(100, f"Missing parameter {key}")
+
+        if operation in _URL_OPERATIONS:
+            text = "|".join((body["merchantId"], body["payId"], body["dttm"]))
+        else:
+            text = request_sign_text(operation, body)
+        try:
+            verify(body["signature"], text.encode(), self._merchant_key)
+        except APIInvalidSignatureError:
+            raise APIError(110, "Invalid signature") from None
+
+    @staticmethod
+    def _parse_url(operation: str, path: str) -> dict:
+        params = [
+            unquote_plus(param)
+            for param in path[len(operation) :].strip("/").split("/")
+        ]
+        if len(params) != 4:
+            raise APIError(100, "Missing parameters")
+        return dict(zip(("merchantId", "payId", "dttm", "signature"), params))
+
+    def _reply(self, response: Response) -> MockResponse:
+        body: Dict[str, Any] = {}
+        for attr, key in _RESPONSE_FIELDS[:2]:
+            value = getattr(response, attr, None)
+            if value is not None:
+                body[key] = value
+        body["dttm"] = response.dttm
+        body["resultCode"] = response.result_code
+        body["resultMessage"] = response.result_message
+        for attr, key in _RESPONSE_FIELDS[2:]:
+            value = getattr(response, attr, None)
+            if value is not None:
+                body[key] = (
+                    value.value if isinstance(value, PaymentStatus) else value
+                )
+        body["signature"] = sign(
+            response.to_sign_text().encode(), self._gateway_key
+        )
+        return MockResponse(200, body)
+
+    def _get_payment(self, pay_id: Optional[str]) -> _Payment:
+        payment = self._payments.get(pay_id or "")
+        if payment is None:
+            raise APIError(140, "Payment not found")
+        return payment
+
+    def _find_payment(self, merchant_id: str, body: dict) -> _Payment:
+        payment = self._get_payment(body.get("payId"))
+        if payment.merchant_id != merchant_id:
+            raise APIError(140, "Payment not found")
+        self._settle(payment)
+        return payment
+
+    @staticmethod
+    def _check_status(payment: _Payment, *statuses: PaymentStatus) -> None:
+        if payment.status not in statuses:
+            raise APIError(150, "Payment not in valid state")
+
+    def _new_payment(self, body: dict, one_click: bool = False) -> _Payment:
+        if not body.get("orderNo"):
+            raise APIError(100, "Missing parameter orderNo")
+        with self._lock:
+            pay_id = secrets.token_hex(8)[:15]
+            payment = self._payments[pay_id] = _Payment(
+                pay_id, body["merchantId"], body, one_click
+            )
+        return payment
+
+    def _init(self, operation: str, body: dict) -> Response:
+        payment = self._new_payment(
+            body, one_click=body.get("payOperation") == "oneclickPayment"
+        )
+        response_cls = {
+            "payment/init": _response.PaymentInitResponse,
+            "googlepay/init": _response.GooglePayInitResponse,
+            "applepay/init": _response.ApplePayInitResponse,
+        }[operation]
+        return response_cls(
+            payment.pay_id, get_dttm(), 0, "OK", payment.status
+        )
+
+    def _process(self, operation: str, body: dict) -> Response:
+        with self._lock:
+            payment = self._find_payment(body["merchantId"], body)
+            self.authorize(payment.pay_id)
+        response_cls = {
+            "oneclick/process": _response.OneClickPaymentProcessResponse,
+            "googlepay/process": _response.GooglePayProcessResponse,
+            "applepay/process": _response.ApplePayProcessResponse,
+        }[operation]
+        return response_cls(
+            payment.pay_id, get_dttm(), 0, "OK", payment.status
+        )
+
+    def _process_redirect(self, _: str, body: dict) -> MockResponse:
+        with self._lock:
+            payment = self._find_payment(body["merchantId"], body)
+            self.authorize(payment.pay_id)
+        response = _response.PaymentProcessResponse(
+            payment.pay_id,
+            get_dttm(),
+            0,
+            "OK",
+            payment.status,
+            auth_code=payment.auth_code,
+            merchant_data=payment.merchant_data,
+        )
+        params = self._reply(response).body
+        return MockResponse(
+            303,
+            headers={"Location": f"{payment.return_url}?{urlencode(params)}"},
+        )
+
+    def _status(self, _: str, body: dict) -> Response:
+        with self._lock:
+            payment = self._find_payment(body["merchantId"], body)
+            return _response.PaymentStatusResponse(
+                payment.pay_id,
+                get_dttm(),
+                0,
+                "OK",
+                payment.status,
+                payment.auth_code,
+            )
+
+    def _close(self, _: str, body: dict) -> Response:
+        with self._lock:
+            payment = self._find_payment(body["merchantId"], body)
+            self._check_status(payment, PaymentStatus.CONFIRMED)
+            amount = body.get("totalAmount")
+            if amount is not None:
+                if not 0 < amount <= payment.total_amount:
+                    raise APIError(110, "Invalid totalAmount")
+                payment.total_amount = amount
+            payment.status = PaymentStatus.WAITING_SETTLEMENT
+            payment.closed_at = time.monotonic()
+            return _response.PaymentCloseResponse(
+                payment.pay_id,
+                get_dttm(),
+                0,
+                "OK",
+                payment.status,
+                payment.auth_code,
+            )
+
+    def _reverse(self, _: str, body: dict) -> Response:
+        with self._lock:
+            payment = self._find_payment(body["merchantId"], body)
+            self._check_status(
+                payment,
+                PaymentStatus.CONFIRMED,
+                PaymentStatus.WAITING_SETTLEMENT,
+            )
+            payment.status = PaymentStatus.REVERSED
+            return _response.PaymentReverseResponse(
+                payment.pay_id, get_dttm(), 0, "OK", payment.status
+            )
+
+    def _refund(self, _: str, body: dict) -> Response:
+        with self._lock:
+            payment = self._find_payment(body["merchantId"], body)
+            self._check_status(
+                payment,
+                PaymentStatus.SETTLED,
+                PaymentStatus.REFUND_PROCESSING,
+            )
+            remaining = payment.total_amount - payment.refunded
+            amount = body.get("amount")
+            amount = remaining if amount is None else amount
+            if not 0 < amount <= remaining:
+                raise APIError(110, "Invalid amount")
+            payment.refunded += amount
+            payment.status = PaymentStatus.REFUND_PROCESSING
+            return _response.PaymentRefundResponse(
+                payment.pay_id, get_dttm(), 0, "OK", payment.status
+            )
+
+    def _template(self, merchant_id: str, template_id: str) -> _Payment:
+        with self._lock:
+            template = self._payments.get(template_id)
+            if (
+                template is None
+                or template.merchant_id != merchant_id
+                or not template.one_click
+                or template.status not in _AUTHORIZED
+            ):
+                raise APIError(700, "OneClick template not found")
+            return template
+
+    def _oneclick_init(self, _: str, body: dict) -> Response:
+        template = self._template(body["merchantId"], body.get("origPayId"))
+        payment = self._new_payment(
+            {
+                "totalAmount": template.total_amount,
+                "returnUrl": template.return_url,
+                **body,
+            }
+        )
+        return _response.OneClickPaymentInitResponse(
+            payment.pay_id, get_dttm(), 0, "OK", payment.status
+        )
+
+    def _oneclick_echo(self, _: str, body: dict) -> Response:
+        template = self._template(body["merchantId"], body.get("origPayId"))
+        return _response.OneClickEchoResponse(
+            template.pay_id, get_dttm(), 0, "OK"
+        )
+
+    @staticmethod
+    def _googlepay_echo(*_) -> Response:
+        return _ResultResponse(
+            get_dttm(),
+            0,
+            "OK",
+            init_params={
+                "apiVersion": 2,
+                "apiVersionMinor": 0,
+                "paymentMethodType": "CARD",
+                "allowedCardNetworks": ["MASTERCARD", "VISA"],
+                "allowedCardAuthMethods": ["CRYPTOGRAM_3DS"],
+                "googlepayMerchantId": "mock",
+                "merchantName": "Mock",
+                "countryCode": "CZ",
+                "environment": "TEST",
+            },
+        )
+
+    @staticmethod
+    def _applepay_echo(*_) -> Response:
+        return _ResultResponse(
+            get_dttm(),
+            0,
+            "OK",
+            init_params={
+                "countryCode": "CZ",
+                "supportedNetworks": ["masterCard", "visa"],
+                "merchantCapabilities": ["supports3DS"],
+            },
+        )
+
+    @staticmethod
+    def _echo(*_) -> Response:
+        return _ResultResponse(get_dttm(), 0, "OK")
+
+    def __str__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"latency={self.latency}, "
+            f"error_rate={self.error_rate}, "
+            f"result_codes={self.result_codes})"
+        )
@@ -0,0 +1,167 @@
+"""HTTP server and in-process HTTP client for the mock gateway."""
+
+import json as jsonlib
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from httprest.http import HTTPClient, HTTPResponse
+from httprest.http.cert import ClientCertificate
+
+from .gateway import MockGateway, MockResponse
+
+#: path of the API on the mock server
+BASE_PATH = "/api/v1.9"
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _encode(response: MockResponse) -> Tuple[int, bytes, Dict[str, str]]:
+    headers = dict(response.headers or {})
+    body = b""
+    if response.body is not None:
+        headers["Content-Type"] = "application/json"
+        body = jsonlib.dumps(response.body).encode()
+    return response.status_code, body, headers
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_HTTPServer"
+
+    def do_GET(self) -> None:  # pylint:disable=invalid-name
+        """Handle GET request."""
+        self._handle("get")
+
+    def do_POST(self) -> None:  # pylint:disable=invalid-name
+        """Handle POST request."""
+        self._handle("post")
+
+    def do_PUT(self) -> None:  # pylint:disable=invalid-name
+        """Handle PUT request."""
+        self._handle("put")
+
+    def _handle(self, method: str) -> None:
+        body = None
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            try:
+                body = jsonlib.loads(self.rfile.read(length))
+            except ValueError:
+                self._send(400, b"", {})
+                return
+
+        path = urlsplit(self.path).path
+        if not path.startswith(BASE_PATH + "/"):
+            self._send(404, b"", {})
+            return
+
+        response = self.server.gateway.respond(
+            method, path[len(BASE_PATH) :], body
+        )
+        self._send(*_encode(response))
+
+    def _send(self, status: int, body: bytes, headers: dict) -> None:
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:  # pylint:disable=W0622
+        _LOGGER.debug(format, *args)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # the default backlog of 5 connections makes load tests wait for
+    # reconnects instead of the gateway
+    request_queue_size = 128
+
+    def __init__(self, address: tuple, gateway: MockGateway) -> None:
+        super().__init__(address, _Handler)
+        self.gateway = gateway
+
+
+class MockServer:
+    """HTTP server serving the mock gateway.
+
+    .. code-block:: python
+
+        with MockServer(gateway) as server:
+            client = APIClient(..., base_url=server.url)
+    """
+
+    def __init__(
+        self, gateway: MockGateway, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        """Init the server.
+
+        :param port: port to listen on. A free port is chosen if 0
+        """
+        self.gateway = gateway
+        self._server = _HTTPServer((host, port), gateway)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Return API base URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{BASE_PATH}"
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        """Serve in the current thread."""
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "MockServer":
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(url='{self.url}')"
+
+
+class MockHTTPClient(HTTPClient):
+    """HTTP client calling the mock gateway in-process.
+
+    It skips the network entirely. The gateway latency is still applied.
+    """
+
+    def __init__(self, gateway: MockGateway) -> None:
+        super().__init__()
+        self.gateway = gateway
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        json: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        cert: Optional[ClientCertificate] = None,
+    ) -> HTTPResponse:
+        # pylint:disable=too-many-arguments
+        path = urlsplit(url).path
+        if BASE_PATH in path:
+            path = path.split(BASE_PATH, 1)[1]
+        return HTTPResponse(*_encode(self.gateway.respond(method, path, json)))
@@ -8,6 +8,8 @@ from ..signature import SignedModel
 class Endpoint(SignedModel):
     """Browser init."""
 
+    __slots__ = ("url", "method", "vars")
+
     def __init__(
         self,
         url: str,
@@ -41,6 +43,8 @@ class Endpoint(SignedModel):
 class SDKInit(SignedModel):
     """SDK init."""
 
+    __slots__ = ("directory_server_id", "scheme_id", "message_version")
+
     def __init__(
         self, directory_server_id: str, scheme_id: str, message_version: str
     ) -> None:
@@ -77,6 +81,13 @@ class SDKInit(SignedModel):
 class SDKChallenge(SignedModel):
     """SDK challenge."""
 
+    __slots__ = (
+        "three_dsserver_trans_id",
+        "acs_reference_number",
+        "acs_trans_id",
+        "acs_signed_content",
+    )
+
     def __init__(
         self,
         three_dsserver_trans_id: str,
@@ -121,6 +132,8 @@ class SDKChallenge(SignedModel):
 class Fingerprint(SignedModel):
     """Fingerprint."""
 
+    __slots__ = ("browser_init", "sdk_init")
+
     def __init__(
         self,
         browser_init: Optional[Endpoint] = None,
@@ -147,8 +160,8 @@ class Fingerprint(SignedModel):
 
     def _get_params_sequence(self) -> tuple:
         return (
-            self.browser_init.to_sign_text() if self.browser_init else None,
-            self.sdk_init.to_sign_text() if self.sdk_init else None,
+            self.browser_init,
+            self.sdk_init,
         )
 
     def __str__(self) -> str:
@@ -163,6 +176,8 @@ class Fingerprint(SignedModel):
 class Authenticate(SignedModel):
     """Authenticate."""
 
+    __slots__ = ("browser_challenge", "sdk_challenge")
+
     def __init__(
         self,
         browser_challenge: Optional[Endpoint] = None,
@@ -188,14 +203,7 @@ class Authenticate(SignedModel):
         )
 
     def _get_params_sequence(self) -> tuple:
-        return (
-            (
-                self.browser_challenge.to_sign_text()
-                if self.browser_challenge
-                else None
-            ),
-            self.sdk_challenge.to_sign_text() if self.sdk_challenge else None,
-        )
+        return (self.browser_challenge, self.sdk_challenge)
 
     def __str__(self) -> str:
         return (
@@ -209,6 +217,8 @@ class Authenticate(SignedModel):
 class Actions(SignedModel):
     """Actions."""
 
+    __slots__ = ("fingerprint", "authenticate")
+
     def __init__(
         self,
         fingerprint: Optional[Fingerprint] = None,
@@ -235,8 +245,8 @@ class Actions(SignedModel):
 
     def _get_params_sequence(self) -> tuple:
         return (
-            self.fingerprint.to_sign_text() if self.fingerprint else None,
-            self.authenticate.to_sign_text() if self.authenticate else None,
+            self.fingerprint,
+            self.authenticate,
         )
 
     def __str__(self) -> str:
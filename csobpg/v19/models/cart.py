@@ -3,12 +3,28 @@
 from typing import List, Optional
 
 from ..signature import SignedModel
+from ..spec import Field
 from .fields import _IntField, _StrField
 
 
 class CartItem(SignedModel):
     """Cart item."""
 
+    __slots__ = (
+        "_name",
+        "_quantity",
+        "_amount",
+        "_description",
+        "total_amount",
+    )
+
+    _fields = (
+        Field("name", "name"),
+        Field("quantity", "quantity"),
+        Field("amount", "amount"),
+        Field("description", "description"),
+    )
+
     name = _StrField(max_length=20)
     quantity = _IntField(min_value=1)
     amount = _IntField(min_value=0)
@@ -28,21 +44,6 @@ class CartItem(SignedModel):
 
         self.total_amount = self.amount * self.quantity
 
-    def as_json(self) -> dict:
-        """Return cart item as JSON."""
-        item = {
-            "name": self.name,
-            "quantity": self.quantity,
-            "amount": self.amount,
-        }
-
-        if self.description:
-            item["description"] = self.description  # type: ignore
-        return item
-
-    def _get_params_sequence(self) -> tuple:
-        return (self.name, self.quantity, self.amount, self.description)
-
     def __str__(self) -> str:
         return (
             f"{self.__class__.__name__}(name='{self.name}', "
@@ -53,6 +54,8 @@ class CartItem(SignedModel):
 class Cart(SignedModel):
     """Cart."""
 
+    __slots__ = ("_items", "total_amount")
+
     def __init__(self, items: List[CartItem]) -> None:
         """Init a cart.
 
@@ -69,7 +72,7 @@ class Cart(SignedModel):
         return [item.as_json() for item in self._items]
 
     def _get_params_sequence(self) -> tuple:
-        return tuple(item.to_sign_text() for item in self._items)
+        return tuple(self._items)
 
     def __str__(self) -> str:
         items_str = ", ".join(str(item) for item in self._items)
@@ -3,12 +3,35 @@
 from typing import Optional
 
 from ...signature import SignedModel
+from ...spec import Field
 from ..fields import _IntField
 
 
 class AccountData(SignedModel):
     """Customer account data."""
 
+    __slots__ = (
+        "created_at",
+        "changed_at",
+        "changed_pwd_at",
+        "_order_history",
+        "_payment_day",
+        "_payment_year",
+        "_oneclick_adds",
+        "suspicious",
+    )
+
+    _fields = (
+        Field("created_at", "createdAt"),
+        Field("changed_at", "changedAt"),
+        Field("changed_pwd_at", "changedPwdAt"),
+        Field("order_history", "orderHistory"),
+        Field("payment_day", "paymentDay"),
+        Field("payment_year", "paymentYear"),
+        Field("oneclick_adds", "oneclickAdds"),
+        Field("suspicious", "suspicious"),
+    )
+
     order_history = _IntField(min_value=0, max_value=9999)
     payment_day = _IntField(min_value=0, max_value=999)
     payment_year = _IntField(min_value=0, max_value=999)
@@ -34,36 +57,3 @@ class AccountData(SignedModel):
         self.payment_year = payment_year
         self.oneclick_adds = oneclick_adds
         self.suspicious = suspicious
-
-    def as_json(self) -> dict:
-        """Return account data as JSON."""
-        result = {}
-        if self.created_at:
-            result["createdAt"] = self.created_at
-        if self.changed_at:
-            result["changedAt"] = self.changed_at
-        if self.changed_pwd_at:
-            result["changedPwdAt"] = self.changed_pwd_at
-        if self.order_history:
-            result["orderHistory"] = self.order_history
-        if self.payment_day:
-            result["paymentDay"] = self.payment_day
-        if self.payment_year:
-            result["paymentYear"] = self.payment_year
-        if self.oneclick_adds:
-            result["oneclickAdds"] = self.oneclick_adds
-        if self.suspicious:
-            result["suspicious"] = self.suspicious
-        return result
-
-    def _get_params_sequence(self) -> tuple:
-        return (
-            self.created_at,
-            self.changed_at,
-            self.changed_pwd_at,
-            self.order_history,
-            self.payment_day,
-            self.payment_year,
-            self.oneclick_adds,
-            self.suspicious,
-        )
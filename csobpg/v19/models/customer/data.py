@@ -3,6 +3,7 @@
 from typing import Optional
 
 from ...signature import SignedModel
+from ...spec import Field
 from ..fields import _StrField
 from .account import AccountData
 from .login import LoginData
@@ -23,6 +24,26 @@ class PhoneNumber:
 class CustomerData(SignedModel):
     """Customer information."""
 
+    __slots__ = (
+        "_name",
+        "_email",
+        "home_phone",
+        "work_phone",
+        "mobile_phone",
+        "account",
+        "login",
+    )
+
+    _fields = (
+        Field("name", "name"),
+        Field("email", "email"),
+        Field("home_phone", "homePhone", str),
+        Field("work_phone", "workPhone", str),
+        Field("mobile_phone", "mobilePhone", str),
+        Field("account", "account", nested=True),
+        Field("login", "login", nested=True),
+    )
+
     name = _StrField(max_length=45)
     email = _StrField(max_length=100)
 
@@ -44,36 +65,6 @@ class CustomerData(SignedModel):
         self.account = account
         self.login = login
 
-    def as_json(self) -> dict:
-        """Return customer data as JSON."""
-        result = {}
-        if self.name:
-            result["name"] = self.name
-        if self.email:
-            result["email"] = self.email
-        if self.home_phone:
-            result["homePhone"] = str(self.home_phone)
-        if self.work_phone:
-            result["workPhone"] = str(self.work_phone)
-        if self.mobile_phone:
-            result["mobilePhone"] = str(self.mobile_phone)
-        if self.account:
-            result["account"] = self.account.as_json()
-        if self.login:
-            result["login"] = self.login.as_json()
-        return result
-
-    def _get_params_sequence(self) -> tuple:
-        return (
-            self.name,
-            self.email,
-            self.home_phone,
-            self.work_phone,
-            self.mobile_phone,
-            self.account.to_sign_text() if self.account else None,
-            self.login.to_sign_text() if self.login else None,
-        )
-
     def __str__(self) -> str:
         return (
             f"{self.__class__.__name__}(name='{self.name}', "
@@ -4,6 +4,7 @@ from enum import Enum
 from typing import Optional
 
 from ...signature import SignedModel
+from ...spec import Field, enum_value
 
 
 class AuthMethod(Enum):
@@ -22,6 +23,14 @@ class AuthMethod(Enum):
 class LoginData(SignedModel):
     """Customer login data."""
 
+    __slots__ = ("auth", "auth_at", "auth_data")
+
+    _fields = (
+        Field("auth", "auth", enum_value),
+        Field("auth_at", "authAt"),
+        Field("auth_data", "authData"),
+    )
+
     def __init__(
         self,
         auth: Optional[AuthMethod] = None,
@@ -31,17 +40,3 @@ class LoginData(SignedModel):
         self.auth = auth
         self.auth_at = auth_at
         self.auth_data = auth_data
-
-    def as_json(self) -> dict:
-        """Return login data as JSON."""
-        result = {}
-        if self.auth:
-            result["auth"] = self.auth.value
-        if self.auth_at:
-            result["authAt"] = self.auth_at
-        if self.auth_data:
-            result["authData"] = self.auth_data
-        return result
-
-    def _get_params_sequence(self) -> tuple:
-        return (self.auth.value if self.auth else None, self.auth_at, self.auth_data)
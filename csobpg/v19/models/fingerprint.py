@@ -3,11 +3,30 @@
 from typing import Optional
 
 from ..signature import SignedModel
+from ..spec import Field
 
 
 class SDK(SignedModel):
     """SDK."""
 
+    __slots__ = (
+        "max_timeout",
+        "reference_number",
+        "transaction_id",
+        "app_id",
+        "enc_data",
+        "ephem_pub_key",
+    )
+
+    _fields = (
+        Field("app_id", "appId"),
+        Field("enc_data", "encData"),
+        Field("ephem_pub_key", "ephemPubKey"),
+        Field("max_timeout", "maxTimeout"),
+        Field("reference_number", "referenceNumber"),
+        Field("transaction_id", "transID"),
+    )
+
     def __init__(
         self,
         max_timeout: int,
@@ -24,31 +43,36 @@ class SDK(SignedModel):
         self.enc_data = enc_data
         self.ephem_pub_key = ephem_pub_key
 
-    def _get_params_sequence(self) -> tuple:
-        return (
-            self.app_id,
-            self.enc_data,
-            self.ephem_pub_key,
-            self.max_timeout,
-            self.reference_number,
-            self.transaction_id,
-        )
-
-    def as_json(self) -> dict:
-        """Return SDK as JSON."""
-        return {
-            "appId": self.app_id,
-            "encData": self.enc_data,
-            "ephemPubKey": self.ephem_pub_key,
-            "maxTimeout": self.max_timeout,
-            "referenceNumber": self.reference_number,
-            "transID": self.transaction_id,
-        }
-
 
 class Browser(SignedModel):
     """Browser."""
 
+    __slots__ = (
+        "user_agent",
+        "accept_header",
+        "language",
+        "js_enabled",
+        "color_depth",
+        "screen_height",
+        "screen_width",
+        "timezone",
+        "java_enabled",
+        "challenge_window_size",
+    )
+
+    _fields = (
+        Field("user_agent", "userAgent"),
+        Field("accept_header", "acceptHeader"),
+        Field("language", "language"),
+        Field("js_enabled", "javascriptEnabled"),
+        Field("color_depth", "colorDepth"),
+        Field("screen_height", "screenHeight"),
+        Field("screen_width", "screenWidth"),
+        Field("timezone", "timezone"),
+        Field("java_enabled", "javaEnabled"),
+        Field("challenge_window_size", "challengeWindowSize"),
+    )
+
     def __init__(
         self,
         user_agent: str,
@@ -73,68 +97,20 @@ class Browser(SignedModel):
         self.java_enabled = java_enabled
         self.challenge_window_size = challenge_window_size
 
-    def _get_params_sequence(self) -> tuple:
-        return (
-            self.user_agent,
-            self.accept_header,
-            self.language,
-            self.js_enabled,
-            self.color_depth,
-            self.screen_height,
-            self.screen_width,
-            self.timezone,
-            self.java_enabled,
-            self.challenge_window_size,
-        )
-
-    def as_json(self) -> dict:
-        """Return browser as JSON."""
-        result = {
-            "userAgent": self.user_agent,
-            "acceptHeader": self.accept_header,
-            "language": self.language,
-            "javascriptEnabled": self.js_enabled,
-        }
-
-        if self.color_depth:
-            result["colorDepth"] = self.color_depth
-        if self.screen_height:
-            result["screenHeight"] = self.screen_height
-        if self.screen_width:
-            result["screenWidth"] = self.screen_width
-        if self.timezone:
-            result["timezone"] = self.timezone
-        if self.java_enabled:
-            result["javaEnabled"] = self.java_enabled
-        if self.challenge_window_size:
-            result["challengeWindowSize"] = self.challenge_window_size
-
-        return result
-
 
 class Fingerprint(SignedModel):
     """Fingerprint."""
 
+    __slots__ = ("browser", "sdk")
+
+    _fields = (
+        Field("browser", "browser", nested=True),
+        Field("sdk", "sdk", nested=True),
+    )
+
     def __init__(
         self, browser: Optional[Browser] = None, sdk: Optional[SDK] = None
     ) -> None:
         super().__init__()
         self.browser = browser
         self.sdk = sdk
-
-    def _get_params_sequence(self) -> tuple:
-        return (
-            self.browser.to_sign_text() if self.browser else None,
-            self.sdk.to_sign_text() if self.sdk else None,
-        )
-
-    def as_json(self) -> dict:
-        """Return fingerprint as JSON."""
-        result = {}
-
-        if self.browser:
-            result["browser"] = self.browser.as_json()
-        if self.sdk:
-            result["sdk"] = self.sdk.as_json()
-
-        return result
@@ -4,6 +4,25 @@ from ..signature import SignedModel
 
 
 class InitPramsGoogle(SignedModel):
+    __slots__ = (
+        "allowed_card_auth_methods",
+        "allowed_card_networks",
+        "api_version",
+        "api_version_minor",
+        "assurance_details_required",
+        "billing_address_parameters_format",
+        "billing_address_required",
+        "country_code",
+        "environment",
+        "gateway",
+        "gateway_merchant_id",
+        "googlepay_merchant_id",
+        "merchant_name",
+        "payment_method_type",
+        "tokenization_specification_type",
+        "total_price_status",
+    )
+
     allowed_card_auth_methods: List[str]
     allowed_card_networks: List[str]
     api_version: int
@@ -61,9 +80,11 @@ class InitPramsGoogle(SignedModel):
 
 
 class InitParamsApple(SignedModel):
+    __slots__ = ("country_code", "supported_networks", "merchant_capabilities")
+
     country_code: str
-    supported_networks = Dict[str, str]
-    merchant_capabilities = Dict[str, str]
+    supported_networks: Optional[Dict[str, str]]
+    merchant_capabilities: Optional[Dict[str, str]]
 
     def __init__(
         self,
@@ -3,12 +3,33 @@
 from typing import Optional
 
 from ...signature import SignedModel
+from ...spec import Field
 from ..fields import _StrField
 
 
 class AddressData(SignedModel):
     """Address data."""
 
+    __slots__ = (
+        "_address",
+        "country",
+        "_city",
+        "_zip",
+        "state",
+        "_address2",
+        "_address3",
+    )
+
+    _fields = (
+        Field("address", "address1"),
+        Field("address2", "address2"),
+        Field("address3", "address3"),
+        Field("city", "city"),
+        Field("zip", "zip"),
+        Field("state", "state"),
+        Field("country", "country"),
+    )
+
     address = _StrField(max_length=50)
     city = _StrField(max_length=50)
     zip = _StrField(max_length=16)
@@ -33,26 +54,3 @@ class AddressData(SignedModel):
         self.state = state
         self.address2 = address2
         self.address3 = address3
-
-    def as_json(self) -> dict:
-        """Return address data as JSON."""
-        return {
-            "address1": self.address,
-            "address2": self.address2,
-            "address3": self.address3,
-            "city": self.city,
-            "zip": self.zip,
-            "state": self.state,
-            "country": self.country,
-        }
-
-    def _get_params_sequence(self) -> tuple:
-        return (
-            self.address,
-            self.address2,
-            self.address3,
-            self.city,
-            self.zip,
-            self.state,
-            self.country,
-        )
@@ -4,6 +4,7 @@ from enum import Enum
 from typing import Optional
 
 from ...signature import SignedModel
+from ...spec import Field, enum_value
 from ..currency import Currency
 from ..fields import _IntField
 from .address import AddressData
@@ -30,6 +31,14 @@ class OrderAvailability(Enum):
 class GiftCardsData(SignedModel):
     """Gift cards data."""
 
+    __slots__ = ("total_amount", "currency", "_quantity")
+
+    _fields = (
+        Field("total_amount", "totalAmount"),
+        Field("currency", "currency", enum_value),
+        Field("quantity", "quantity"),
+    )
+
     quantity = _IntField(min_value=1, max_value=99)
 
     def __init__(
@@ -42,23 +51,38 @@ class GiftCardsData(SignedModel):
         self.currency = currency
         self.quantity = quantity
 
-    def as_json(self) -> dict:
-        """Return gift cards data as JSON."""
-        body = {
-            "totalAmount": self.total_amount,
-            "quantity": self.quantity,
-        }
-        if self.currency:
-            body["currency"] = self.currency.value
-        return body
-
-    def _get_params_sequence(self) -> tuple:
-        return (self.total_amount, self.currency, self.quantity)
-
 
 class OrderData(SignedModel):
     """Order data."""
 
+    __slots__ = (
+        "order_type",
+        "availability",
+        "delivery",
+        "name_match",
+        "address_match",
+        "billing",
+        "shipping",
+        "shipping_added_at",
+        "reorder",
+        "gift_cards",
+    )
+
+    _fields = (
+        Field("order_type", "type", enum_value),
+        Field("availability", "availability", enum_value),
+        Field("delivery.indicator", "delivery", enum_value),
+        Field("delivery.mode", "deliveryMode", enum_value),
+        Field("delivery.email", "deliveryEmail"),
+        Field("name_match", "nameMatch"),
+        Field("address_match", "addressMatch"),
+        Field("billing", "billing", nested=True),
+        Field("shipping", "shipping", nested=True),
+        Field("shipping_added_at", "shippingAddedAt"),
+        Field("reorder", "reorder"),
+        Field("gift_cards", "giftCards", nested=True),
+    )
+
     def __init__(
         self,
         order_type: Optional[OrderType] = None,
@@ -86,61 +110,6 @@ class OrderData(SignedModel):
         self.reorder = reorder
         self.gift_cards = gift_cards
 
-    def as_json(self) -> dict:
-        # pylint:disable=too-many-branches
-        """Return order data as JSON."""
-        body = {}
-        if self.order_type:
-            body["type"] = self.order_type.value
-        if self.availability:
-            body["availability"] = self.availability.value
-        if self.delivery:
-            if self.delivery.indicator:
-                body["delivery"] = self.delivery.indicator.value
-            if self.delivery.mode:
-                body["deliveryMode"] = self.delivery.mode.value
-            if self.delivery.email:
-                body["deliveryEmail"] = self.delivery.email
-        if self.name_match is not None:
-            body["nameMatch"] = self.name_match
-        if self.address_match is not None:
-            body["addressMatch"] = self.address_match
-        if self.billing:
-            body["billing"] = self.billing.as_json()
-        if self.shipping:
-            body["shipping"] = self.shipping.as_json()
-        if self.shipping_added_at:
-            body["shippingAddedAt"] = self.shipping_added_at
-        if self.reorder is not None:
-            body["reorder"] = self.reorder
-        if self.gift_cards:
-            body["giftCards"] = self.gift_cards.as_json()
-        return body
-
-    def _get_params_sequence(self) -> tuple:
-        return (
-            self.order_type.value if self.order_type else None,
-            self.availability.value if self.availability else None,
-            (
-                self.delivery.indicator.value
-                if self.delivery and self.delivery.indicator
-                else None
-            ),
-            (
-                self.delivery.mode.value
-                if self.delivery and self.delivery.mode
-                else None
-            ),
-            self.delivery.email if self.delivery else None,
-            self.name_match,
-            self.address_match,
-            self.billing.to_sign_text() if self.billing else None,
-            self.shipping.to_sign_text() if self.shipping else None,
-            self.shipping_added_at,
-            self.reorder,
-            self.gift_cards,
-        )
-
     def __str__(self) -> str:
         return (
             f"{self.__class__.__name__}(order_type={self.order_type}, "
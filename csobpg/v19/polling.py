@@ -0,0 +1,330 @@
+"""Polling of pending payments.
+
+`PollScheduler` tracks payments waiting for the payer (INITIATED or
+IN_PROGRESS) and requests their statuses until they leave the pending
+statuses:
+
+* the interval between polls grows with the age of the payment,
+  ``age * (backoff - 1)`` clamped to ``[min_interval, max_interval]``, so
+  the polls back off exponentially. A payment added with its original start
+  time (e.g. after a restart) continues with its interval
+* the payment is polled right after its `ttl_sec` ends, when the gateway
+  should have finished it
+* polling gives up after `ttl_sec` or `payment_expiry` (whichever is later)
+
+Every poll requests the status from the gateway, bypassing the client's
+`status_cache` (the fresh status is cached, though).
+
+The due payments are kept in a hierarchical `TimingWheel`, so scheduling
+and cancelling a poll costs O(1) regardless of the number of payments.
+
+.. code-block:: python
+
+    def on_result(pay_id, response):
+        ...
+
+    scheduler = PollScheduler(client, on_result, concurrency=16)
+    scheduler.add(pay_id, ttl_sec=600)
+    threading.Thread(target=scheduler.run, args=(stop,)).start()
+"""
+
+import logging
+import math
+import threading
+import time
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .api import APIClient
+from .bulk import Concurrency, run_bounded
+from .cache import PENDING_STATUSES
+from .response.base import PaymentStatus
+
+if TYPE_CHECKING:
+    from .response.payment_status import PaymentStatusResponse
+
+_LOG = logging.getLogger(__name__)
+
+
+class TimingWheel:
+    """Hierarchical timing wheel of keys due at integer ticks.
+
+    Level 0 has a slot per tick, a slot of each next level spans all the
+    slots of the previous one. Keys due further than the level 0 covers are
+    kept in the higher levels and cascade down as the time advances. Keys
+    due beyond the horizon of the top level are cascaded until due.
+
+    The wheel is not thread-safe.
+    """
+
+    def __init__(self, slots: int = 64, levels: int = 4) -> None:
+        """Init the wheel.
+
+        :param slots: number of slots per level
+        :param levels: number of levels. The wheel spans
+          ``slots ** levels`` ticks
+        """
+        if slots < 2:
+            raise ValueError('"slots" must be >= 2')
+        if levels < 1:
+            raise ValueError('"levels" must be >= 1')
+        self.slots = slots
+        self.levels = levels
+        #: current tick, the keys due until it are expired
+        self.tick = 0
+        self._spans = [slots**level for level in range(levels + 1)]
+        self._wheels: List[List[Dict[Hashable, int]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._where: Dict[Hashable, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def schedule(self, key: Hashable, deadline: int) -> None:
+        """Schedule the key, replacing its previous deadline.
+
+        A deadline in the past expires on the next tick.
+        """
+        self.cancel(key)
+        self._insert(key, deadline)
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancel the key and return whether it was scheduled."""
+        where = self._where.pop(key, None)
+        if where is None:
+            return False
+        level, slot = where
+        del self._wheels[level][slot][key]
+        return True
+
+    def advance(self, tick: int) -> List[Hashable]:
+        """Advance to the tick and return the keys expired on the way."""
+        expired: List[Hashable] = []
+        while self.tick < tick:
+            if not self._where:
+                self.tick = tick
+                break
+            self.tick += 1
+            for level in range(self.levels - 1, 0, -1):
+                if self.tick % self._spans[level] == 0:
+                    self._cascade(level, expired)
+            bucket = self._take(0, self.tick % self.slots)
+            for key, deadline in bucket.items():
+                if deadline <= self.tick:
+                    expired.append(key)
+                else:
+                    self._insert(key, deadline)
+        return expired
+
+    def _take(self, level: int, slot: int) -> Dict[Hashable, int]:
+        bucket = self._wheels[level][slot]
+        self._wheels[level][slot] = {}
+        for key in bucket:
+            del self._where[key]
+        return bucket
+
+    def _cascade(self, level: int, expired: List[Hashable]) -> None:
+        slot = (self.tick // self._spans[level]) % self.slots
+        for key, deadline in self._take(level, slot).items():
+            if deadline <= self.tick:
+                expired.append(key)
+            else:
+                self._insert(key, deadline)
+
+    def _insert(self, key: Hashable, deadline: int) -> None:
+        # the key is placed by the deadline capped to the horizon; the
+        # capped keys are placed again when cascaded
+        delay = deadline - self.tick
+        target = min(
+            max(deadline, self.tick + 1), self.tick + self._spans[-1] - 1
+        )
+        level = 0
+        while level < self.levels - 1 and delay >= self._spans[level + 1]:
+            level += 1
+        slot = (target // self._spans[level]) % self.slots
+        self._wheels[level][slot][key] = deadline
+        self._where[key] = (level, slot)
+
+
+class _Pending:
+    __slots__ = ("started", "ttl_end", "deadline")
+
+    def __init__(self, started: float, ttl_end: float, deadline: float):
+        self.started = started
+        self.ttl_end = ttl_end
+        self.deadline = deadline
+
+
+#: Callback receiving the last status of a payment which is not polled
+#: anymore: a status which is not pending, or the last pending one (None
+#: if the last poll failed) when polling gave up
+ResultCallback = Callable[[str, Optional["PaymentStatusResponse"]], None]
+
+
+class PollScheduler:
+    """Polls the statuses of pending payments."""
+
+    def __init__(
+        self,
+        client: APIClient,
+        callback: Optional[ResultCallback] = None,
+        concurrency: Concurrency = 16,
+        min_interval: float = 2,
+        max_interval: float = 60,
+        backoff: float = 1.5,
+        grace: float = 5,
+        resolution: float = 1,
+        pending: FrozenSet[PaymentStatus] = PENDING_STATUSES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Init the scheduler.
+
+        :param callback: called with the pay ID and the status response of
+          the payments which are not polled anymore
+        :param concurrency: maximum number of status calls in flight, or an
+          `AdaptiveConcurrency`
+        :param min_interval: minimal seconds between polls of a payment
+        :param max_interval: maximal seconds between polls of a payment
+        :param backoff: factor the time since the payment started grows by
+          between polls
+        :param grace: seconds to wait for the gateway after the payment TTL
+          ends
+        :param resolution: seconds per tick of the timing wheel
+        :param pending: payment statuses to keep polling
+        :param clock: monotonic clock
+        """
+        # pylint:disable=too-many-arguments
+        if not 0 < min_interval <= max_interval:
+            raise ValueError('0 < "min_interval" <= "max_interval" required')
+        if backoff <= 1:
+            raise ValueError('"backoff" must be > 1')
+        self.client = client
+        self.callback = callback
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.grace = grace
+        self.resolution = resolution
+        self.pending = pending
+        self.clock = clock
+        self._origin = clock()
+        self._wheel = TimingWheel()
+        self._payments: Dict[str, _Pending] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._payments)
+
+    def __contains__(self, pay_id: str) -> bool:
+        return pay_id in self._payments
+
+    def add(
+        self,
+        pay_id: str,
+        ttl_sec: int = 600,
+        payment_expiry: Optional[int] = None,
+        started: Optional[float] = None,
+    ) -> None:
+        """Start polling the payment.
+
+        :param ttl_sec: `ttl_sec` the payment was initiated with
+        :param payment_expiry: `payment_expiry` (hours) the payment was
+          initiated with
+        :param started: clock time the payment was initiated at. Defaults
+          to now
+        """
+        now = self.clock()
+        started = now if started is None else started
+        ttl_end = started + ttl_sec + self.grace
+        deadline = started + max(ttl_sec, (payment_expiry or 0) * 3600)
+        payment = _Pending(started, ttl_end, deadline + self.grace)
+        with self._lock:
+            self._payments[pay_id] = payment
+            self._schedule(pay_id, payment, now)
+
+    def remove(self, pay_id: str) -> bool:
+        """Stop polling the payment and return whether it was polled."""
+        with self._lock:
+            self._wheel.cancel(pay_id)
+            return self._payments.pop(pay_id, None) is not None
+
+    def next_delay(self, pay_id: str, now: Optional[float] = None) -> float:
+        """Return seconds from `now` to the next poll of the payment."""
+        now = self.clock() if now is None else now
+        return self._delay(self._payments[pay_id], now)
+
+    def _delay(self, payment: _Pending, now: float) -> float:
+        age = max(0.0, now - payment.started)
+        delay = min(
+            max(age * (self.backoff - 1), self.min_interval),
+            self.max_interval,
+        )
+        if now < payment.ttl_end:
+            delay = min(delay, payment.ttl_end - now)
+        return delay
+
+    def poll(self) -> int:
+        """Poll the due payments and return how many were polled."""
+        with self._lock:
+            due = self._wheel.advance(self._tick(self.clock(), math.floor))
+        if not due:
+            return 0
+        # a cached status would hide the change the poll is looking for
+        status = partial(self.client.get_payment_status, cached=False)
+        for result in run_bounded(status, due, self.concurrency):
+            self._done(result.pay_id, result.response, result.error)
+        return len(due)
+
+    def run(self, stop: threading.Event) -> None:
+        """Poll the due payments until stopped."""
+        while not stop.is_set():
+            self.poll()
+            stop.wait(self.resolution)
+
+    def _done(
+        self,
+        pay_id: str,
+        response: Optional["PaymentStatusResponse"],
+        error: Optional[Exception],
+    ) -> None:
+        now = self.clock()
+        with self._lock:
+            payment = self._payments.get(pay_id)
+            if payment is None or pay_id in self._wheel:
+                # removed or added again while polled
+                return
+            if error is None and response.payment_status not in self.pending:
+                finished = True
+            elif now >= payment.deadline:
+                _LOG.info("Polling of pay_id=%s expired", pay_id)
+                finished = True
+            else:
+                if error is not None:
+                    _LOG.debug("Polling pay_id=%s failed: %r", pay_id, error)
+                self._schedule(pay_id, payment, now)
+                finished = False
+            if finished:
+                del self._payments[pay_id]
+        if finished and self.callback is not None:
+            self.callback(pay_id, response)
+
+    def _schedule(self, pay_id: str, payment: _Pending, now: float) -> None:
+        at = now + self._delay(payment, now)
+        self._wheel.schedule(pay_id, self._tick(at, math.ceil))
+
+    def _tick(self, at: float, rounding: Callable[[float], int]) -> int:
+        return rounding((at - self._origin) / self.resolution)
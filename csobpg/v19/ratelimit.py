@@ -0,0 +1,172 @@
+"""Client-side rate limiting.
+
+Calls are limited per merchant and endpoint family with token buckets. A
+bucket holds up to `burst` tokens and is refilled with `rate` tokens per
+second; every call sent to the gateway takes a token. The families are:
+
+* `init`: payment init operations (`payment/init`, `oneclick/init`, ...)
+* `status`: `payment/status`
+* `settlement`: `payment/close`, `payment/reverse` and `payment/refund`
+* `other`: the rest, e.g. echo and process operations
+
+A call waits for a token at most `max_wait` seconds. If the token is not
+available in time, the call fails with `APIRateLimitedError` without
+waiting at all. With `max_wait=0` the calls never wait.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from .errors import APIRateLimitedError
+
+DEFAULT_FAMILIES: Dict[str, str] = {
+    "payment/init": "init",
+    "oneclick/init": "init",
+    "googlepay/init": "init",
+    "applepay/init": "init",
+    "payment/status": "status",
+    "payment/close": "settlement",
+    "payment/reverse": "settlement",
+    "payment/refund": "settlement",
+}
+
+
+def default_family(operation: str) -> str:
+    """Return endpoint family of the operation."""
+    return DEFAULT_FAMILIES.get(operation, "other")
+
+
+class Limit(NamedTuple):
+    """Rate limit."""
+
+    #: calls per second
+    rate: float
+    #: calls allowed at once
+    burst: int = 1
+
+
+class TokenBucket:
+    """Thread-safe token bucket."""
+
+    def __init__(self, limit: Limit) -> None:
+        if limit.rate <= 0:
+            raise ValueError('"rate" must be > 0')
+        if limit.burst < 1:
+            raise ValueError('"burst" must be >= 1')
+        self.limit = limit
+        self._tokens = float(limit.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: Optional[float] = None) -> Tuple[bool, float]:
+        """Reserve a token.
+
+        :param max_wait: the token is not reserved if it is not available
+          within this number of seconds
+        :return: whether the token is reserved and the seconds to wait
+          before it is available
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.limit.burst,
+                self._tokens + (now - self._updated) * self.limit.rate,
+            )
+            self._updated = now
+            wait = max(0.0, (1 - self._tokens) / self.limit.rate)
+            if max_wait is not None and wait > max_wait:
+                return False, wait
+            # the tokens may go negative, later callers wait longer
+            self._tokens -= 1
+            return True, wait
+
+
+class RateLimiter:
+    """Rate limiter per merchant and endpoint family.
+
+    The limiter is thread-safe and may be shared by several clients.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, Limit],
+        merchant_limits: Optional[Dict[str, Dict[str, Limit]]] = None,
+        max_wait: Optional[float] = None,
+        family: Callable[[str], str] = default_family,
+    ) -> None:
+        """Init the limiter.
+
+        :param limits: limits per endpoint family. The families without a
+          limit are not limited
+        :param merchant_limits: limits per endpoint family of particular
+          merchants, overriding `limits`
+        :param max_wait: maximum seconds to wait for a token. Unlimited if
+          not provided
+        :param family: function returning endpoint family of an operation
+        """
+        if max_wait is not None and max_wait < 0:
+            raise ValueError('"max_wait" must be >= 0')
+        self.limits = dict(limits)
+        self.merchant_limits = dict(merchant_limits or {})
+        self.max_wait = max_wait
+        self.family = family
+        self._buckets: Dict[Tuple[str, str], Optional[TokenBucket]] = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, merchant_id: str, operation: str) -> bool:
+        """Take a token for the call if available now, without waiting."""
+        bucket = self._bucket(merchant_id, self.family(operation))
+        return bucket is None or bucket.reserve(0)[0]
+
+    def acquire(self, merchant_id: str, operation: str) -> None:
+        """Take a token for the call, blocking until it is available.
+
+        :raises APIRateLimitedError: if the wait would exceed `max_wait`
+        """
+        wait = self._reserve(merchant_id, operation)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, merchant_id: str, operation: str) -> None:
+        """Take a token for the call, waiting until it is available.
+
+        :raises APIRateLimitedError: if the wait would exceed `max_wait`
+        """
+        # imported here to keep asyncio out of the package import, the caller
+        # runs an event loop already
+        import asyncio  # pylint:disable=import-outside-toplevel
+
+        wait = self._reserve(merchant_id, operation)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _reserve(self, merchant_id: str, operation: str) -> float:
+        family = self.family(operation)
+        bucket = self._bucket(merchant_id, family)
+        if bucket is None:
+            return 0.0
+        reserved, wait = bucket.reserve(self.max_wait)
+        if not reserved:
+            raise APIRateLimitedError(merchant_id, family, wait)
+        return wait
+
+    def _bucket(self, merchant_id: str, family: str) -> Optional[TokenBucket]:
+        key = (merchant_id, family)
+        try:
+            return self._buckets[key]
+        except KeyError:
+            pass
+        limit = self.merchant_limits.get(merchant_id, {}).get(
+            family, self.limits.get(family)
+        )
+        with self._lock:
+            return self._buckets.setdefault(
+                key, None if limit is None else TokenBucket(limit)
+            )
+
+    def __str__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"limits={self.limits}, max_wait={self.max_wait})"
+        )
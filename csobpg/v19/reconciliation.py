@@ -0,0 +1,385 @@
+"""Reconciliation of a local ledger against the gateway payment statuses.
+
+`Reconciler` consumes `LedgerEntry` rows (pay ID, the payment status the
+ledger expects and the amount), requests the payment statuses concurrently
+and yields a `Mismatch` for each entry the gateway disagrees with, as soon
+as it is known. Mismatches are classified by the transition from the
+expected to the actual status in the payment lifecycle:
+
+* `AHEAD`: the gateway moved on, the actual status follows the expected
+  one (e.g. the ledger expects WAITING_SETTLEMENT, the payment is SETTLED)
+* `BEHIND`: the expected status follows the actual one, the ledger is
+  ahead of the gateway (e.g. expects SETTLED, the payment is CONFIRMED)
+* `CONFLICT`: neither status follows the other (e.g. expects SETTLED, the
+  payment is REVERSED)
+* `MISSING`: the gateway does not know the payment
+* `ERROR`: the status could not be requested (API or HTTP errors)
+
+The statuses are requested with `get_payment_status`, so the client's
+`status_cache` and `coalesce` apply.
+
+`reconcile_sharded` splits a large ledger into shards by the pay ID and
+reconciles each in a worker process with its own client.
+"""
+
+import logging
+import multiprocessing
+import queue
+import threading
+import zlib
+from collections import Counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .api import APIClient
+from .bulk import BulkResult, Concurrency, run_bounded
+from .errors import APIPaymentNotFoundError
+from .response.base import PaymentStatus
+
+_LOG = logging.getLogger(__name__)
+
+#: mismatch kinds
+AHEAD = "ahead"
+BEHIND = "behind"
+CONFLICT = "conflict"
+MISSING = "missing"
+ERROR = "error"
+
+#: statuses a payment may move to from a status
+TRANSITIONS: Dict[PaymentStatus, FrozenSet[PaymentStatus]] = {
+    PaymentStatus.INITIATED: frozenset(
+        {
+            PaymentStatus.IN_PROGRESS,
+            PaymentStatus.CANCELLED,
+            PaymentStatus.DENIED,
+            PaymentStatus.CONFIRMED,
+            PaymentStatus.WAITING_SETTLEMENT,
+        }
+    ),
+    PaymentStatus.IN_PROGRESS: frozenset(
+        {
+            PaymentStatus.CANCELLED,
+            PaymentStatus.DENIED,
+            PaymentStatus.CONFIRMED,
+            PaymentStatus.WAITING_SETTLEMENT,
+        }
+    ),
+    PaymentStatus.CONFIRMED: frozenset(
+        {PaymentStatus.WAITING_SETTLEMENT, PaymentStatus.REVERSED}
+    ),
+    PaymentStatus.WAITING_SETTLEMENT: frozenset(
+        {PaymentStatus.SETTLED, PaymentStatus.REVERSED}
+    ),
+    PaymentStatus.SETTLED: frozenset({PaymentStatus.REFUND_PROCESSING}),
+    PaymentStatus.REFUND_PROCESSING: frozenset({PaymentStatus.RETURNED}),
+}
+
+
+def _reachable() -> Dict[PaymentStatus, FrozenSet[PaymentStatus]]:
+    reachable = {}
+    for status in PaymentStatus:
+        seen = set()
+        stack = list(TRANSITIONS.get(status, ()))
+        while stack:
+            following = stack.pop()
+            if following not in seen:
+                seen.add(following)
+                stack.extend(TRANSITIONS.get(following, ()))
+        reachable[status] = frozenset(seen)
+    return reachable
+
+
+_REACHABLE = _reachable()
+
+
+def classify(expected: PaymentStatus, actual: Optional[PaymentStatus]) -> str:
+    """Return the mismatch kind of the transition.
+
+    :raises ValueError: if the statuses match
+    """
+    if expected == actual:
+        raise ValueError(f"Status {expected.name} matches")
+    if actual is None:
+        return CONFLICT
+    if actual in _REACHABLE[expected]:
+        return AHEAD
+    if expected in _REACHABLE[actual]:
+        return BEHIND
+    return CONFLICT
+
+
+class LedgerEntry(NamedTuple):
+    """Payment as recorded by the local ledger."""
+
+    pay_id: str
+    expected: PaymentStatus
+    #: amount in hundredths of the base currency, reported with mismatches
+    amount: Optional[int] = None
+
+
+class Mismatch(NamedTuple):
+    """Ledger entry the gateway disagrees with."""
+
+    entry: LedgerEntry
+    kind: str
+    #: None if the status is unknown
+    actual: Optional[PaymentStatus] = None
+    #: representation of the error the status was requested with
+    error: Optional[str] = None
+
+    @property
+    def transition(self) -> Tuple[PaymentStatus, Optional[PaymentStatus]]:
+        """Return the expected and the actual status."""
+        return self.entry.expected, self.actual
+
+
+class ReconciliationSummary:
+    """Summary of a reconciliation."""
+
+    def __init__(self) -> None:
+        #: entries matching the gateway
+        self.matched = 0
+        #: mismatches per kind
+        self.kinds: "Counter[str]" = Counter()
+        #: mismatches per the expected and the actual status
+        self.transitions: (
+            "Counter[Tuple[PaymentStatus, Optional[PaymentStatus]]]"
+        ) = Counter()
+        #: sum of the amounts of the mismatches per kind
+        self.amounts: "Counter[str]" = Counter()
+
+    @property
+    def total(self) -> int:
+        """Return number of entries reconciled."""
+        return self.matched + sum(self.kinds.values())
+
+    def add(self, mismatch: Mismatch) -> None:
+        """Add the mismatch."""
+        self.kinds[mismatch.kind] += 1
+        self.transitions[mismatch.transition] += 1
+        self.amounts[mismatch.kind] += mismatch.entry.amount or 0
+
+    def update(self, other: "ReconciliationSummary") -> None:
+        """Add the counts of the other summary."""
+        self.matched += other.matched
+        self.kinds.update(other.kinds)
+        self.transitions.update(other.transitions)
+        self.amounts.update(other.amounts)
+
+    def __str__(self) -> str:
+        kinds = ", ".join(
+            f"{kind}={count}" for kind, count in sorted(self.kinds.items())
+        )
+        return (
+            f"{self.__class__.__name__}(total={self.total}, "
+            f"matched={self.matched}, kinds=[{kinds}])"
+        )
+
+
+class Reconciler:
+    """Compares ledger entries with the gateway payment statuses."""
+
+    def __init__(self, client: APIClient, concurrency: Concurrency = 16):
+        """Init the reconciler.
+
+        :param concurrency: maximum number of status calls in flight, or an
+          `AdaptiveConcurrency`
+        """
+        self.client = client
+        self.concurrency = concurrency
+
+    def run(
+        self,
+        entries: Iterable[LedgerEntry],
+        summary: Optional[ReconciliationSummary] = None,
+    ) -> Iterator[Mismatch]:
+        """Yield the mismatches in the order of completion.
+
+        :param entries: ledger entries. Consumed lazily, so memory usage
+          does not depend on the ledger size
+        :param summary: summary to update with the matched entries and the
+          mismatches
+        """
+
+        def status(entry: LedgerEntry) -> Any:
+            return self.client.get_payment_status(entry.pay_id)
+
+        for result in run_bounded(
+            status, entries, self.concurrency, key=lambda entry: entry.pay_id
+        ):
+            mismatch = self._mismatch(result.item, result)
+            if mismatch is None:
+                if summary is not None:
+                    summary.matched += 1
+                continue
+            if summary is not None:
+                summary.add(mismatch)
+            yield mismatch
+
+    @staticmethod
+    def _mismatch(
+        entry: LedgerEntry, result: BulkResult
+    ) -> Optional[Mismatch]:
+        if isinstance(result.error, APIPaymentNotFoundError):
+            return Mismatch(entry, MISSING, error=repr(result.error))
+        if not result.ok:
+            return Mismatch(entry, ERROR, error=repr(result.error))
+        actual = result.response.payment_status
+        if actual == entry.expected:
+            return None
+        return Mismatch(entry, classify(entry.expected, actual), actual)
+
+
+def shard(pay_id: str, shards: int) -> int:
+    """Return the shard of the payment, stable across processes."""
+    return zlib.crc32(pay_id.encode()) % shards
+
+
+class _WorkerError(NamedTuple):
+    error: str
+
+
+def _shard_worker(
+    client_factory: Callable[[], APIClient],
+    concurrency: Concurrency,
+    inbox: Any,
+    outbox: Any,
+) -> None:
+    def entries() -> Iterator[LedgerEntry]:
+        while True:
+            batch = inbox.get()
+            if batch is None:
+                return
+            yield from batch
+
+    summary = ReconciliationSummary()
+    try:
+        reconciler = Reconciler(client_factory(), concurrency)
+        for mismatch in reconciler.run(entries(), summary):
+            outbox.put(mismatch)
+    except Exception as exc:  # pylint:disable=broad-except
+        outbox.put(_WorkerError(repr(exc)))
+    finally:
+        outbox.put(summary)
+
+
+def reconcile_sharded(
+    client_factory: Callable[[], APIClient],
+    entries: Iterable[LedgerEntry],
+    processes: int,
+    concurrency: Concurrency = 16,
+    summary: Optional[ReconciliationSummary] = None,
+    batch_size: int = 256,
+    mp_context: Optional[Any] = None,
+) -> Iterator[Mismatch]:
+    """Reconcile the entries in worker processes.
+
+    The entries are sharded by the pay ID, so the statuses of a payment are
+    requested (and cached) by a single worker. Each worker runs a
+    `Reconciler` with its own client. Mismatches are yielded in the order
+    of completion.
+
+    :param client_factory: picklable callable (e.g. a module-level function)
+      creating the client in the worker
+    :param entries: ledger entries. Consumed lazily, at most a few batches
+      per worker are held in memory
+    :param processes: number of worker processes
+    :param concurrency: concurrency of each worker
+    :param summary: summary to update with the results of all workers
+    :param batch_size: number of entries sent to a worker at once
+    :param mp_context: multiprocessing context to start the workers with
+    :raises RuntimeError: if a worker fails
+    """
+    # pylint:disable=too-many-arguments,too-many-locals
+    if processes < 1:
+        raise ValueError('"processes" must be >= 1')
+    context = mp_context or multiprocessing.get_context()
+    inboxes = [context.Queue(maxsize=4) for _ in range(processes)]
+    outbox = context.Queue(maxsize=1024)
+    workers = [
+        context.Process(
+            target=_shard_worker,
+            args=(client_factory, concurrency, inbox, outbox),
+            daemon=True,
+        )
+        for inbox in inboxes
+    ]
+    stopped = threading.Event()
+    feed_errors: List[Exception] = []
+
+    def put(inbox: Any, item: Optional[List[LedgerEntry]]) -> bool:
+        while not stopped.is_set():
+            try:
+                inbox.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def feed() -> None:
+        batches: List[List[LedgerEntry]] = [[] for _ in workers]
+        try:
+            for entry in entries:
+                index = shard(entry.pay_id, processes)
+                batches[index].append(entry)
+                if len(batches[index]) >= batch_size:
+                    if not put(inboxes[index], batches[index]):
+                        return
+                    batches[index] = []
+        except Exception as exc:  # pylint:disable=broad-except
+            feed_errors.append(exc)
+            return
+        for inbox, batch in zip(inboxes, batches):
+            if batch and not put(inbox, batch):
+                return
+            if not put(inbox, None):
+                return
+
+    for worker in workers:
+        worker.start()
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    running = len(workers)
+    try:
+        while running:
+            try:
+                item = outbox.get(timeout=1)
+            except queue.Empty:
+                if feed_errors:
+                    raise RuntimeError(
+                        "Reading the ledger entries failed"
+                    ) from feed_errors[0]
+                # a worker exits with 0 after its summary is put, even if
+                # it was not read yet
+                if any(worker.exitcode not in (None, 0) for worker in workers):
+                    raise RuntimeError(
+                        "Reconciliation worker exited unexpectedly"
+                    ) from None
+                continue
+            if isinstance(item, Mismatch):
+                yield item
+            elif isinstance(item, _WorkerError):
+                raise RuntimeError(
+                    f"Reconciliation worker failed: {item.error}"
+                )
+            else:
+                running -= 1
+                if summary is not None:
+                    summary.update(item)
+    finally:
+        stopped.set()
+        for worker in workers:
+            if running:
+                worker.terminate()
+            worker.join()
+        _LOG.info("Sharded reconciliation finished: %s", summary)
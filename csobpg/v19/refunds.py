@@ -0,0 +1,305 @@
+"""Bulk refunds streamed from CSV or JSON Lines files.
+
+`read_refunds` reads `(pay_id, amount)` rows lazily from a CSV file with a
+header (columns ``pay_id`` and ``amount``) or a JSON Lines file (objects
+with the keys ``pay_id`` and ``amount``). An empty or missing amount refunds
+the remaining amount of the payment. Amounts are in hundredths of the base
+currency.
+
+`RefundPipeline` validates the rows and refunds the payments concurrently:
+
+* an amount which is not a positive integer is invalid
+* the payment status is requested with `get_payment_status`, so configure
+  the client's `status_cache` to reuse the statuses known already. A
+  payment which is not settled (or partially refunded) is invalid
+
+Invalid rows are not sent to the gateway. Rows of the same payment are
+refunded one after another, never concurrently. A refund whose response
+was lost is retried only as the client's `retry` policy allows; a lost
+refund of a payment refunded already is reported as failed, since the
+payment status cannot show whether it was applied.
+
+A result is written per row as soon as it is known, as a JSON Lines
+record:
+
+.. code-block:: json
+
+    {"line": 2, "pay_id": "abc", "amount": 100, "state": "refunded",
+     "status": 9, "code": 0}
+    {"line": 3, "pay_id": "def", "amount": null, "state": "invalid",
+     "error": "amount must be a positive integer"}
+
+The rows in flight are the only ones held in memory, so memory usage does
+not depend on the input size.
+"""
+
+import csv
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import (
+    IO,
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from .api import APIClient
+from .bulk import BulkResult, Concurrency, run_bounded
+from .errors import APIError
+from .response.base import PaymentStatus
+
+_LOG = logging.getLogger(__name__)
+
+#: result states
+REFUNDED = "refunded"
+INVALID = "invalid"
+REJECTED = "rejected"
+FAILED = "failed"
+
+#: payment statuses which allow a refund
+REFUNDABLE_STATUSES = frozenset(
+    {PaymentStatus.SETTLED, PaymentStatus.REFUND_PROCESSING}
+)
+
+
+class RefundRow(NamedTuple):
+    """Row of the refund input."""
+
+    #: line number in the input file
+    line: int
+    pay_id: str
+    #: None refunds the remaining amount
+    amount: Optional[int] = None
+    #: why the row could not be parsed
+    error: Optional[str] = None
+
+
+def _parse_amount(value: Any) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value.isdigit():
+            raise ValueError(value)
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+        raise ValueError(value)
+    return value
+
+
+def _row(line: int, pay_id: Any, amount: Any) -> RefundRow:
+    if not pay_id or not isinstance(pay_id, str):
+        return RefundRow(line, str(pay_id or ""), error="missing pay_id")
+    try:
+        return RefundRow(line, pay_id, _parse_amount(amount))
+    except ValueError:
+        return RefundRow(
+            line, pay_id, error="amount must be a positive integer"
+        )
+
+
+def _read_csv(file: IO[str]) -> Iterator[RefundRow]:
+    reader = csv.DictReader(file)
+    for record in reader:
+        yield _row(reader.line_num, record.get("pay_id"), record.get("amount"))
+
+
+def _read_jsonl(file: IO[str]) -> Iterator[RefundRow]:
+    for line, text in enumerate(file, 1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError:
+            yield RefundRow(line, "", error="invalid JSON")
+            continue
+        if not isinstance(record, dict):
+            yield RefundRow(line, "", error="invalid JSON")
+            continue
+        yield _row(line, record.get("pay_id"), record.get("amount"))
+
+
+def read_refunds(path: str, fmt: Optional[str] = None) -> Iterator[RefundRow]:
+    """Read the refund rows lazily.
+
+    :param path: path of the input file
+    :param fmt: "csv" or "jsonl". Guessed from the file extension by default
+      (".csv" is CSV, anything else JSON Lines)
+    """
+    if fmt is None:
+        fmt = "csv" if os.path.splitext(path)[1].lower() == ".csv" else "jsonl"
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError(f'Unknown format "{fmt}"')
+    read = _read_csv if fmt == "csv" else _read_jsonl
+    with open(path, encoding="utf8", newline="") as file:
+        yield from read(file)
+
+
+class RefundSummary:
+    """Summary of the refunds."""
+
+    def __init__(self) -> None:
+        #: refunded payments
+        self.refunded = 0
+        #: sum of the refunded amounts given in the input. Refunds of the
+        #: remaining amount are not included
+        self.refunded_amount = 0
+        #: rows not sent to the gateway
+        self.invalid = 0
+        #: payments rejected by the API per the error code
+        self.error_codes: "Counter[int]" = Counter()
+        #: payments failed without an API result (e.g. HTTP errors)
+        self.failed = 0
+
+    @property
+    def total(self) -> int:
+        """Return number of rows processed."""
+        return (
+            self.refunded
+            + self.invalid
+            + sum(self.error_codes.values())
+            + self.failed
+        )
+
+    def add(self, record: dict) -> None:
+        """Add the result record."""
+        state = record["state"]
+        if state == REFUNDED:
+            self.refunded += 1
+            self.refunded_amount += record["amount"] or 0
+        elif state == INVALID:
+            self.invalid += 1
+        elif state == REJECTED:
+            self.error_codes[record["code"]] += 1
+        else:
+            self.failed += 1
+
+    def __str__(self) -> str:
+        codes = ", ".join(
+            f"{code}={count}"
+            for code, count in sorted(self.error_codes.items())
+        )
+        return (
+            f"{self.__class__.__name__}(total={self.total}, "
+            f"refunded={self.refunded}, "
+            f"refunded_amount={self.refunded_amount}, "
+            f"invalid={self.invalid}, error_codes=[{codes}], "
+            f"failed={self.failed})"
+        )
+
+
+class _Invalid(NamedTuple):
+    reason: str
+
+
+class _PaymentLocks:
+    """Locks per pay ID, kept only while in use."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # lock and the number of its users per pay ID
+        self._locks: Dict[str, List[Any]] = {}
+
+    @contextmanager
+    def hold(self, pay_id: str) -> Iterator[None]:
+        """Hold the lock of the payment."""
+        with self._lock:
+            entry = self._locks.setdefault(pay_id, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[pay_id]
+
+
+class RefundPipeline:
+    """Validates and refunds payments concurrently."""
+
+    def __init__(
+        self,
+        client: APIClient,
+        concurrency: Concurrency = 8,
+        refundable: FrozenSet[PaymentStatus] = REFUNDABLE_STATUSES,
+    ) -> None:
+        """Init the pipeline.
+
+        :param concurrency: maximum number of rows processed at once, or an
+          `AdaptiveConcurrency`
+        :param refundable: payment statuses which allow a refund
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.refundable = refundable
+
+    def run(self, rows: Iterable[RefundRow], output: IO[str]) -> RefundSummary:
+        """Refund the payments.
+
+        :param rows: rows to refund, e.g. from `read_refunds`. Consumed
+          lazily
+        :param output: text file to write the JSON Lines results to
+        :return: summary of the refunds
+        """
+        summary = RefundSummary()
+        locks = _PaymentLocks()
+
+        def refund(row: RefundRow) -> Any:
+            if row.error is not None:
+                return _Invalid(row.error)
+            with locks.hold(row.pay_id):
+                return self._refund(row)
+
+        for result in run_bounded(
+            refund, rows, self.concurrency, key=lambda row: row.pay_id
+        ):
+            record = self._record(result.item, result)
+            output.write(json.dumps(record, separators=(",", ":")) + "\n")
+            summary.add(record)
+        output.flush()
+        _LOG.info("Refunds finished: %s", summary)
+        return summary
+
+    def _refund(self, row: RefundRow) -> Any:
+        status = self.client.get_payment_status(row.pay_id)
+        if status.payment_status not in self.refundable:
+            name = (
+                status.payment_status.name if status.payment_status else None
+            )
+            return _Invalid(f"payment status {name} is not refundable")
+        return self.client.refund_payment(row.pay_id, row.amount)
+
+    @staticmethod
+    def _record(row: RefundRow, result: BulkResult) -> dict:
+        record: Dict[str, Any] = {
+            "line": row.line,
+            "pay_id": row.pay_id,
+            "amount": row.amount,
+        }
+        if isinstance(result.response, _Invalid):
+            record["state"] = INVALID
+            record["error"] = result.response.reason
+        elif result.ok:
+            status = result.response.payment_status
+            record["state"] = REFUNDED
+            record["status"] = status.value if status else None
+            record["code"] = result.response.result_code
+        elif isinstance(result.error, APIError):
+            record["state"] = REJECTED
+            record["code"] = result.error.code
+            record["error"] = result.error.message
+        else:
+            record["state"] = FAILED
+            record["error"] = repr(result.error)
+        return record
@@ -1,18 +1,67 @@
-"""API request wrappers."""
+"""API request wrappers.
 
-from .echo import EchoRequest
-from .oneclick_echo import OneClickEchoRequest
-from .oneclick_init import OneClickPaymentInitRequest
-from .oneclick_process import OneClickPaymentProcessRequest
-from .payment_close import PaymentCloseRequest
-from .payment_init import PaymentInitRequest
-from .payment_process import PaymentProcessRequest
-from .payment_refund import PaymentRefundRequest
-from .payment_reverse import PaymentReverseRequest
-from .payment_status import PaymentStatusRequest
-from .googlepay_echo import GooglePayEchoRequest
-from .googlepay_init import GooglePayInitRequest
-from .googlepay_process import GooglePayProcessRequest
-from .applepay_echo import ApplePayEchoRequest
-from .applepay_init import ApplePayInitRequest
-from .applepay_process import ApplePayProcessRequest
+The classes are imported on first use.
+"""
+
+from typing import TYPE_CHECKING
+
+from ..lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .echo import EchoRequest
+    from .oneclick_echo import OneClickEchoRequest
+    from .oneclick_init import OneClickPaymentInitRequest
+    from .oneclick_process import OneClickPaymentProcessRequest
+    from .payment_close import PaymentCloseRequest
+    from .payment_init import PaymentInitRequest
+    from .payment_process import PaymentProcessRequest
+    from .payment_refund import PaymentRefundRequest
+    from .payment_reverse import PaymentReverseRequest
+    from .payment_status import PaymentStatusRequest
+    from .googlepay_echo import GooglePayEchoRequest
+    from .googlepay_init import GooglePayInitRequest
+    from .googlepay_process import GooglePayProcessRequest
+    from .applepay_echo import ApplePayEchoRequest
+    from .applepay_init import ApplePayInitRequest
+    from .applepay_process import ApplePayProcessRequest
+
+__all__ = [
+    "EchoRequest",
+    "OneClickEchoRequest",
+    "OneClickPaymentInitRequest",
+    "OneClickPaymentProcessRequest",
+    "PaymentCloseRequest",
+    "PaymentInitRequest",
+    "PaymentProcessRequest",
+    "PaymentRefundRequest",
+    "PaymentReverseRequest",
+    "PaymentStatusRequest",
+    "GooglePayEchoRequest",
+    "GooglePayInitRequest",
+    "GooglePayProcessRequest",
+    "ApplePayEchoRequest",
+    "ApplePayInitRequest",
+    "ApplePayProcessRequest",
+]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "EchoRequest": ".echo",
+        "OneClickEchoRequest": ".oneclick_echo",
+        "OneClickPaymentInitRequest": ".oneclick_init",
+        "OneClickPaymentProcessRequest": ".oneclick_process",
+        "PaymentCloseRequest": ".payment_close",
+        "PaymentInitRequest": ".payment_init",
+        "PaymentProcessRequest": ".payment_process",
+        "PaymentRefundRequest": ".payment_refund",
+        "PaymentReverseRequest": ".payment_reverse",
+        "PaymentStatusRequest": ".payment_status",
+        "GooglePayEchoRequest": ".googlepay_echo",
+        "GooglePayInitRequest": ".googlepay_init",
+        "GooglePayProcessRequest": ".googlepay_process",
+        "ApplePayEchoRequest": ".applepay_echo",
+        "ApplePayInitRequest": ".applepay_init",
+        "ApplePayProcessRequest": ".applepay_process",
+    },
+)
@@ -1,17 +1,24 @@
 """Base request."""
 
-from abc import ABC, abstractmethod
-from typing import Optional
+import time
+from abc import ABC
+from typing import Optional, Tuple
 
-from ..signature import SignedModel, sign
+from ..signature import KeyType, SignedModel, sign
 from .dttm import get_dttm
 
 
 class BaseRequest(SignedModel, ABC):
     """Base API request."""
 
+    #: seconds spent signing the request
+    sign_seconds = 0.0
+    #: sign text, key and signature of the last signing
+    _signed: Optional[Tuple[str, KeyType, str]] = None
+    _json_method = "_as_json"
+
     def __init__(
-        self, endpoint: str, merchant_id: str, private_key: str
+        self, endpoint: str, merchant_id: str, private_key: KeyType
     ) -> None:
         self.merchant_id = merchant_id
         self.private_key = private_key
@@ -20,8 +27,20 @@ class BaseRequest(SignedModel, ABC):
 
     @property
     def signature(self) -> str:
-        """Build request signature."""
-        return sign(self.to_sign_text().encode(), self.private_key)
+        """Build request signature.
+
+        The signature is cached until the sign text or the key changes.
+        """
+        text = self.to_sign_text()
+        signed = self._signed
+        if signed and signed[0] == text and signed[1] is self.private_key:
+            return signed[2]
+
+        started = time.perf_counter()
+        signature = sign(text.encode(), self.private_key)
+        self.sign_seconds += time.perf_counter() - started
+        self._signed = (text, self.private_key, signature)
+        return signature
 
     def to_json(self) -> Optional[dict]:
         """Convert request to JSON.
@@ -29,11 +48,12 @@ class BaseRequest(SignedModel, ABC):
         Sign with the key.
         """
         body = self._as_json()
-        body["merchantId"] = self.merchant_id
         body["signature"] = self.signature
-        body["dttm"] = self.dttm
-        return {key: value for key, value in body.items() if value is not None}
+        return body
 
-    @abstractmethod
     def _as_json(self) -> dict:
-        """Return request as JSON."""
+        """Return request as JSON without the signature.
+
+        Compiled from `_fields` (see `csobpg.v19.spec`).
+        """
+        raise TypeError(f"{type(self).__name__} has no fields")
@@ -1,16 +1,17 @@
 """Echo request."""
 
+from ..signature import KeyType
+from ..spec import Field
 from .base import BaseRequest
 
 
 class EchoRequest(BaseRequest):
     """Echo request."""
 
-    def __init__(self, merchant_id: str, private_key: str) -> None:
-        super().__init__("echo", merchant_id, private_key)
-
-    def _get_params_sequence(self) -> list:
-        return [self.merchant_id, self.dttm]
+    _fields = (
+        Field("merchant_id", "merchantId"),
+        Field("dttm", "dttm"),
+    )
 
-    def _as_json(self) -> dict:
-        return {}
+    def __init__(self, merchant_id: str, private_key: KeyType) -> None:
+        super().__init__("echo", merchant_id, private_key)
@@ -2,6 +2,8 @@
 
 from typing import Optional
 
+from ..signature import KeyType
+from ..spec import Field
 from .base import BaseRequest
 from ..models.fingerprint import SDK, Browser, Fingerprint
 
@@ -16,30 +18,20 @@ __all__ = [
 class GooglePayProcessRequest(BaseRequest):
     """GooglePay process request."""
 
+    _fields = (
+        Field("merchant_id", "merchantId"),
+        Field("pay_id", "payId"),
+        Field("dttm", "dttm"),
+        Field("fingerprint", "fingerprint", nested=True),
+    )
+
     def __init__(
         self,
         merchant_id: str,
-        private_key: str,
+        private_key: KeyType,
         pay_id: str,
         fingerprint: Optional[Fingerprint] = None,
     ) -> None:
         super().__init__("googlepay/process", merchant_id, private_key)
         self.pay_id = pay_id
         self.fingerprint = fingerprint
-
-    def _get_params_sequence(self) -> list:
-        return [
-            self.merchant_id,
-            self.pay_id,
-            self.dttm,
-            self.fingerprint.to_sign_text() if self.fingerprint else None,
-        ]
-
-    def _as_json(self) -> dict:
-        result = {
-            "payId": self.pay_id,
-        }
-        if self.fingerprint:
-            result["fingerprint"] = self.fingerprint.as_json()  # type: ignore
-
-        return result
@@ -8,6 +8,8 @@ from csobpg.v19.models import order as _order
 from csobpg.v19.models import payment as _payment
 from csobpg.v19.models import webpage as _webpage
 
+from ..signature import KeyType
+from ..spec import Field, enum_value
 from .base import BaseRequest
 from .merchant import pack_merchant_data
 
@@ -15,11 +17,32 @@ from .merchant import pack_merchant_data
 class OneClickPaymentInitRequest(BaseRequest):
     """OneClick payment init request."""
 
+    _fields = (
+        Field("merchant_id", "merchantId"),
+        Field("template_id", "origPayId"),
+        Field("order_no", "orderNo"),
+        Field("dttm", "dttm"),
+        Field("payment_method", "payMethod", enum_value),
+        Field("client_ip", "clientIp"),
+        Field("total_amount", "totalAmount"),
+        Field("currency", "currency", enum_value),
+        Field("close_payment", "closePayment"),
+        Field("return_url", "returnUrl"),
+        Field("return_method", "returnMethod", enum_value),
+        Field("customer", "customer", nested=True),
+        Field("order", "order", nested=True),
+        Field("client_initiated", "clientInitiated"),
+        Field("sdk_used", "sdkUsed"),
+        Field("merchant_data", "merchantData"),
+        Field("language", "language", enum_value),
+        Field("ttl_sec", "ttlSec"),
+    )
+
     def __init__(
         # pylint:disable=too-many-locals
         self,
         merchant_id: str,
-        private_key: str,
+        private_key: KeyType,
         template_id: str,
         order_no: str,
         return_url: str,
@@ -56,51 +79,3 @@ class OneClickPaymentInitRequest(BaseRequest):
         )
         self.ttl_sec = ttl_sec
         self.language = language
-
-    def _get_params_sequence(self) -> list:
-        return [
-            self.merchant_id,
-            self.template_id,
-            self.order_no,
-            self.dttm,
-            self.payment_method.value,
-            self.client_ip,
-            self.total_amount,
-            self.currency.value if self.currency else None,
-            self.close_payment,
-            self.return_url,
-            self.return_method.value,
-            self.customer.to_sign_text() if self.customer else None,
-            self.order.to_sign_text() if self.order else None,
-            self.client_initiated,
-            self.sdk_used,
-            self.merchant_data,
-            self.language.value,
-            self.ttl_sec,
-        ]
-
-    def _as_json(self) -> dict:
-        result = {
-            "origPayId": self.template_id,
-            "orderNo": self.order_no,
-            "payMethod": self.payment_method.value,
-            "clientIp": self.client_ip,
-            "totalAmount": self.total_amount,
-            "closePayment": self.close_payment,
-            "returnUrl": self.return_url,
-            "returnMethod": self.return_method.value,
-            "clientInitiated": self.client_initiated,
-            "sdkUsed": self.sdk_used,
-            "merchantData": self.merchant_data,
-            "language": self.language.value,
-            "ttlSec": self.ttl_sec,
-        }
-
-        if self.currency:
-            result["currency"] = self.currency.value
-        if self.customer:
-            result["customer"] = self.customer.as_json()
-        if self.order:
-            result["order"] = self.order.as_json()
-
-        return result
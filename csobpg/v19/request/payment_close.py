@@ -2,25 +2,28 @@
 
 from typing import Optional
 
+from ..signature import KeyType
+from ..spec import Field
 from .base import BaseRequest
 
 
 class PaymentCloseRequest(BaseRequest):
     """Payment close request."""
 
+    _fields = (
+        Field("merchant_id", "merchantId"),
+        Field("pay_id", "payId"),
+        Field("dttm", "dttm"),
+        Field("total_amount", "totalAmount"),
+    )
+
     def __init__(
         self,
         merchant_id: str,
-        private_key: str,
+        private_key: KeyType,
         pay_id: str,
         total_amount: Optional[int] = None,
     ) -> None:
         super().__init__("payment/close", merchant_id, private_key)
         self.pay_id = pay_id
         self.total_amount = total_amount
-
-    def _get_params_sequence(self) -> list:
-        return [self.merchant_id, self.pay_id, self.dttm, self.total_amount]
-
-    def _as_json(self) -> dict:
-        return {"payId": self.pay_id, "totalAmount": self.total_amount}
@@ -9,6 +9,8 @@ from csobpg.v19.models import order as _order
 from csobpg.v19.models import payment as _payment
 from csobpg.v19.models import webpage as _webpage
 
+from ..signature import KeyType
+from ..spec import Field, enum_value
 from .base import BaseRequest
 from .dttm import get_payment_expiry
 from .merchant import pack_merchant_data
@@ -17,10 +19,33 @@ from .merchant import pack_merchant_data
 class PaymentInitRequest(BaseRequest):
     """Payment init request."""
 
+    _fields = (
+        Field("merchant_id", "merchantId"),
+        Field("order_no", "orderNo"),
+        Field("dttm", "dttm"),
+        Field("payment_operation", "payOperation", enum_value),
+        Field("payment_method", "payMethod", enum_value),
+        Field("total_amount", "totalAmount"),
+        Field("currency", "currency", enum_value),
+        Field("close_payment", "closePayment"),
+        Field("return_url", "returnUrl"),
+        Field("return_method", "returnMethod", enum_value),
+        Field("cart", "cart", nested=True),
+        Field("customer", "customer", nested=True),
+        Field("order", "order", nested=True),
+        Field("merchant_data", "merchantData"),
+        Field("customer_id", "customerId"),
+        Field("page_appearance.language", "language", enum_value),
+        Field("ttl_sec", "ttlSec"),
+        Field("page_appearance.logo_version", "logoVersion"),
+        Field("page_appearance.color_scheme_version", "colorSchemeVersion"),
+        Field("payment_expiry", "customExpiry"),
+    )
+
     def __init__(
         self,
         merchant_id: str,
-        private_key: str,
+        private_key: KeyType,
         order_no: str,
         total_amount: int,
         return_url: str,
@@ -77,49 +102,3 @@ class PaymentInitRequest(BaseRequest):
         self.customer_id = customer_id
         self.payment_expiry = get_payment_expiry(payment_expiry)
         self.page_appearance = page_appearance
-
-    def _get_params_sequence(self) -> tuple:
-        return (
-            self.merchant_id,
-            self.order_no,
-            self.dttm,
-            self.payment_operation.value,
-            self.payment_method.value,
-            self.total_amount,
-            self.currency.value,
-            self.close_payment,
-            self.return_url,
-            self.return_method.value,
-            self.cart.to_sign_text() if self.cart else None,
-            self.customer.to_sign_text() if self.customer else None,
-            self.order.to_sign_text() if self.order else None,
-            self.merchant_data,
-            self.customer_id,
-            self.page_appearance.language.value,
-            self.ttl_sec,
-            self.page_appearance.logo_version,
-            self.page_appearance.color_scheme_version,
-            self.payment_expiry,
-        )
-
-    def _as_json(self) -> dict:
-        return {
-            "orderNo": self.order_no,
-            "totalAmount": self.total_amount,
-            "returnUrl": self.return_url,
-            "returnMethod": self.return_method.value,
-            "payOperation": self.payment_operation.value,
-            "payMethod": self.payment_method.value,
-            "closePayment": self.close_payment,
-            "currency": self.currency.value,
-            "ttlSec": self.ttl_sec,
-            "cart": self.cart.as_json(),
-            "customer": self.customer.as_json() if self.customer else None,
-            "order": self.order.as_json() if self.order else None,
-            "merchantData": self.merchant_data,
-            "customerId": self.customer_id,
-            "language": self.page_appearance.language.value,
-            "logoVersion": self.page_appearance.logo_version,
-            "colorSchemeVersion": self.page_appearance.color_scheme_version,
-            "customExpiry": self.payment_expiry,
-        }
@@ -2,25 +2,28 @@
 
 from typing import Optional
 
+from ..signature import KeyType
+from ..spec import Field
 from .base import BaseRequest
 
 
 class PaymentRefundRequest(BaseRequest):
     """Payment close request."""
 
+    _fields = (
+        Field("merchant_id", "merchantId"),
+        Field("pay_id", "payId"),
+        Field("dttm", "dttm"),
+        Field("amount", "amount"),
+    )
+
     def __init__(
         self,
         merchant_id: str,
-        private_key: str,
+        private_key: KeyType,
         pay_id: str,
         amount: Optional[int] = None,
     ) -> None:
         super().__init__("payment/refund", merchant_id, private_key)
         self.pay_id = pay_id
         self.amount = amount
-
-    def _get_params_sequence(self) -> list:
-        return [self.merchant_id, self.pay_id, self.dttm, self.amount]
-
-    def _as_json(self) -> dict:
-        return {"payId": self.pay_id, "amount": self.amount}
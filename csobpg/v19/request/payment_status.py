@@ -1,5 +1,7 @@
 """Payment status request."""
 
+from ..signature import KeyType
+from ..spec import Field
 from .base import BaseRequest
 from .url import join_url as _join_url
 
@@ -7,8 +9,14 @@ from .url import join_url as _join_url
 class PaymentStatusRequest(BaseRequest):
     """Payment status request."""
 
+    _fields = (
+        Field("merchant_id", "merchantId"),
+        Field("pay_id", "payId"),
+        Field("dttm", "dttm"),
+    )
+
     def __init__(
-        self, merchant_id: str, private_key: str, pay_id: str
+        self, merchant_id: str, private_key: KeyType, pay_id: str
     ) -> None:
         super().__init__("payment/status", merchant_id, private_key)
         self.pay_id = pay_id
@@ -17,9 +25,3 @@ class PaymentStatusRequest(BaseRequest):
             self.endpoint,
             [self.merchant_id, self.pay_id, self.dttm, self.signature],
         )
-
-    def _get_params_sequence(self) -> list:
-        return [self.merchant_id, self.pay_id, self.dttm]
-
-    def _as_json(self) -> dict:
-        return {"payId": self.pay_id}
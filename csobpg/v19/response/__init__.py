@@ -1,21 +1,29 @@
-"""API response wrappers."""
+"""API response wrappers.
 
-from .base import PaymentStatus
-from .googlepay_echo import GooglePayEchoResponse
-from .googlepay_init import GooglePayInitResponse
-from .googlepay_process import GooglePayProcessResponse
-from .applepay_echo import ApplePayEchoResponse
-from .applepay_init import ApplePayInitResponse
-from .applepay_process import ApplePayProcessResponse
-from .oneclick_echo import OneClickEchoResponse
-from .oneclick_payment_init import OneClickPaymentInitResponse
-from .oneclick_payment_process import OneClickPaymentProcessResponse
-from .payment_close import PaymentCloseResponse
-from .payment_init import PaymentInitResponse
-from .payment_process import PaymentProcessResponse
-from .payment_refund import PaymentRefundResponse
-from .payment_reverse import PaymentReverseResponse
-from .payment_status import PaymentStatusResponse
+The classes are imported on first use.
+"""
+
+from typing import TYPE_CHECKING
+
+from ..lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .base import PaymentStatus
+    from .googlepay_echo import GooglePayEchoResponse
+    from .googlepay_init import GooglePayInitResponse
+    from .googlepay_process import GooglePayProcessResponse
+    from .applepay_echo import ApplePayEchoResponse
+    from .applepay_init import ApplePayInitResponse
+    from .applepay_process import ApplePayProcessResponse
+    from .oneclick_echo import OneClickEchoResponse
+    from .oneclick_payment_init import OneClickPaymentInitResponse
+    from .oneclick_payment_process import OneClickPaymentProcessResponse
+    from .payment_close import PaymentCloseResponse
+    from .payment_init import PaymentInitResponse
+    from .payment_process import PaymentProcessResponse
+    from .payment_refund import PaymentRefundResponse
+    from .payment_reverse import PaymentReverseResponse
+    from .payment_status import PaymentStatusResponse
 
 __all__ = [
     "PaymentStatus",
@@ -35,3 +43,25 @@ __all__ = [
     "ApplePayInitResponse",
     "ApplePayProcessResponse",
 ]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "PaymentStatus": ".base",
+        "GooglePayEchoResponse": ".googlepay_echo",
+        "GooglePayInitResponse": ".googlepay_init",
+        "GooglePayProcessResponse": ".googlepay_process",
+        "ApplePayEchoResponse": ".applepay_echo",
+        "ApplePayInitResponse": ".applepay_init",
+        "ApplePayProcessResponse": ".applepay_process",
+        "OneClickEchoResponse": ".oneclick_echo",
+        "OneClickPaymentInitResponse": ".oneclick_payment_init",
+        "OneClickPaymentProcessResponse": ".oneclick_payment_process",
+        "PaymentCloseResponse": ".payment_close",
+        "PaymentInitResponse": ".payment_init",
+        "PaymentProcessResponse": ".payment_process",
+        "PaymentRefundResponse": ".payment_refund",
+        "PaymentReverseResponse": ".payment_reverse",
+        "PaymentStatusResponse": ".payment_status",
+    },
+)
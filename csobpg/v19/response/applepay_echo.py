@@ -2,11 +2,14 @@
 
 from .base import Response, _parse_result_code
 from ..errors import APIClientError, raise_for_result_code
+from ..signature import KeyType
 
 
 class ApplePayEchoResponse(Response):
     """ApplePay echo response."""
 
+    __slots__ = ("init_params",)
+
     def __init__(
         self,
         init_params: str,
@@ -18,7 +21,7 @@ class ApplePayEchoResponse(Response):
         self.init_params = init_params
 
     @classmethod
-    def from_json(cls, response: dict, public_key: str):
+    def from_json(cls, response: dict, public_key: KeyType):
         """Return response from JSON."""
         if not response:
             raise APIClientError("API returned empty response")
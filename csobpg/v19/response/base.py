@@ -8,7 +8,7 @@ from ..errors import (
     APIInvalidSignatureError,
     raise_for_result_code,
 )
-from ..signature import SignedModel, verify
+from ..signature import KeyType, SignedModel, verify
 
 
 class PaymentStatus(Enum):
@@ -50,6 +50,8 @@ def _parse_result_code(response: dict) -> int:
 class Response(SignedModel, ABC):
     """API response."""
 
+    __slots__ = ("dttm", "result_code", "result_message")
+
     def __init__(self, dttm: str, result_code: int, result_message: str):
         self.dttm = dttm
         self.result_code = result_code
@@ -61,7 +63,7 @@ class Response(SignedModel, ABC):
         return self.result_code == 0
 
     @classmethod
-    def from_json(cls, response: dict, public_key: str):
+    def from_json(cls, response: dict, public_key: KeyType):
         """Return response from JSON."""
         if not response:
             raise APIClientError("API returned empty response")
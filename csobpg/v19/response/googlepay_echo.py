@@ -1,4 +1,5 @@
 """GooglePay echo response."""
+
 from csobpg.v19.errors import (
     APIInvalidSignatureError,
     raise_for_result_code,
@@ -7,11 +8,14 @@ from csobpg.v19.errors import (
 
 from .base import Response, _parse_result_code
 from ..models.init_params import InitPramsGoogle
+from ..signature import KeyType
 
 
 class GooglePayEchoResponse(Response):
     """GooglePay echo response."""
 
+    __slots__ = ("init_prams",)
+
     def __init__(
         self,
         init_prams: InitPramsGoogle,
@@ -23,7 +27,7 @@ class GooglePayEchoResponse(Response):
         self.init_prams = init_prams
 
     @classmethod
-    def from_json(cls, response: dict, public_key: str):
+    def from_json(cls, response: dict, public_key: KeyType):
         """Return response from JSON."""
         if not response:
             raise APIClientError("API returned empty response")
@@ -6,6 +6,8 @@ from .base import Response
 class OneClickEchoResponse(Response):
     """OneClick echo response."""
 
+    __slots__ = ("template_id",)
+
     def __init__(
         self,
         template_id: str,
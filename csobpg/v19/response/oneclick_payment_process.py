@@ -10,6 +10,8 @@ from .base import PaymentStatus, Response, get_payment_status
 class OneClickPaymentProcessResponse(Response):
     """OneClick Payment process response."""
 
+    __slots__ = ("pay_id", "payment_status", "status_detail", "actions")
+
     def __init__(
         self,
         pay_id: str,
@@ -57,7 +59,7 @@ class OneClickPaymentProcessResponse(Response):
             self.result_message,
             self.payment_status.value if self.payment_status else None,
             self.status_detail,
-            self.actions.to_sign_text() if self.actions else None,
+            self.actions,
         )
 
     def __str__(self) -> str:
@@ -8,6 +8,8 @@ from .base import PaymentStatus, Response, get_payment_status
 class PaymentCloseResponse(Response):
     """Payment close response."""
 
+    __slots__ = ("pay_id", "payment_status", "auth_code", "status_detail")
+
     def __init__(
         self,
         pay_id: str,
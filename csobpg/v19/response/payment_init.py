@@ -8,6 +8,8 @@ from .base import PaymentStatus, Response, get_payment_status
 class PaymentInitResponse(Response):
     """Payment init response."""
 
+    __slots__ = ("pay_id", "payment_status", "customer_code", "status_detail")
+
     def __init__(
         self,
         pay_id: str,
@@ -9,6 +9,14 @@ from .base import PaymentStatus, Response, get_payment_status
 class PaymentProcessResponse(Response):
     """Payment process response."""
 
+    __slots__ = (
+        "pay_id",
+        "payment_status",
+        "auth_code",
+        "_merchant_data",
+        "status_detail",
+    )
+
     def __init__(
         self,
         pay_id: str,
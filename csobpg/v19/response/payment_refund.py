@@ -6,6 +6,8 @@ from .payment_close import PaymentCloseResponse as _PaymentCloseResponse
 class PaymentRefundResponse(_PaymentCloseResponse):
     """Payment refund response."""
 
+    __slots__ = ()
+
     @classmethod
     def _from_json(
         cls, response: dict, dttm: str, result_code: int, result_message: str
@@ -8,6 +8,8 @@ from .base import PaymentStatus, Response, get_payment_status
 class PaymentReverseResponse(Response):
     """Payment reverse response."""
 
+    __slots__ = ("pay_id", "payment_status", "status_detail")
+
     def __init__(
         self,
         pay_id: str,
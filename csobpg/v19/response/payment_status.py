@@ -10,6 +10,14 @@ from .base import PaymentStatus, Response, get_payment_status
 class PaymentStatusResponse(Response):
     """Payment status response."""
 
+    __slots__ = (
+        "pay_id",
+        "payment_status",
+        "auth_code",
+        "status_detail",
+        "actions",
+    )
+
     def __init__(
         self,
         pay_id: str,
@@ -61,7 +69,7 @@ class PaymentStatusResponse(Response):
             self.payment_status.value if self.payment_status else None,
             self.auth_code,
             self.status_detail,
-            self.actions.to_sign_text() if self.actions else None,
+            self.actions,
         )
 
     def __str__(self) -> str:
@@ -0,0 +1,183 @@
+"""Retry policies.
+
+API operations differ in whether they may be safely repeated:
+
+* `payment/status` and the echo operations do not change anything and are
+  always safe to retry
+* `payment/init` is retried with the same `orderNo` (the request is rebuilt
+  from the same arguments), so a duplicate payment can be matched to the
+  order
+* `payment/close`, `payment/reverse` and `payment/refund` may have been
+  applied even if the response was lost. The payment status is checked
+  before such an operation is retried. A partial refund leaves the payment
+  in REFUND_PROCESSING, so the status shows a lost refund only if the
+  payment had not been refunded before: the status is requested before the
+  first refund attempt, and a failed refund of a payment refunded already
+  is not retried
+* the rest of the operations are not retried
+
+Each attempt builds and signs the request again, so it gets a fresh `dttm`.
+"""
+
+import random
+from enum import Enum
+from typing import Dict, FrozenSet, Optional, Tuple, Type
+
+from httprest.http.errors import (
+    HTTPConnectionError,
+    HTTPError,
+    HTTPTimeoutError,
+)
+
+from .errors import APIInternalError
+from .response.base import PaymentStatus, Response
+from .response.payment_status import PaymentStatusResponse
+
+
+class RetryMode(Enum):
+    """How an operation may be retried."""
+
+    NEVER = "never"
+    SAFE = "safe"
+    CHECK_STATUS = "check_status"
+
+
+DEFAULT_MODES: Dict[str, RetryMode] = {
+    "echo": RetryMode.SAFE,
+    "oneclick/echo": RetryMode.SAFE,
+    "googlepay/echo": RetryMode.SAFE,
+    "applepay/echo": RetryMode.SAFE,
+    "payment/status": RetryMode.SAFE,
+    "payment/init": RetryMode.SAFE,
+    "payment/close": RetryMode.CHECK_STATUS,
+    "payment/reverse": RetryMode.CHECK_STATUS,
+    "payment/refund": RetryMode.CHECK_STATUS,
+}
+
+#: payment statuses which mean that the operation has already been applied
+APPLIED_STATUSES: Dict[str, FrozenSet[PaymentStatus]] = {
+    "payment/close": frozenset(
+        (PaymentStatus.WAITING_SETTLEMENT, PaymentStatus.SETTLED)
+    ),
+    "payment/reverse": frozenset((PaymentStatus.REVERSED,)),
+    "payment/refund": frozenset(
+        (PaymentStatus.REFUND_PROCESSING, PaymentStatus.RETURNED)
+    ),
+}
+
+#: operations whose applied statuses may precede the call. The payment
+#: status is requested before the first attempt
+STATUS_BEFORE_OPERATIONS: FrozenSet[str] = frozenset(("payment/refund",))
+
+
+def status_conclusive(operation: str, before: Optional[PaymentStatus]) -> bool:
+    """Return whether the status shows if the operation was applied.
+
+    :param before: payment status before the first attempt, None if it was
+      not requested
+    """
+    return before not in APPLIED_STATUSES.get(operation, ())
+
+
+#: transient errors
+RETRYABLE_ERRORS: Tuple[Type[Exception], ...] = (
+    HTTPConnectionError,
+    HTTPTimeoutError,
+    HTTPError,
+    APIInternalError,
+)
+
+
+class RetryPolicy:
+    """Retry policy with exponential backoff and jitter."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 10.0,
+        jitter: bool = True,
+        modes: Optional[Dict[str, RetryMode]] = None,
+        retry_on: Tuple[Type[Exception], ...] = RETRYABLE_ERRORS,
+    ) -> None:
+        """Init the policy.
+
+        :param max_attempts: maximum number of attempts (including the first
+          one)
+        :param backoff: delay before the first retry in seconds. It doubles
+          with each further retry
+        :param max_backoff: maximum delay in seconds
+        :param jitter: whether to randomize delays ("full jitter")
+        :param modes: retry modes per operation. Override `DEFAULT_MODES`
+        :param retry_on: errors to retry on
+        """
+        # pylint:disable=too-many-arguments
+        if max_attempts < 1:
+            raise ValueError('"max_attempts" must be >= 1')
+        if backoff < 0 or max_backoff < 0:
+            raise ValueError("Backoff must be >= 0")
+
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.modes = {**DEFAULT_MODES, **(modes or {})}
+        self.retry_on = retry_on
+
+    def mode(self, operation: str) -> RetryMode:
+        """Return the retry mode of the operation."""
+        return self.modes.get(operation, RetryMode.NEVER)
+
+    def should_retry(
+        self, operation: str, error: Exception, attempt: int
+    ) -> bool:
+        """Return whether to retry the operation.
+
+        :param attempt: number of the failed attempt, starting with 1
+        """
+        return (
+            attempt < self.max_attempts
+            and self.mode(operation) != RetryMode.NEVER
+            and isinstance(error, self.retry_on)
+        )
+
+    def delay(self, attempt: int) -> float:
+        """Return delay in seconds before the next attempt.
+
+        :param attempt: number of the failed attempt, starting with 1
+        """
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            return random.uniform(0, delay)
+        return delay
+
+    def __str__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"max_attempts={self.max_attempts}, "
+            f"backoff={self.backoff}, "
+            f"max_backoff={self.max_backoff})"
+        )
+
+
+def applied_response(
+    operation: str,
+    response_cls: Type[Response],
+    status: PaymentStatusResponse,
+) -> Optional[Response]:
+    """Build the operation response if the status shows it was applied.
+
+    :return: response built from the verified status response, or None if
+      the operation has not been applied
+    """
+    if status.payment_status not in APPLIED_STATUSES.get(operation, ()):
+        return None
+
+    return response_cls(  # type: ignore
+        status.pay_id,
+        status.dttm,
+        status.result_code,
+        status.result_message,
+        payment_status=status.payment_status,
+        status_detail=status.status_detail,
+    )
@@ -0,0 +1,259 @@
+"""Batch settlement (closing) of authorized payments.
+
+`SettlementRunner` closes payments from a stream of `(pay_id, total_amount)`
+rows concurrently and records its progress in a journal, a JSON Lines file
+with a line per event:
+
+.. code-block:: json
+
+    {"pay_id": "abc", "state": "started"}
+    {"pay_id": "abc", "state": "done", "status": 7, "code": 0}
+
+A restarted runner skips the payments which are done. A payment started
+but not done (the process crashed, or the call failed without an API
+result) may have been closed already, so its status is checked first and
+it is closed only if it is not.
+
+The calls are limited by the client: configure `rate_limiter` (and
+`retry`) on the `APIClient`.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from typing import (
+    IO,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .api import APIClient
+from .bulk import BulkResult, Concurrency, run_bounded
+from .errors import APIError
+from .response.base import PaymentStatus, get_payment_status
+from .response.payment_close import PaymentCloseResponse
+from .retry import applied_response
+
+_LOG = logging.getLogger(__name__)
+
+#: journal states
+STARTED = "started"
+DONE = "done"
+FAILED = "failed"
+
+
+class SettlementSummary:
+    """Summary of a settlement.
+
+    Includes the payments done by the previous runs of the same journal.
+    """
+
+    def __init__(self) -> None:
+        #: closed payments per their payment status
+        self.statuses: "Counter[PaymentStatus]" = Counter()
+        #: payments rejected by the API per the error code
+        self.error_codes: "Counter[int]" = Counter()
+        #: payments failed without an API result (e.g. HTTP errors). They
+        #: are retried by the next run
+        self.failed = 0
+        #: payments done by the previous runs
+        self.resumed = 0
+
+    @property
+    def total(self) -> int:
+        """Return number of payments processed."""
+        return (
+            sum(self.statuses.values())
+            + sum(self.error_codes.values())
+            + self.failed
+        )
+
+    def add(self, record: dict) -> None:
+        """Add the finished journal record."""
+        if record["state"] == FAILED:
+            self.failed += 1
+        elif record.get("status") is not None:
+            self.statuses[get_payment_status(record["status"])] += 1
+        else:
+            self.error_codes[record["code"]] += 1
+
+    def __str__(self) -> str:
+        statuses = ", ".join(
+            f"{status.name}={count}"
+            for status, count in sorted(
+                self.statuses.items(), key=lambda item: item[0].value
+            )
+        )
+        codes = ", ".join(
+            f"{code}={count}"
+            for code, count in sorted(self.error_codes.items())
+        )
+        return (
+            f"{self.__class__.__name__}(total={self.total}, "
+            f"statuses=[{statuses}], error_codes=[{codes}], "
+            f"failed={self.failed}, resumed={self.resumed})"
+        )
+
+
+class Journal:
+    """Append-only JSON Lines journal of the settlement progress.
+
+    Every record is flushed when written, so it survives a crash of the
+    process. With `fsync` it is also synced to the disk.
+    """
+
+    def __init__(self, path: str, fsync: bool = False) -> None:
+        self.path = path
+        self.fsync = fsync
+        self._file: Optional[IO[str]] = None
+        self._lock = threading.Lock()
+
+    def read(self) -> Dict[str, dict]:
+        """Return the last record of each payment in the journal."""
+        records: Dict[str, dict] = {}
+        try:
+            with open(self.path, encoding="utf8") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # the last line may be incomplete after a crash
+                        continue
+                    records[record["pay_id"]] = record
+        except FileNotFoundError:
+            pass
+        return records
+
+    def write(self, record: dict) -> None:
+        """Append the record."""
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                # pylint:disable=consider-using-with
+                self._file = open(self.path, "a", encoding="utf8")
+                if not self._ends_with_newline():
+                    # terminate the line left incomplete by a crash
+                    line = "\n" + line
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as file:
+            if not file.seek(0, os.SEEK_END):
+                return True
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b"\n"
+
+    def close(self) -> None:
+        """Close the journal file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class SettlementRunner:
+    """Closes payments concurrently, resuming from the journal."""
+
+    def __init__(
+        self,
+        client: APIClient,
+        journal: str,
+        concurrency: Concurrency = 8,
+        fsync: bool = False,
+    ) -> None:
+        """Init the runner.
+
+        :param journal: path of the journal file. Created if missing
+        :param concurrency: maximum number of payments closed at once, or an
+          `AdaptiveConcurrency`
+        :param fsync: whether to sync every journal record to the disk
+        """
+        self.client = client
+        self.journal = Journal(journal, fsync)
+        self.concurrency = concurrency
+
+    def run(
+        self, rows: Iterable[Tuple[str, Optional[int]]]
+    ) -> SettlementSummary:
+        """Close the payments.
+
+        :param rows: pay IDs and amounts to close the payments with (None
+          closes the authorized amount). Consumed lazily
+        :return: summary of the settlement, including the previous runs
+        """
+        summary = SettlementSummary()
+        unfinished: Set[str] = set()
+        done: Set[str] = set()
+        for pay_id, record in self.journal.read().items():
+            if record["state"] == DONE:
+                done.add(pay_id)
+                summary.add(record)
+            else:
+                unfinished.add(pay_id)
+        summary.resumed = len(done)
+        if done or unfinished:
+            _LOG.info(
+                "Resuming settlement: %s done, %s to check",
+                len(done),
+                len(unfinished),
+            )
+
+        amounts: Dict[str, Optional[int]] = {}
+
+        def pay_ids() -> Iterator[str]:
+            for pay_id, amount in rows:
+                if pay_id in done or pay_id in amounts:
+                    continue
+                amounts[pay_id] = amount
+                self.journal.write({"pay_id": pay_id, "state": STARTED})
+                yield pay_id
+
+        def close(pay_id: str) -> PaymentCloseResponse:
+            amount = amounts[pay_id]
+            if pay_id in unfinished:
+                response = self._closed_response(pay_id)
+                if response is not None:
+                    return response
+            return self.client.close_payment(pay_id, amount)
+
+        try:
+            for result in run_bounded(close, pay_ids(), self.concurrency):
+                record = self._record(result)
+                self.journal.write(record)
+                summary.add(record)
+        finally:
+            self.journal.close()
+        _LOG.info("Settlement finished: %s", summary)
+        return summary
+
+    def _closed_response(self, pay_id: str) -> Optional[PaymentCloseResponse]:
+        """Return the close response if the payment is closed already."""
+        # a cached status may predate the close
+        status = self.client.get_payment_status(pay_id, cached=False)
+        return applied_response(  # type: ignore
+            "payment/close", PaymentCloseResponse, status
+        )
+
+    @staticmethod
+    def _record(result: BulkResult) -> dict:
+        record = {"pay_id": result.pay_id, "state": DONE}
+        if result.ok:
+            status = result.response.payment_status
+            record["status"] = status.value if status else None
+            record["code"] = result.response.result_code
+        elif isinstance(result.error, APIError):
+            record["status"] = None
+            record["code"] = result.error.code
+        else:
+            record["state"] = FAILED
+            record["error"] = repr(result.error)
+        return record
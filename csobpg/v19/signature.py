@@ -4,12 +4,29 @@ import binascii
 import logging
 from abc import ABC, abstractmethod
 from base64 import b64decode, b64encode
-
-from Crypto.Hash import SHA256
-from Crypto.PublicKey import RSA
-from Crypto.Signature import PKCS1_v1_5
+from concurrent.futures import Executor
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from .errors import APIInvalidSignatureError
+from .key import RSAKey, key_text
+from .spec import Field, compile_fields
+
+if TYPE_CHECKING:
+    from Crypto.PublicKey.RSA import RsaKey
+
+# pycryptodome is imported on first use to keep the import of the package
+# fast.
+# pylint:disable=import-outside-toplevel
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,45 +38,139 @@ def _str_or_jsbool(val):
 
 
 class SignedModel(ABC):
-    """Signed model."""
+    """Signed model.
+
+    Declare the fields in `_fields` to compile `_get_params_sequence` and
+    the JSON serializer from them (see `csobpg.v19.spec`).
+    """
+
+    __slots__ = ()
+
+    #: fields in the order of the sign text
+    _fields: Tuple[Field, ...] = ()
+    #: name of the JSON serializer compiled from the fields
+    _json_method = "as_json"
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if "_fields" in cls.__dict__:
+            compile_fields(cls, cls._json_method)
 
-    @abstractmethod
     def _get_params_sequence(self) -> tuple:
-        """Return request parameters sequence."""
+        """Return request parameters sequence.
+
+        Compiled from `_fields`, override it in models without them. Nested
+        models may be returned as they are, they are written into the sign
+        text of this model in place.
+        """
+        raise TypeError(f"{type(self).__name__} has no fields")
+
+    def as_json(self) -> Any:
+        """Return model as JSON.
+
+        Compiled from `_fields`, override it in models without them.
+        """
+        raise TypeError(f"{type(self).__name__} has no fields")
 
     def to_sign_text(self) -> str:
         """Convert request to sign text.
 
         This text then will be used to sign the request.
         """
-        return "|".join(
-            map(
-                _str_or_jsbool,
-                [item for item in self._get_params_sequence() if item is not None],
-            )
-        )
+        return "|".join(self._write_sign_text([]))
+
+    def _write_sign_text(self, fields: List[str]) -> List[str]:
+        """Append the sign text fields to the list.
+
+        Fields of nested models are appended to the same list, so the sign
+        text is joined once. A nested model without fields is an empty field.
+        """
+        append = fields.append
+        for item in self._get_params_sequence():
+            if item is None:
+                continue
+            cls = type(item)
+            if cls is str:
+                append(item)
+            elif cls is bool:
+                append("true" if item else "false")
+            elif isinstance(item, SignedModel):
+                count = len(fields)
+                item._write_sign_text(fields)  # pylint:disable=W0212
+                if len(fields) == count:
+                    append("")
+            else:
+                append(_str_or_jsbool(item))
+        return fields
+
+
+class Signer(ABC):
+    """Signs and verifies texts with a key.
+
+    Pass a signer instead of a key to delegate signing and verification, e.g.
+    to worker processes (see `csobpg.v19.signer.ProcessPoolSigner`).
+    """
+
+    @abstractmethod
+    def sign(self, text: bytes) -> str:
+        """Sign the text."""
+
+    @abstractmethod
+    def verify(self, signature: str, text: bytes) -> None:
+        """Verify the signature of the text.
+
+        :raises APIInvalidSignatureError: if the signature is invalid
+        """
 
 
-def sign(text: bytes, key: str) -> str:
-    """Sign the text with the given key."""
+KeyType = Union[str, "RsaKey", RSAKey, Signer]
+
+
+def _import_key(key: KeyType) -> "RsaKey":
+    if isinstance(key, RSAKey):
+        return key.parsed
+    if isinstance(key, str):
+        from Crypto.PublicKey import RSA
+
+        return RSA.import_key(key)
+    return key  # type: ignore
+
+
+def sign(text: bytes, key: KeyType) -> str:
+    """Sign the text with the given key.
+
+    :param key: private key. Pass a parsed key (or an `RSAKey`, which caches
+      the parsed key) to avoid parsing the PEM on every call. A `Signer`
+      signs the text itself
+    """
     _LOGGER.debug('Signing "%s"', text)
-    key = RSA.importKey(key)  # type: ignore
+    if isinstance(key, Signer):
+        return key.sign(text)
+    from Crypto.Hash import SHA256
+    from Crypto.Signature import PKCS1_v1_5
+
     hasher = SHA256.new(text)
-    signer = PKCS1_v1_5.new(key)  # type: ignore
+    signer = PKCS1_v1_5.new(_import_key(key))
     return b64encode(signer.sign(hasher)).decode()
 
 
-def verify(signature: str, text: bytes, key: str) -> None:
+def verify(signature: str, text: bytes, key: KeyType) -> None:
     """Verify data.
 
     :param signature: signature to verify
     :param text: text to sign and verify against the signature
-    :param key: public key to verify the signature
+    :param key: public key to verify the signature. A `Signer` verifies the
+      signature itself
     """
     _LOGGER.debug('Verifying "%s" against "%s"', signature, text)
-    key = RSA.importKey(key)  # type: ignore
+    if isinstance(key, Signer):
+        key.verify(signature, text)
+        return
+    from Crypto.Hash import SHA256
+    from Crypto.Signature import PKCS1_v1_5
+
     hasher = SHA256.new(text)
-    verifier = PKCS1_v1_5.new(key)  # type: ignore
+    verifier = PKCS1_v1_5.new(_import_key(key))
 
     try:
         sig_as_bytes = b64decode(signature)
@@ -69,3 +180,72 @@ def verify(signature: str, text: bytes, key: str) -> None:
     # pylint:disable=not-callable
     if not verifier.verify(hasher, sig_as_bytes):
         raise APIInvalidSignatureError("Invalid signature")
+
+
+@lru_cache(maxsize=16)
+def _load_key(text: str) -> "RsaKey":
+    from Crypto.PublicKey import RSA
+
+    return RSA.import_key(text)
+
+
+def _is_valid(verifier, signature: str, text: bytes) -> bool:
+    from Crypto.Hash import SHA256
+
+    try:
+        sig_as_bytes = b64decode(signature)
+    except binascii.Error:
+        return False
+    return verifier.verify(SHA256.new(text), sig_as_bytes)
+
+
+def _verify_chunk(
+    key: Union[str, "RsaKey"], items: Sequence[Tuple[str, bytes]]
+) -> List[bool]:
+    from Crypto.Signature import PKCS1_v1_5
+
+    if isinstance(key, str):
+        key = _load_key(key)
+    verifier = PKCS1_v1_5.new(key)
+    return [_is_valid(verifier, signature, text) for signature, text in items]
+
+
+def _signer_verifies(signer: Signer, signature: str, text: bytes) -> bool:
+    try:
+        signer.verify(signature, text)
+    except APIInvalidSignatureError:
+        return False
+    return True
+
+
+def verify_many(
+    items: Iterable[Tuple[str, bytes]],
+    key: KeyType,
+    executor: Optional[Executor] = None,
+    chunk_size: int = 64,
+) -> List[bool]:
+    """Verify many signatures with one key.
+
+    Unlike `verify`, an invalid signature does not raise.
+
+    :param items: (signature, text) pairs
+    :param key: public key to verify the signatures. It is parsed once.
+      A `Signer` verifies each item itself
+    :param executor: executor (e.g. `ProcessPoolExecutor`) to verify chunks
+      of items in. Items are verified in the current thread if not provided
+    :param chunk_size: number of items per executor task
+    :return: whether each signature is valid, in the order of the items
+    """
+    items = list(items)
+    _LOGGER.debug("Verifying %d signatures", len(items))
+    if isinstance(key, Signer):
+        return [_signer_verifies(key, sig, text) for sig, text in items]
+    if executor is None:
+        return _verify_chunk(_import_key(key), items)
+
+    text = key_text(key)
+    futures = [
+        executor.submit(_verify_chunk, text, items[i : i + chunk_size])
+        for i in range(0, len(items), chunk_size)
+    ]
+    return [valid for future in futures for valid in future.result()]
@@ -0,0 +1,84 @@
+"""Signing and verification in worker processes.
+
+RSA signing holds the GIL, so a single process signs on one core only. A
+`ProcessPoolSigner` hands signing (or verification) off to a pool of worker
+processes, each of which keeps the parsed key loaded. Pass it instead of a
+key; requests and responses use it transparently:
+
+.. code-block:: python
+
+    with ProcessPoolExecutor() as pool:
+        client = APIClient(
+            "merchantId",
+            ProcessPoolSigner(RAMRSAKey("merchant.key"), pool),
+            ProcessPoolSigner(RAMRSAKey("gateway.pub"), pool),
+        )
+        client.get_payment_statuses(pay_ids, concurrency=16)
+
+Throughput scales with the number of worker processes as long as enough
+calls sign concurrently, e.g. bulk operations or several client threads.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Optional, Union
+
+from .key import RSAKey, key_text
+from .signature import Signer, _load_key, sign, verify
+
+if TYPE_CHECKING:
+    from Crypto.PublicKey.RSA import RsaKey
+
+
+def _sign(pem: str, text: bytes) -> str:
+    return sign(text, _load_key(pem))
+
+
+def _verify(pem: str, signature: str, text: bytes) -> None:
+    verify(signature, text, _load_key(pem))
+
+
+class ProcessPoolSigner(Signer):
+    """Signer running in a pool of worker processes."""
+
+    def __init__(
+        self,
+        key: Union[str, "RsaKey", RSAKey],
+        executor: Optional[ProcessPoolExecutor] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        """Init the signer.
+
+        :param key: private key to sign with or public key to verify with
+        :param executor: process pool to run in. Share one pool between the
+          private and the public key signers. If not provided, a pool is
+          created and `close()` shuts it down
+        :param max_workers: number of processes of the created pool.
+          Defaults to the number of CPUs
+        """
+        self.key = key
+        self._own_executor = executor is None
+        self._executor = executor or ProcessPoolExecutor(max_workers)
+
+    def sign(self, text: bytes) -> str:
+        """Sign the text in a worker process."""
+        return self._executor.submit(_sign, key_text(self.key), text).result()
+
+    def verify(self, signature: str, text: bytes) -> None:
+        """Verify the signature of the text in a worker process.
+
+        :raises APIInvalidSignatureError: if the signature is invalid
+        """
+        self._executor.submit(
+            _verify, key_text(self.key), signature, text
+        ).result()
+
+    def close(self) -> None:
+        """Shut down the pool if it was created by the signer."""
+        if self._own_executor:
+            self._executor.shutdown()
+
+    def __enter__(self) -> "ProcessPoolSigner":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
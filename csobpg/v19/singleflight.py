@@ -0,0 +1,121 @@
+"""Coalescing of identical concurrent calls.
+
+While a call with a key is in flight, other calls with the same key do not
+run but wait for it and share its result, or its error:
+
+.. code-block:: python
+
+    flights = SingleFlight()
+    status = flights.do(("payment/status", pay_id), fetch_status)
+
+`SingleFlight` coalesces calls from threads, `AsyncSingleFlight` from
+coroutines of an event loop.
+"""
+
+import threading
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Optional,
+)
+
+if TYPE_CHECKING:
+    from asyncio import Future
+
+
+class _Flight:
+    """Call in flight."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces identical calls from threads."""
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Call the function unless a call with the key is in flight.
+
+        :return: result of the function or of the call in flight
+        :raises: error of the function or of the call in flight
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def __len__(self) -> int:
+        """Return number of calls in flight."""
+        return len(self._flights)
+
+
+class AsyncSingleFlight:
+    """Coalesces identical calls from coroutines.
+
+    The call runs in a task, so cancelling one of the waiting coroutines
+    does not cancel the call for the others.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, "Future[Any]"] = {}
+
+    async def do(
+        self, key: Hashable, func: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Await the function unless a call with the key is in flight.
+
+        :return: result of the function or of the call in flight
+        :raises: error of the function or of the call in flight
+        """
+        # imported here to keep asyncio out of the package import, the caller
+        # runs an event loop already
+        import asyncio  # pylint:disable=import-outside-toplevel
+
+        flight = self._flights.get(key)
+        if flight is None or flight.get_loop() is not (
+            asyncio.get_running_loop()
+        ):
+            flight = asyncio.ensure_future(func())
+            self._flights[key] = flight
+            flight.add_done_callback(partial(self._remove, key))
+        return await asyncio.shield(flight)
+
+    def _remove(self, key: Hashable, flight: "Future[Any]") -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            # the error is retrieved by the waiters, if there are any
+            flight.exception()
+
+    def __len__(self) -> int:
+        """Return number of calls in flight."""
+        return len(self._flights)
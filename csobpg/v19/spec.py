@@ -0,0 +1,118 @@
+"""Declarative field specs of signed models.
+
+A signed model lists its fields in `_fields`, in the order of its sign
+text. When the class is created, the spec is compiled into the
+`_get_params_sequence` method and the JSON serializer of the class, so the
+sign text and JSON are built from the same fields in the same order:
+
+.. code-block:: python
+
+    class PaymentCloseRequest(BaseRequest):
+        _fields = (
+            Field("merchant_id", "merchantId"),
+            Field("pay_id", "payId"),
+            Field("dttm", "dttm"),
+            Field("total_amount", "totalAmount"),
+        )
+
+Fields which are None are skipped in both the sign text and JSON.
+"""
+
+from enum import Enum
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+class Field(NamedTuple):
+    """Field of a signed model."""
+
+    #: attribute, or a dotted path of attributes, e.g. "delivery.mode"
+    attr: str
+    #: JSON key. The field is only signed if not set
+    key: Optional[str] = None
+    #: converts the value for both the sign text and JSON
+    convert: Optional[Callable[[Any], Any]] = None
+    #: the value is a signed model. It is signed in place and serialized with
+    #: its `as_json()`
+    nested: bool = False
+
+
+def enum_value(value: Enum) -> Any:
+    """Return value of the enum member."""
+    return value.value
+
+
+def _getter(field: Field, index: int) -> List[str]:
+    """Return lines assigning the converted field value to `v`."""
+    names = field.attr.split(".")
+    lines = [f"v = self.{names[0]}"]
+    lines.extend(
+        f"v = v.{name} if v is not None else None" for name in names[1:]
+    )
+    if field.convert is enum_value:
+        lines.append("v = v.value if v is not None else None")
+    elif field.convert:
+        lines.append(f"v = _convert{index}(v) if v is not None else None")
+    return lines
+
+
+def _is_plain(field: Field) -> bool:
+    return "." not in field.attr and field.convert is None
+
+
+def _params_sequence_source(fields: tuple) -> List[str]:
+    lines = ["def _get_params_sequence(self):"]
+    items = []
+    for index, field in enumerate(fields):
+        if _is_plain(field):
+            items.append(f"self.{field.attr}")
+        else:
+            lines.extend(f"    {line}" for line in _getter(field, index))
+            lines.append(f"    v{index} = v")
+            items.append(f"v{index}")
+    lines.append(f"    return ({''.join(f'{item}, ' for item in items)})")
+    return lines
+
+
+def _as_json_source(name: str, fields: tuple) -> List[str]:
+    lines = [f"def {name}(self):", "    body = {}"]
+    for index, field in enumerate(fields):
+        if field.key is None:
+            continue
+        lines.extend(f"    {line}" for line in _getter(field, index))
+        value = "v.as_json()" if field.nested else "v"
+        lines.append("    if v is not None:")
+        lines.append(f"        body[{field.key!r}] = {value}")
+    lines.append("    return body")
+    return lines
+
+
+def _compile(cls: type, name: str, source: List[str], namespace: dict):
+    exec("\n".join(source), namespace)  # pylint:disable=exec-used
+    func = namespace[name]
+    func.__qualname__ = f"{cls.__qualname__}.{name}"
+    func.__module__ = cls.__module__
+    return func
+
+
+def compile_fields(cls: type, json_method: str) -> None:
+    """Compile the field spec of the class into its methods.
+
+    Sets `_get_params_sequence` and the JSON serializer named `json_method`.
+    """
+    fields = cls._fields  # type: ignore
+    namespace: Dict[str, Any] = {
+        f"_convert{index}": field.convert
+        for index, field in enumerate(fields)
+        if field.convert
+    }
+    cls._get_params_sequence = _compile(  # type: ignore
+        cls,
+        "_get_params_sequence",
+        _params_sequence_source(fields),
+        namespace,
+    )
+    serializer = _compile(
+        cls, json_method, _as_json_source(json_method, fields), namespace
+    )
+    serializer.__doc__ = f"Return {cls.__name__} as JSON."
+    setattr(cls, json_method, serializer)
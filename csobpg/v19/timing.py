@@ -0,0 +1,198 @@
+"""Per-call timing instrumentation.
+
+Install a timing hook to get a `CallTiming` record for each API call:
+
+.. code-block:: python
+
+    histogram = HistogramAggregator()
+    client = APIClient(..., timing_hooks=[histogram])
+    ...
+    print(histogram.summary())
+
+Calls are not timed at all if no hook is installed.
+"""
+
+import bisect
+import json as jsonlib
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+#: phases of a call
+PHASES = ("build", "sign", "http", "verify")
+
+
+class CallTiming:
+    """Timing record of a single API call (attempt).
+
+    Phase durations are in seconds:
+
+    * build: building the request (without signing)
+    * sign: signing the request
+    * http: HTTP request, including waiting for the response
+    * verify: parsing the response and verifying its signature
+    """
+
+    def __init__(self, operation: str, http_method: str) -> None:
+        self.operation = operation
+        self.http_method = http_method
+        self.result_code: Optional[int] = None
+        self.error: Optional[Exception] = None
+        self.build = 0.0
+        self.sign = 0.0
+        self.http = 0.0
+        self.verify = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    @property
+    def total(self) -> float:
+        """Return total duration in seconds."""
+        return self.build + self.sign + self.http + self.verify
+
+    def set_request(self, endpoint: str, body: Optional[dict]) -> None:
+        """Set request size.
+
+        It is the size of the JSON body, or of the endpoint for requests
+        without a body (their parameters are in the URL).
+        """
+        self.request_bytes = (
+            len(jsonlib.dumps(body).encode()) if body else len(endpoint)
+        )
+
+    def set_result_code(self, data: dict) -> None:
+        """Set result code from the response data."""
+        try:
+            self.result_code = int(data["resultCode"])
+        except (KeyError, TypeError, ValueError):
+            self.result_code = None
+
+    def __str__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"operation='{self.operation}', "
+            f"result_code={self.result_code}, "
+            f"error={self.error!r}, "
+            f"build={self.build:.6f}, "
+            f"sign={self.sign:.6f}, "
+            f"http={self.http:.6f}, "
+            f"verify={self.verify:.6f}, "
+            f"request_bytes={self.request_bytes}, "
+            f"response_bytes={self.response_bytes}"
+            ")"
+        )
+
+
+#: timing hook. Called with the record once the call finishes (or fails)
+TimingHook = Callable[[CallTiming], None]
+
+
+def _default_bounds() -> Tuple[float, ...]:
+    # 50 microseconds to ~105 seconds, doubling
+    return tuple(0.00005 * 2**i for i in range(22))
+
+
+class _Histogram:
+    """Histogram of durations."""
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, quantile: float) -> float:
+        """Return upper bound of the bucket containing the quantile."""
+        if not self.count:
+            return 0.0
+        rank = quantile * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                if i == len(self.bounds):
+                    break
+                return min(self.bounds[i], self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+
+class HistogramAggregator:
+    """Timing hook aggregating phase durations into histograms.
+
+    Histograms are kept per operation and phase (see `PHASES`, plus "total").
+    Buckets double in size, so percentiles are approximate (the upper bound
+    of the bucket is reported). The aggregator is thread-safe.
+    """
+
+    def __init__(self, bounds: Optional[Tuple[float, ...]] = None) -> None:
+        """Init the aggregator.
+
+        :param bounds: ascending upper bounds of the buckets in seconds
+        """
+        self._bounds = tuple(bounds or _default_bounds())
+        self._histograms: Dict[Tuple[str, str], _Histogram] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, timing: CallTiming) -> None:
+        values: List[Tuple[str, float]] = [
+            (phase, getattr(timing, phase)) for phase in PHASES
+        ]
+        values.append(("total", timing.total))
+        with self._lock:
+            for phase, value in values:
+                key = (timing.operation, phase)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = _Histogram(
+                        self._bounds
+                    )
+                histogram.add(value)
+            if timing.error is not None:
+                self._errors[timing.operation] = (
+                    self._errors.get(timing.operation, 0) + 1
+                )
+
+    def percentile(self, operation: str, phase: str, quantile: float) -> float:
+        """Return approximate percentile of the phase duration in seconds.
+
+        :param quantile: e.g. 0.99 for the 99th percentile
+        """
+        with self._lock:
+            histogram = self._histograms.get((operation, phase))
+            return histogram.percentile(quantile) if histogram else 0.0
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Return count, mean, p50, p90, p99 and max per operation and phase.
+
+        Failed calls are counted in the "errors" entry of the operation.
+        """
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        with self._lock:
+            for (operation, phase), histogram in self._histograms.items():
+                result.setdefault(operation, {})[phase] = histogram.summary()
+            for operation, errors in self._errors.items():
+                result[operation]["errors"] = {"count": errors}
+        return result
+
+    def reset(self) -> None:
+        """Drop the collected data."""
+        with self._lock:
+            self._histograms.clear()
+            self._errors.clear()
@@ -0,0 +1,14 @@
+"""HTTP transports.
+
+The synchronous `APIClient` accepts any `httprest` HTTP client. The
+`AsyncAPIClient` accepts any `AsyncHTTPClient`.
+"""
+
+from .aio import AsyncHTTPClient, ExecutorAsyncHTTPClient
+from .pool import PooledHTTPClient
+
+__all__ = [
+    "AsyncHTTPClient",
+    "ExecutorAsyncHTTPClient",
+    "PooledHTTPClient",
+]
@@ -0,0 +1,74 @@
+"""Asynchronous HTTP clients."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from functools import partial
+from typing import Optional
+
+from httprest.http import HTTPClient, HTTPResponse
+from httprest.http.urllib_client import UrllibHTTPClient
+
+
+class AsyncHTTPClient(ABC):
+    """Base asynchronous HTTP client."""
+
+    @abstractmethod
+    async def request(
+        self,
+        method: str,
+        url: str,
+        json: Optional[dict] = None,
+        headers: Optional[dict] = None,
+    ) -> HTTPResponse:
+        """Perform HTTP request with a given HTTP method.
+
+        The client must raise `httprest.http.errors.HTTPRequestError` (or
+        its subclasses) on any HTTP error.
+        """
+
+    async def close(self) -> None:
+        """Release the client resources."""
+
+
+class ExecutorAsyncHTTPClient(AsyncHTTPClient):
+    """Asynchronous adapter for a synchronous `httprest` HTTP client.
+
+    Each request is run in the executor, so it does not block the event loop.
+    """
+
+    def __init__(
+        self,
+        http_client: Optional[HTTPClient] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """Init the client.
+
+        :param http_client: synchronous HTTP client. `UrllibHTTPClient` is
+          used by default
+        :param executor: executor to run the requests in. The event loop's
+          default executor is used if not provided
+        """
+        self._http_client = http_client or UrllibHTTPClient()
+        self._executor = executor
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        json: Optional[dict] = None,
+        headers: Optional[dict] = None,
+    ) -> HTTPResponse:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            partial(
+                self._http_client.request,
+                method,
+                url,
+                json=json,
+                headers=headers,
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}({self._http_client})"
@@ -0,0 +1,76 @@
+"""Asynchronous HTTP client which uses `aiohttp` under the hood.
+
+The `aiohttp` package must be installed to use this module.
+"""
+
+import asyncio
+from typing import Optional
+
+import aiohttp
+from httprest.http import HTTPResponse, Timeout
+from httprest.http import errors as _errors
+
+from .aio import AsyncHTTPClient
+
+
+class AiohttpHTTPClient(AsyncHTTPClient):
+    """`aiohttp` HTTP client.
+
+    The session (and thus its connection pool) is reused between requests.
+    """
+
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        timeout: Optional[Timeout] = None,
+    ) -> None:
+        """Init the client.
+
+        :param session: session to use. If not provided, it will be created
+          on the first request and closed by `close()`
+        :param timeout: request timeout
+        """
+        self._session = session
+        self._owns_session = session is None
+        self._timeout = aiohttp.ClientTimeout(
+            sock_connect=timeout.connect if timeout else None,
+            sock_read=timeout.read if timeout else None,
+        )
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        json: Optional[dict] = None,
+        headers: Optional[dict] = None,
+    ) -> HTTPResponse:
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+
+        try:
+            async with self._session.request(
+                method.upper(),
+                url,
+                json=json,
+                headers=headers,
+                timeout=self._timeout,
+            ) as response:
+                return HTTPResponse(
+                    response.status,
+                    await response.read(),
+                    dict(response.headers),
+                )
+        except asyncio.TimeoutError as exc:
+            raise _errors.HTTPTimeoutError(exc) from exc
+        except aiohttp.ClientConnectionError as exc:
+            raise _errors.HTTPConnectionError(exc) from exc
+        except aiohttp.ClientError as exc:
+            raise _errors.HTTPRequestError(exc) from exc
+
+    async def close(self) -> None:
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def __str__(self) -> str:
+        return self.__class__.__name__
@@ -0,0 +1,283 @@
+"""HTTP client with a pool of keep-alive connections."""
+
+import http.client
+import json as _jsonlib
+import select
+import socket
+import ssl
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from httprest.http import HTTPClient, HTTPResponse, Timeout
+from httprest.http import errors as _errors
+from httprest.http.cert import ClientCertificate
+
+_HostKey = Tuple[str, str, int]
+
+# errors meaning that the server closed an idle keep-alive connection
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError,
+    ssl.SSLEOFError,
+    ssl.SSLZeroReturnError,
+)
+
+# methods which may be sent again if the response was lost
+_IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+def _is_dropped(conn: http.client.HTTPConnection) -> bool:
+    """Return whether the idle connection was closed by the server."""
+    if conn.sock is None:
+        return True
+    # an idle connection is readable only if the server closed it
+    poller = select.poll()
+    try:
+        poller.register(conn.sock, select.POLLIN)
+        return bool(poller.poll(0))
+    except (OSError, ValueError):
+        return True
+
+
+class _HostPool:
+    """Connections to a single host."""
+
+    def __init__(self, max_connections: int) -> None:
+        self.idle: Deque[http.client.HTTPConnection] = deque()
+        self.slots = threading.BoundedSemaphore(max_connections)
+        self.tls_session: Optional[ssl.SSLSession] = None
+
+
+class _HTTPSConnection(http.client.HTTPSConnection):
+    """HTTPS connection resuming the TLS session of the host."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float],
+        context: ssl.SSLContext,
+        pool: _HostPool,
+    ) -> None:
+        # pylint:disable=too-many-arguments
+        super().__init__(host, port, timeout=timeout, context=context)
+        self._pool = pool
+
+    def connect(self) -> None:
+        # pylint:disable=attribute-defined-outside-init
+        http.client.HTTPConnection.connect(self)
+        self.sock = self._context.wrap_socket(  # type: ignore
+            self.sock,
+            server_hostname=self.host,
+            session=self._pool.tls_session,
+        )
+
+
+class PooledHTTPClient(HTTPClient):
+    """HTTP client which keeps connections alive and reuses them.
+
+    Connections are pooled per host. For HTTPS, TLS sessions are resumed
+    when new connections to the same host are opened. The client is
+    thread-safe.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[Timeout] = None,
+        pool_size: int = 10,
+        max_connections_per_host: int = 10,
+        keep_alive: bool = True,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        tls_session_reuse: bool = True,
+    ) -> None:
+        """Init the client.
+
+        :param timeout: connect and read timeouts
+        :param pool_size: maximum number of idle connections kept per host
+        :param max_connections_per_host: maximum number of connections opened
+          to a single host at a time. Requests over the limit wait for a free
+          connection
+        :param keep_alive: whether to keep connections alive between requests
+        :param ssl_context: SSL context for HTTPS connections. The default
+          context is used if not provided
+        :param tls_session_reuse: whether to resume TLS sessions
+        """
+        # pylint:disable=too-many-arguments
+        if pool_size < 0:
+            raise ValueError('"pool_size" must be >= 0')
+        if max_connections_per_host < 1:
+            raise ValueError('"max_connections_per_host" must be >= 1')
+
+        super().__init__(timeout)
+        self._pool_size = pool_size
+        self._max_connections_per_host = max_connections_per_host
+        self._keep_alive = keep_alive
+        self._ssl_context = ssl_context or ssl.create_default_context()
+        self._tls_session_reuse = tls_session_reuse
+        self._pools: Dict[_HostKey, _HostPool] = {}
+        self._lock = threading.Lock()
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        json: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        cert: Optional[ClientCertificate] = None,
+    ) -> HTTPResponse:
+        # pylint:disable=too-many-arguments
+        if cert:
+            raise NotImplementedError(
+                "Client side certificates are not supported"
+            )
+
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise _errors.HTTPRequestError(f"Unsupported URL: {url}")
+
+        key = (
+            parts.scheme,
+            parts.hostname,
+            parts.port or (443 if parts.scheme == "https" else 80),
+        )
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        headers = dict(headers or {})
+        headers["Connection"] = "keep-alive" if self._keep_alive else "close"
+        body = None
+        if json:
+            headers["Content-Type"] = "application/json"
+            body = _jsonlib.dumps(json).encode()
+
+        pool = self._get_pool(key)
+        pool.slots.acquire()  # pylint:disable=consider-using-with
+        try:
+            return self._send(key, pool, method.upper(), path, body, headers)
+        finally:
+            pool.slots.release()
+
+    def _send(
+        self,
+        key: _HostKey,
+        pool: _HostPool,
+        method: str,
+        path: str,
+        body: Optional[bytes],
+        headers: dict,
+    ) -> HTTPResponse:
+        # pylint:disable=too-many-arguments
+        while True:
+            conn, reused = self._checkout(key, pool)
+            sent = False
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                sent = True
+                response = conn.getresponse()
+                result = HTTPResponse(
+                    response.status, response.read(), dict(response.headers)
+                )
+            except _STALE_CONNECTION_ERRORS as exc:
+                conn.close()
+                # once sent, the request may have been processed before the
+                # connection was lost, so only idempotent requests are sent
+                # again. The rest is left to the caller's retry policy
+                if reused and (not sent or method in _IDEMPOTENT_METHODS):
+                    continue
+                raise _errors.HTTPConnectionError(exc) from exc
+            except (TimeoutError, socket.timeout) as exc:
+                conn.close()
+                raise _errors.HTTPTimeoutError(exc) from exc
+            except (ConnectionError, ssl.SSLError, OSError) as exc:
+                conn.close()
+                raise _errors.HTTPConnectionError(exc) from exc
+            except http.client.HTTPException as exc:
+                conn.close()
+                raise _errors.HTTPRequestError(exc) from exc
+
+            self._checkin(pool, conn, keep=not response.will_close)
+            return result
+
+    def _get_pool(self, key: _HostKey) -> _HostPool:
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = _HostPool(
+                    self._max_connections_per_host
+                )
+            return pool
+
+    def _checkout(
+        self, key: _HostKey, pool: _HostPool
+    ) -> Tuple[http.client.HTTPConnection, bool]:
+        while True:
+            with self._lock:
+                if not pool.idle:
+                    break
+                conn = pool.idle.pop()
+            if not _is_dropped(conn):
+                return conn, True
+            conn.close()
+
+        scheme, host, port = key
+        connect_timeout = self._timeout.connect if self._timeout else None
+        conn: http.client.HTTPConnection
+        if scheme == "https":
+            conn = _HTTPSConnection(
+                host, port, connect_timeout, self._ssl_context, pool
+            )
+        else:
+            conn = http.client.HTTPConnection(
+                host, port, timeout=connect_timeout
+            )
+
+        try:
+            conn.connect()
+        except (TimeoutError, socket.timeout) as exc:
+            raise _errors.HTTPTimeoutError(exc) from exc
+        except (ConnectionError, ssl.SSLError, OSError) as exc:
+            raise _errors.HTTPConnectionError(exc) from exc
+
+        if self._timeout and self._timeout.read is not None:
+            conn.sock.settimeout(self._timeout.read)
+        return conn, False
+
+    def _checkin(
+        self, pool: _HostPool, conn: http.client.HTTPConnection, keep: bool
+    ) -> None:
+        if self._tls_session_reuse and isinstance(conn.sock, ssl.SSLSocket):
+            # TLS 1.3 session tickets are sent after the handshake, so the
+            # session is taken once a response has been read
+            pool.tls_session = conn.sock.session
+
+        with self._lock:
+            if keep and self._keep_alive and len(pool.idle) < self._pool_size:
+                pool.idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            pools = list(self._pools.values())
+            for pool in pools:
+                while pool.idle:
+                    pool.idle.pop().close()
+
+    def __enter__(self) -> "PooledHTTPClient":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __str__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"pool_size={self._pool_size}, "
+            f"max_connections_per_host={self._max_connections_per_host}"
+            ")"
+        )
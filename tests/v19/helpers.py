@@ -0,0 +1,41 @@
+"""Helpers of the tests using the mock gateway."""
+
+from typing import List
+
+from csobpg.v19.api import APIClient
+from csobpg.v19.key import RAMRSAKey
+from csobpg.v19.mock import MockGateway, MockHTTPClient
+from csobpg.v19.mock.server import BASE_PATH
+
+PRIVATE_KEY = RAMRSAKey("tests/v19/data/merchant.key")
+PUBLIC_KEY = RAMRSAKey("tests/v19/data/merchant.pub")
+GATEWAY_KEY = RAMRSAKey("tests/keys/key.key")
+
+
+class CountingHTTPClient(MockHTTPClient):
+    """Mock HTTP client recording the methods of the requests."""
+
+    def __init__(self, gateway: MockGateway) -> None:
+        super().__init__(gateway)
+        self.methods: List[str] = []
+
+    def _request(self, method: str, url: str, *args, **kwargs):
+        self.methods.append(method)
+        return super()._request(method, url, *args, **kwargs)
+
+
+def mock_gateway(**kwargs) -> MockGateway:
+    """Return a mock gateway of the test keys."""
+    return MockGateway(PUBLIC_KEY, GATEWAY_KEY, seed=1, **kwargs)
+
+
+def mock_client(http_client: MockHTTPClient, **kwargs) -> APIClient:
+    """Return a client of the mock gateway."""
+    return APIClient(
+        "mid",
+        PRIVATE_KEY,
+        GATEWAY_KEY,
+        base_url=f"http://mock{BASE_PATH}",
+        http_client=http_client,
+        **kwargs,
+    )
@@ -3,6 +3,7 @@
 import pytest
 
 from csobpg.v19.models import order
+from csobpg.v19.models.currency import Currency
 
 
 @pytest.mark.parametrize(
@@ -17,3 +18,19 @@ def test_gift_cards_invalid_quantity(quantity: int):
     """Test invalid quantity arg for the GiftCardsData."""
     with pytest.raises(ValueError):
         order.GiftCardsData(quantity=quantity)
+
+
+def test_order_sign_text():
+    """Test the order sign text with nested models."""
+    data = order.OrderData(
+        order.OrderType.PURCHASE,
+        delivery=order.DeliveryData(email="a@b.cz"),
+        name_match=True,
+        billing=order.AddressData("address", "CZE", "city", "zip"),
+        gift_cards=order.GiftCardsData(100, Currency.CZK, 2),
+    )
+
+    assert (
+        data.to_sign_text()
+        == "purchase|a@b.cz|true|address|city|zip|CZE|100|CZK|2"
+    )
@@ -0,0 +1,38 @@
+"""Tests for base request."""
+
+from unittest import mock
+
+from csobpg.v19.key import RAMRSAKey
+from csobpg.v19.request import PaymentCloseRequest, PaymentStatusRequest
+from csobpg.v19.signature import verify
+
+_PRIVATE_KEY = RAMRSAKey("tests/v19/data/merchant.key")
+_PUBLIC_KEY = RAMRSAKey("tests/v19/data/merchant.pub")
+
+
+def test_signature_cached():
+    """Test that the signature is computed once per sign text."""
+    with mock.patch(
+        "csobpg.v19.request.base.sign", return_value="sig"
+    ) as sign:
+        request = PaymentStatusRequest("mid", _PRIVATE_KEY, "payId")
+        assert request.to_json()["signature"] == "sig"  # type: ignore
+        assert request.signature == "sig"
+
+    sign.assert_called_once_with(request.to_sign_text().encode(), _PRIVATE_KEY)
+
+
+def test_signature_invalidated():
+    """Test that the signature is rebuilt when a signed field changes."""
+    request = PaymentCloseRequest("mid", _PRIVATE_KEY, "payId", 100)
+    signature = request.signature
+
+    request.total_amount = 50
+    assert request.signature != signature
+    verify(request.signature, request.to_sign_text().encode(), _PUBLIC_KEY)
+
+    signature = request.signature
+    other_key = RAMRSAKey("tests/keys/key.key")
+    request.private_key = other_key
+    assert request.signature != signature
+    verify(request.signature, request.to_sign_text().encode(), other_key)
@@ -416,6 +416,33 @@ def test_process_gateway_return():
     assert not comps.http_client.history
 
 
+def test_verify_gateway_returns():
+    """Test for the gateway returns verification."""
+    resp = PaymentProcessResponse(
+        "pid", "20240919164156", 0, "", PaymentStatus.CONFIRMED
+    )
+    valid = {
+        "payId": resp.pay_id,
+        "dttm": resp.dttm,
+        "resultCode": "0",
+        "resultMessage": "",
+        "paymentStatus": "4",
+        "signature": sign(resp.to_sign_text().encode(), _PRIVATE_KEY),
+    }
+    comps = _Components.compose()
+
+    assert comps.api.verify_gateway_returns(
+        [
+            valid,
+            {**valid, "paymentStatus": "5"},
+            {**valid, "signature": "invalid"},
+            {**valid, "paymentStatus": "x"},
+            {key: value for key, value in valid.items() if key != "payId"},
+            valid,
+        ]
+    ) == [True, False, False, False, False, True]
+
+
 @freeze_time("1955-11-12")
 def test_oneclick_init_payment():
     """Test for the oneclick payment init."""
@@ -577,3 +604,41 @@ def test_oneclick_echo():
             "cert": None,
         },
     ]
+
+
+def test_get_payment_statuses():
+    """Test for the bulk payment statuses get."""
+    resp = PaymentStatusResponse(
+        "pid", "20240919164156", 0, "", PaymentStatus.IN_PROGRESS
+    )
+    resp_json = {
+        "payId": resp.pay_id,
+        "dttm": resp.dttm,
+        "resultCode": resp.result_code,
+        "resultMessage": resp.result_message,
+        "paymentStatus": resp.payment_status.value,  # type: ignore
+        "signature": sign(resp.to_sign_text().encode(), str(_PRIVATE_KEY)),
+    }
+    comps = _Components.compose(
+        http_client=FakeHTTPClient(
+            responses=[
+                HTTPResponse(
+                    200,
+                    jsonlib.dumps(resp_json).encode(),
+                    headers={"Content-Type": "application/json"},
+                ),
+                HTTPResponse(
+                    200,
+                    jsonlib.dumps({"resultCode": 140}).encode(),
+                    headers={"Content-Type": "application/json"},
+                ),
+            ]
+        )
+    )
+
+    results = list(comps.api.get_payment_statuses(["pid1", "pid2"], 1))
+
+    assert results[0].pay_id == "pid1"
+    assert results[0].response.payment_status == PaymentStatus.IN_PROGRESS
+    assert results[1].pay_id == "pid2"
+    assert isinstance(results[1].error, APIError)
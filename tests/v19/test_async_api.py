@@ -0,0 +1,143 @@
+"""Tests for the asynchronous api."""
+
+import asyncio
+import json as jsonlib
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from freezegun import freeze_time
+from httprest.http.fake_client import FakeHTTPClient, HTTPResponse
+
+from csobpg.v19.async_api import AsyncAPIClient
+from csobpg.v19.errors import APIError
+from csobpg.v19.key import RAMRSAKey
+from csobpg.v19.response import PaymentStatus, PaymentStatusResponse
+from csobpg.v19.signature import sign
+from csobpg.v19.transport import ExecutorAsyncHTTPClient
+
+_PRIVATE_KEY = RAMRSAKey("tests/v19/data/merchant.key")
+_PUBLIC_KEY = RAMRSAKey("tests/v19/data/merchant.pub")
+
+
+def _status_response_json() -> dict:
+    resp = PaymentStatusResponse(
+        "pid", "20240919164156", 0, "", PaymentStatus.IN_PROGRESS
+    )
+    return {
+        "payId": resp.pay_id,
+        "dttm": resp.dttm,
+        "resultCode": resp.result_code,
+        "resultMessage": resp.result_message,
+        "paymentStatus": resp.payment_status.value,  # type: ignore
+        "signature": sign(resp.to_sign_text().encode(), _PRIVATE_KEY),
+    }
+
+
+def _json_response(data: dict, status: int = 200) -> HTTPResponse:
+    return HTTPResponse(
+        status,
+        jsonlib.dumps(data).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+
+
+def _client(http_client: FakeHTTPClient, **kwargs) -> AsyncAPIClient:
+    return AsyncAPIClient(
+        "mid",
+        _PRIVATE_KEY,
+        _PUBLIC_KEY,
+        "https://api.com",
+        ExecutorAsyncHTTPClient(http_client),
+        **kwargs,
+    )
+
+
+@freeze_time("1955-11-12")
+@pytest.mark.parametrize("offload_crypto", [True, False])
+def test_get_payment_status(offload_crypto: bool):
+    """Test for the payment status get."""
+    http_client = FakeHTTPClient(
+        responses=[_json_response(_status_response_json())]
+    )
+    client = _client(http_client, offload_crypto=offload_crypto)
+
+    resp = asyncio.run(client.get_payment_status("oid"))
+
+    assert resp.payment_status == PaymentStatus.IN_PROGRESS
+    assert http_client.history[0]["method"] == "get"
+    assert http_client.history[0]["url"].startswith(
+        "https://api.com/payment/status/mid/oid/19551112000000/qOvsShm"
+    )
+
+
+@freeze_time("1955-11-12")
+def test_close_payment_sends_signed_json():
+    """Test that the JSON body is signed the same way as in APIClient."""
+    http_client = FakeHTTPClient(
+        responses=[_json_response(_status_response_json())]
+    )
+
+    asyncio.run(_client(http_client).close_payment("oid", total_amount=1010))
+
+    assert http_client.history[0]["json"]["signature"].startswith(
+        "hc6JmmMa9JOOb6lKnHclSQ1OZJWX5sI71oxyAu5FJlQ2"
+    )
+
+
+def test_api_error():
+    """Test for an API error."""
+    http_client = FakeHTTPClient(
+        responses=[_json_response({"resultCode": 110}, 401)]
+    )
+    with pytest.raises(APIError):
+        asyncio.run(_client(http_client).refund_payment("oid", amount=1))
+
+
+def test_process_gateway_return():
+    """Test for the gateway return processing."""
+    http_client = FakeHTTPClient()
+    client = _client(http_client)
+
+    resp = asyncio.run(client.process_gateway_return(_status_response_json()))
+
+    assert resp.pay_id == "pid"
+    assert not http_client.history
+
+
+def test_aiohttp_client():
+    """Test for the aiohttp HTTP client against a local server."""
+    pytest.importorskip("aiohttp")
+    # pylint:disable=import-outside-toplevel
+    from csobpg.v19.transport.aiohttp_client import AiohttpHTTPClient
+
+    body = jsonlib.dumps(_status_response_json()).encode()
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # pylint:disable=invalid-name
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    async def _run():
+        async with AsyncAPIClient(
+            "mid",
+            _PRIVATE_KEY,
+            _PUBLIC_KEY,
+            f"http://127.0.0.1:{server.server_port}",
+            AiohttpHTTPClient(),
+        ) as client:
+            return await client.get_payment_status("oid")
+
+    try:
+        assert asyncio.run(_run()).pay_id == "pid"
+    finally:
+        server.shutdown()
@@ -0,0 +1,180 @@
+"""Tests for the breaker module."""
+
+import time
+
+import pytest
+from httprest.http.errors import HTTPConnectionError, HTTPTimeoutError
+from httprest.http.fake_client import FakeHTTPClient, HTTPResponse
+
+from csobpg.v19.api import APIClient
+from csobpg.v19.breaker import BreakerState, CircuitBreaker
+from csobpg.v19.errors import APICircuitOpenError, APIPaymentNotFoundError
+from csobpg.v19.key import RAMRSAKey
+
+_PRIVATE_KEY = RAMRSAKey("tests/v19/data/merchant.key")
+_PUBLIC_KEY = RAMRSAKey("tests/v19/data/merchant.pub")
+
+
+def _echo_response() -> HTTPResponse:
+    return HTTPResponse(
+        200, b'{"resultCode": 0}', {"Content-Type": "application/json"}
+    )
+
+
+def test_opens_after_threshold():
+    """Test that the circuit opens after consecutive failures."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+    assert not breaker.acquire("payment")
+    breaker.record("payment", 0.1, HTTPTimeoutError("timeout"))
+    breaker.record("payment", 0.1, APIPaymentNotFoundError("not found"))
+    breaker.record("payment", 0.1, HTTPTimeoutError("timeout"))
+    assert breaker.state("payment") == BreakerState.CLOSED
+
+    breaker.record("payment", 0.1, HTTPTimeoutError("timeout"))
+    assert breaker.states() == {"payment": BreakerState.OPEN}
+    with pytest.raises(APICircuitOpenError) as exc:
+        breaker.acquire("payment")
+    assert exc.value.group == "payment"
+    assert 0 < exc.value.retry_after <= 60
+
+    assert not breaker.acquire("oneclick")
+
+
+def test_slow_calls_are_failures():
+    """Test that calls over the latency threshold are counted as failures."""
+    breaker = CircuitBreaker(failure_threshold=1, latency_threshold=1)
+
+    breaker.record("payment", 0.5)
+    assert breaker.state("payment") == BreakerState.CLOSED
+    breaker.record("payment", 1.5)
+    assert breaker.state("payment") == BreakerState.OPEN
+
+
+def test_half_open():
+    """Test that a single probe is allowed after the reset timeout."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record("payment", 0, HTTPTimeoutError("timeout"))
+    time.sleep(0.02)
+
+    assert breaker.acquire("payment")
+    assert breaker.state("payment") == BreakerState.HALF_OPEN
+    with pytest.raises(APICircuitOpenError):
+        breaker.acquire("payment")
+
+    breaker.record("payment", 0, HTTPTimeoutError("timeout"))
+    assert breaker.state("payment") == BreakerState.OPEN
+    time.sleep(0.02)
+
+    assert breaker.acquire("payment")
+    breaker.record("payment", 0)
+    assert breaker.state("payment") == BreakerState.CLOSED
+
+
+def test_late_results_ignored():
+    """Test that calls admitted before the circuit opened do not close it."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    started = time.monotonic()
+    breaker.record("payment", 0, HTTPTimeoutError("timeout"))
+
+    breaker.record("payment", 0, started=started)
+    assert breaker.state("payment") == BreakerState.OPEN
+
+    time.sleep(0.02)
+    assert breaker.acquire("payment")
+    breaker.record("payment", 0, started=started)
+    assert breaker.state("payment") == BreakerState.HALF_OPEN
+    breaker.record("payment", 0, started=time.monotonic())
+    assert breaker.state("payment") == BreakerState.CLOSED
+
+
+def test_client_fails_fast():
+    """Test that the client rejects calls while the circuit is open."""
+    http_client = FakeHTTPClient(responses=[HTTPTimeoutError("timeout")])
+    client = APIClient(
+        "mid",
+        _PRIVATE_KEY,
+        _PUBLIC_KEY,
+        "https://api.com",
+        http_client,
+        breaker=CircuitBreaker(failure_threshold=1),
+    )
+
+    with pytest.raises(HTTPTimeoutError):
+        client.close_payment("pid")
+    with pytest.raises(APICircuitOpenError):
+        client.get_payment_status("pid")
+
+    assert len(http_client.history) == 1
+    assert client.breaker_states() == {"payment": BreakerState.OPEN}
+
+
+def test_client_probes_with_echo():
+    """Test that the client probes a half-open circuit with echo."""
+    http_client = FakeHTTPClient(
+        responses=[
+            HTTPTimeoutError("timeout"),
+            HTTPTimeoutError("timeout"),
+            _echo_response(),
+            HTTPTimeoutError("timeout"),
+        ]
+    )
+    client = APIClient(
+        "mid",
+        _PRIVATE_KEY,
+        _PUBLIC_KEY,
+        "https://api.com",
+        http_client,
+        breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.01),
+    )
+
+    with pytest.raises(HTTPTimeoutError):
+        client.reverse_payment("pid")
+    time.sleep(0.02)
+    with pytest.raises(APICircuitOpenError):
+        client.reverse_payment("pid")
+    time.sleep(0.02)
+    with pytest.raises(HTTPTimeoutError):
+        # the probe succeeds, the call itself times out
+        client.reverse_payment("pid")
+
+    assert [call["url"] for call in http_client.history] == [
+        "https://api.com/payment/reverse",
+        "https://api.com/echo",
+        "https://api.com/echo",
+        "https://api.com/payment/reverse",
+    ]
+    assert client.breaker_states() == {"payment": BreakerState.OPEN}
+
+
+def test_client_probe_error():
+    """Test that any error of the probe reopens the circuit."""
+    http_client = FakeHTTPClient(
+        responses=[
+            HTTPTimeoutError("timeout"),
+            HTTPConnectionError("connection reset"),
+        ]
+    )
+    client = APIClient(
+        "mid",
+        _PRIVATE_KEY,
+        _PUBLIC_KEY,
+        "https://api.com",
+        http_client,
+        breaker=CircuitBreaker(
+            failure_threshold=1,
+            reset_timeout=0.01,
+            failure_errors=(HTTPTimeoutError,),
+        ),
+    )
+
+    with pytest.raises(HTTPTimeoutError):
+        client.reverse_payment("pid")
+    time.sleep(0.02)
+    with pytest.raises(APICircuitOpenError) as exc:
+        # the probe error is not the error of the call
+        client.reverse_payment("pid")
+
+    assert isinstance(exc.value.__cause__, HTTPConnectionError)
+    assert len(http_client.history) == 2
+    assert client.breaker_states() == {"payment": BreakerState.OPEN}
@@ -0,0 +1,127 @@
+"""Tests for the bulk module."""
+
+import asyncio
+import threading
+import time
+from typing import List
+
+import pytest
+
+from csobpg.v19.bulk import arun_bounded, run_bounded
+from csobpg.v19.errors import APIPaymentNotFoundError
+
+
+class _Tracker:
+    """Track the number of calls in flight."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.consumed: List[str] = []
+        self._lock = threading.Lock()
+
+    def ids(self, count: int):
+        """Yield payment IDs, tracking their consumption."""
+        for i in range(count):
+            pay_id = f"pid{i}"
+            self.consumed.append(pay_id)
+            yield pay_id
+
+    def enter(self) -> None:
+        """Mark a call as started."""
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def leave(self) -> None:
+        """Mark a call as finished."""
+        with self._lock:
+            self.in_flight -= 1
+
+
+def test_run_bounded():
+    """Test for the bounded concurrent run."""
+    tracker = _Tracker()
+
+    def func(pay_id: str) -> str:
+        tracker.enter()
+        time.sleep(0.001)
+        tracker.leave()
+        if pay_id == "pid3":
+            raise APIPaymentNotFoundError("not found")
+        return pay_id.upper()
+
+    results = {
+        result.pay_id: result
+        for result in run_bounded(func, tracker.ids(20), 4)
+    }
+
+    assert len(results) == 20
+    assert tracker.max_in_flight <= 4
+    assert results["pid0"].response == "PID0"
+    assert not results["pid3"].ok
+    assert isinstance(results["pid3"].error, APIPaymentNotFoundError)
+
+
+def test_run_bounded_consumes_input_lazily():
+    """Test that the input is not consumed ahead of the concurrency."""
+    tracker = _Tracker()
+    results = run_bounded(lambda pay_id: pay_id, tracker.ids(1000), 2)
+
+    next(results)
+
+    assert len(tracker.consumed) <= 3
+    results.close()
+
+
+def test_run_bounded_raises_unexpected_errors():
+    """Test that only API and HTTP errors are reported per payment."""
+
+    def func(_: str) -> None:
+        raise RuntimeError("bug")
+
+    with pytest.raises(RuntimeError):
+        list(run_bounded(func, ["pid"], 1))
+
+
+def test_run_bounded_none_item():
+    """Test that a None item does not end the input."""
+    results = run_bounded(lambda pay_id: pay_id, ["pid0", None, "pid2"], 1)
+
+    assert [result.pay_id for result in results] == ["pid0", None, "pid2"]
+
+
+def test_run_bounded_key():
+    """Test that items are mapped to payment IDs with the key."""
+    rows = [("pid0", 100), ("pid1", 200)]
+
+    results = run_bounded(lambda row: row[1], rows, 2, key=lambda row: row[0])
+
+    assert sorted(
+        (result.pay_id, result.response, result.item) for result in results
+    ) == [("pid0", 100, ("pid0", 100)), ("pid1", 200, ("pid1", 200))]
+
+
+def test_arun_bounded():
+    """Test for the bounded concurrent asynchronous run."""
+    tracker = _Tracker()
+
+    async def func(pay_id: str) -> str:
+        tracker.enter()
+        await asyncio.sleep(0.001)
+        tracker.leave()
+        if pay_id == "pid3":
+            raise APIPaymentNotFoundError("not found")
+        return pay_id.upper()
+
+    async def run():
+        return [
+            result async for result in arun_bounded(func, tracker.ids(20), 4)
+        ]
+
+    results = {result.pay_id: result for result in asyncio.run(run())}
+
+    assert len(results) == 20
+    assert tracker.max_in_flight == 4
+    assert results["pid1"].response == "PID1"
+    assert isinstance(results["pid3"].error, APIPaymentNotFoundError)
@@ -0,0 +1,186 @@
+"""Tests for the cache module."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from csobpg.v19.async_api import AsyncAPIClient
+from csobpg.v19.cache import (
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+    StatusCache,
+)
+from csobpg.v19.mock.server import BASE_PATH
+from csobpg.v19.models.actions import Actions, Authenticate, Endpoint
+from csobpg.v19.response import PaymentStatus, PaymentStatusResponse
+from csobpg.v19.transport import ExecutorAsyncHTTPClient
+from tests.v19.helpers import (
+    GATEWAY_KEY,
+    PRIVATE_KEY,
+    CountingHTTPClient,
+    mock_client,
+    mock_gateway,
+)
+
+
+def _status(
+    pay_id: str = "pid", status: PaymentStatus = PaymentStatus.SETTLED
+) -> PaymentStatusResponse:
+    return PaymentStatusResponse(
+        pay_id,
+        "20240919164156",
+        0,
+        "OK",
+        status,
+        actions=Actions(authenticate=Authenticate(Endpoint("https://a.cz"))),
+    )
+
+
+def test_ttl():
+    """Test the TTLs of the payment statuses."""
+    cache = StatusCache(
+        final_ttl=100,
+        pending_ttl=1,
+        default_ttl=10,
+        ttls={PaymentStatus.DENIED: 0},
+    )
+
+    assert cache.ttl(PaymentStatus.SETTLED) == 100
+    assert cache.ttl(PaymentStatus.IN_PROGRESS) == 1
+    assert cache.ttl(PaymentStatus.CONFIRMED) == 10
+    assert cache.ttl(PaymentStatus.DENIED) == 0
+    assert cache.ttl(None) == 0
+
+    cache.put(_status("denied", PaymentStatus.DENIED))
+    cache.put(_status("settled"))
+    assert cache.get("denied") is None
+    assert cache.get("settled").payment_status == PaymentStatus.SETTLED
+
+
+def test_invalidated_while_requested():
+    """Test that a status requested before an invalidation is not cached."""
+    cache = StatusCache()
+    stale = cache.begin("pid")
+    fresh = cache.begin("pid")
+    cache.invalidate("pid")
+    cache.finish("pid", stale, _status())
+    assert cache.get("pid") is None
+
+    cache.finish("pid", fresh)
+    cache.finish("pid", cache.begin("pid"), _status())
+    assert cache.get("pid").payment_status == PaymentStatus.SETTLED
+
+
+def test_memory_backend():
+    """Test LRU eviction and expiration of the memory backend."""
+    backend = MemoryCacheBackend(maxsize=2)
+    backend.set("a", 1, 60)
+    backend.set("b", 2, 60)
+    assert backend.get("a") == 1
+    backend.set("c", 3, 60)
+
+    assert backend.get("b") is None
+    assert len(backend) == 2
+
+    backend.set("d", 4, 0.01)
+    time.sleep(0.02)
+    assert backend.get("d") is None
+    backend.delete("a")
+    assert backend.get("a") is None
+
+
+def test_sqlite_backend(tmp_path):
+    """Test that the SQLite backend shares values through the file."""
+    path = str(tmp_path / "cache.db")
+    writer = StatusCache(SQLiteCacheBackend(path))
+    reader = StatusCache(SQLiteCacheBackend(path))
+    writer.put(_status())
+
+    status = reader.get("pid")
+    assert status.to_sign_text() == _status().to_sign_text()
+
+    reader.invalidate("pid")
+    assert writer.get("pid") is None
+
+    backend = SQLiteCacheBackend(":memory:")
+    backend.set("a", Endpoint("https://a.cz"), 0)
+    assert backend.get("a") is None
+    with pytest.raises(ValueError):
+        SQLiteCacheBackend(path, "payment; DROP TABLE x")
+
+
+def test_client_cache():
+    """Test that the client caches statuses and invalidates them."""
+    gateway = mock_gateway()
+    http_client = CountingHTTPClient(gateway)
+    client = mock_client(http_client, status_cache=StatusCache())
+    init = client.init_payment("order1", 300, "https://shop.com")
+    gateway.authorize(init.pay_id)
+
+    first = client.get_payment_status(init.pay_id)
+    assert client.get_payment_status(init.pay_id) is first
+    assert http_client.methods == ["post", "get"]
+
+    client.reverse_payment(init.pay_id)
+    status = client.get_payment_status(init.pay_id)
+
+    assert status.payment_status == PaymentStatus.REVERSED
+    assert http_client.methods == ["post", "get", "put", "get"]
+
+
+def test_async_client_cache():
+    """Test that the asynchronous client caches statuses."""
+    gateway = mock_gateway()
+    http_client = CountingHTTPClient(gateway)
+    client = AsyncAPIClient(
+        "mid",
+        PRIVATE_KEY,
+        GATEWAY_KEY,
+        base_url=f"http://mock{BASE_PATH}",
+        http_client=ExecutorAsyncHTTPClient(http_client),
+        status_cache=StatusCache(),
+    )
+
+    async def run():
+        init = await client.init_payment("order1", 300, "https://shop.com")
+        await client.get_payment_status(init.pay_id)
+        await client.get_payment_status(init.pay_id)
+        await client.close()
+
+    asyncio.run(run())
+    assert http_client.methods == ["post", "get"]
+
+
+def test_client_status_racing_reverse():
+    """Test that a status requested during a reversal is not cached."""
+    gateway = mock_gateway()
+    requested = threading.Event()
+    reversal = threading.Event()
+
+    class _BlockingHTTPClient(CountingHTTPClient):
+        def _request(self, method: str, url: str, *args, **kwargs):
+            response = super()._request(method, url, *args, **kwargs)
+            if method == "get" and not reversal.is_set():
+                requested.set()
+                reversal.wait(5)
+            return response
+
+    http_client = _BlockingHTTPClient(gateway)
+    client = mock_client(http_client, status_cache=StatusCache())
+    init = client.init_payment("order1", 300, "https://shop.com")
+    gateway.authorize(init.pay_id)
+
+    thread = threading.Thread(
+        target=client.get_payment_status, args=(init.pay_id,)
+    )
+    thread.start()
+    assert requested.wait(5)
+    client.reverse_payment(init.pay_id)
+    reversal.set()
+    thread.join()
+
+    status = client.get_payment_status(init.pay_id)
+    assert status.payment_status == PaymentStatus.REVERSED
+    assert http_client.methods == ["post", "get", "put", "get"]
@@ -0,0 +1,105 @@
+"""Tests for the concurrency module."""
+
+import asyncio
+import time
+
+import pytest
+from httprest.http.errors import HTTPError, HTTPTimeoutError
+
+from csobpg.v19.api import APIClient
+from csobpg.v19.bulk import arun_bounded
+from csobpg.v19.concurrency import AdaptiveConcurrency
+from csobpg.v19.errors import APIPaymentNotFoundError
+from csobpg.v19.key import RAMRSAKey
+from csobpg.v19.mock import MockGateway, MockServer
+
+_PRIVATE_KEY = RAMRSAKey("tests/v19/data/merchant.key")
+_PUBLIC_KEY = RAMRSAKey("tests/v19/data/merchant.pub")
+_GATEWAY_KEY = RAMRSAKey("tests/keys/key.key")
+
+
+def test_aimd():
+    """Test the additive increase and the multiplicative decrease."""
+    concurrency = AdaptiveConcurrency(initial=4, max_limit=5)
+    started = time.monotonic()
+    for _ in range(4):
+        concurrency.record(started)
+    assert concurrency.limit == 5
+    for _ in range(5):
+        concurrency.record(started)
+    assert concurrency.limit == 5
+
+    concurrency.record(started, APIPaymentNotFoundError("not found"))
+    assert concurrency.limit == 5
+    concurrency.record(started, HTTPTimeoutError("timeout"))
+    assert concurrency.limit == 2
+    concurrency.record(started, HTTPTimeoutError("timeout"))
+    assert concurrency.limit == 2
+
+    concurrency.record(time.monotonic(), HTTPTimeoutError("timeout"))
+    concurrency.record(time.monotonic(), HTTPTimeoutError("timeout"))
+    assert concurrency.limit == 1
+
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(initial=8, max_limit=4)
+
+
+def test_slow_calls_decrease():
+    """Test that calls over the latency threshold decrease the limit."""
+    concurrency = AdaptiveConcurrency(initial=8, latency_threshold=1)
+
+    concurrency.record(time.monotonic() - 0.5)
+    assert concurrency.limit == 8
+    concurrency.record(time.monotonic() - 1.5)
+    assert concurrency.limit == 4
+
+
+def test_arun_bounded_adaptive():
+    """Test that the asynchronous bulk run follows the limit."""
+    concurrency = AdaptiveConcurrency(initial=4)
+    in_flight = []
+
+    async def func(pay_id: str) -> str:
+        in_flight.append(pay_id)
+        await asyncio.sleep(0.001)
+        count = len(in_flight)
+        in_flight.remove(pay_id)
+        if count > 2:
+            raise HTTPTimeoutError("overloaded")
+        return pay_id
+
+    async def run():
+        return [
+            result
+            async for result in arun_bounded(
+                func, (f"pid{i}" for i in range(50)), concurrency
+            )
+        ]
+
+    results = asyncio.run(run())
+
+    assert len(results) == 50
+    assert concurrency.limit <= 3
+
+
+def _overloaded(results) -> int:
+    return sum(isinstance(result.error, HTTPError) for result in results)
+
+
+def test_load():
+    """Test the adaptive bulk run against an overloaded mock server."""
+    gateway = MockGateway(_PUBLIC_KEY, _GATEWAY_KEY, latency=0.01, capacity=4)
+    pay_ids = [f"pid{i}" for i in range(100)]
+    with MockServer(gateway) as server:
+        client = APIClient("mid", _PRIVATE_KEY, _GATEWAY_KEY, server.url)
+        fixed = list(client.get_payment_statuses(pay_ids, 16))
+        concurrency = AdaptiveConcurrency(initial=16, max_limit=32)
+        adaptive = list(client.get_payment_statuses(pay_ids, concurrency))
+
+    assert len(adaptive) == 100
+    assert all(
+        isinstance(result.error, (HTTPError, APIPaymentNotFoundError))
+        for result in adaptive
+    )
+    assert concurrency.limit < 16
+    assert _overloaded(adaptive) < _overloaded(fixed)
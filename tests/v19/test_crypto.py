@@ -0,0 +1,102 @@
+"""Tests for the crypto backends."""
+
+import json as jsonlib
+
+import pytest
+from httprest.http.fake_client import FakeHTTPClient, HTTPResponse
+
+from csobpg.v19.api import APIClient
+from csobpg.v19.crypto import BackendSigner, PycryptodomeBackend
+from csobpg.v19.errors import APIInvalidSignatureError
+from csobpg.v19.key import RAMRSAKey
+from csobpg.v19.mock.gateway import request_sign_text
+from csobpg.v19.signature import sign, verify
+
+_PRIVATE_KEY = RAMRSAKey("tests/v19/data/merchant.key")
+_PUBLIC_KEY = RAMRSAKey("tests/v19/data/merchant.pub")
+
+_TEXTS = [
+    b"",
+    b"mid|payId|20240101120000",
+    "mid|5547|20240101120000|Jan Novák|true|https://shop.com".encode(),
+]
+
+
+def _load_backends():
+    yield PycryptodomeBackend()
+    try:
+        # pylint:disable=import-outside-toplevel
+        from csobpg.v19.crypto.openssl import OpenSSLBackend
+    except ImportError:
+        return
+    yield OpenSSLBackend()
+
+
+_BACKENDS = list(_load_backends())
+
+
+@pytest.mark.parametrize("text", _TEXTS)
+def test_backends_identical(text: bytes):
+    """Test that the backends produce the same signatures."""
+    pytest.importorskip("cryptography")
+
+    signatures = {
+        sign(text, backend.signer(_PRIVATE_KEY)) for backend in _BACKENDS
+    }
+    assert signatures == {sign(text, _PRIVATE_KEY)}
+
+
+@pytest.mark.parametrize(
+    "backend", _BACKENDS, ids=lambda backend: type(backend).__name__
+)
+def test_verify(backend):
+    """Test signature verification."""
+    signer = backend.signer(_PUBLIC_KEY)
+    assert isinstance(signer, BackendSigner)
+    verify(sign(b"text", _PRIVATE_KEY), b"text", signer)
+
+    with pytest.raises(APIInvalidSignatureError):
+        verify(sign(b"text", _PRIVATE_KEY), b"other", signer)
+    with pytest.raises(APIInvalidSignatureError):
+        verify("not base64", b"text", signer)
+
+
+@pytest.mark.parametrize(
+    "backend", _BACKENDS, ids=lambda backend: type(backend).__name__
+)
+def test_client(backend):
+    """Test that the client signs and verifies with the backend."""
+    response = {
+        "payId": "pid",
+        "dttm": "dttm",
+        "resultCode": 0,
+        "resultMessage": "OK",
+        "paymentStatus": 1,
+        "signature": sign(b"pid|dttm|0|OK|1", _PRIVATE_KEY),
+    }
+    http_client = FakeHTTPClient(
+        [
+            HTTPResponse(
+                200,
+                jsonlib.dumps(response).encode(),
+                headers={"Content-Type": "application/json"},
+            )
+        ]
+    )
+    client = APIClient(
+        "mid",
+        _PRIVATE_KEY,
+        _PUBLIC_KEY,
+        http_client=http_client,
+        crypto=backend,
+    )
+
+    assert (
+        client.init_payment("order", 100, "https://shop.com").pay_id == "pid"
+    )
+    request = http_client.history[0]["json"]
+    verify(
+        request["signature"],
+        request_sign_text("payment/init", request).encode(),
+        _PUBLIC_KEY,
+    )
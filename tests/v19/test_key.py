@@ -0,0 +1,46 @@
+"""Tests for the key module."""
+
+import os
+import shutil
+
+from csobpg.v19.key import FileRSAKey, RAMRSAKey
+from csobpg.v19.signature import sign, verify
+
+_PRIVATE_KEY_PATH = "tests/v19/data/merchant.key"
+_PUBLIC_KEY_PATH = "tests/v19/data/merchant.pub"
+
+
+def test_parsed_key_is_cached():
+    """Test that the parsed key is imported only once."""
+    key = RAMRSAKey(_PRIVATE_KEY_PATH)
+    assert key.parsed is key.parsed
+
+
+def test_file_key_reparsed_on_mtime_change(tmp_path):
+    """Test that the file key is re-read when the file is modified."""
+    path = tmp_path / "key"
+    shutil.copy(_PRIVATE_KEY_PATH, path)
+    key = FileRSAKey(str(path))
+    parsed = key.parsed
+    assert key.parsed is parsed
+
+    shutil.copy("tests/keys/key.key", path)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert key.parsed is not parsed
+    assert key.parsed.n != parsed.n
+
+
+def test_sign_accepts_parsed_key():
+    """Test that sign/verify accept key text, parsed key and RSAKey alike."""
+    private_key = RAMRSAKey(_PRIVATE_KEY_PATH)
+    public_key = RAMRSAKey(_PUBLIC_KEY_PATH)
+
+    signature = sign(b"text", str(private_key))
+    assert sign(b"text", private_key.parsed) == signature
+    assert sign(b"text", private_key) == signature
+
+    verify(signature, b"text", str(public_key))
+    verify(signature, b"text", public_key.parsed)
+    verify(signature, b"text", public_key)
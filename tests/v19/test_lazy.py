@@ -0,0 +1,62 @@
+"""Tests for the lazy import of the package attributes."""
+
+import subprocess
+import sys
+
+import pytest
+
+from csobpg.v19 import request, response
+
+
+def _modules_after(code: str) -> set:
+    """Return modules imported by the code in a new interpreter."""
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys; {code}; print(' '.join(sys.modules))",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return set(output.split())
+
+
+def test_package_import_is_lazy():
+    """Test that importing the package does not import the clients."""
+    modules = _modules_after("import csobpg.v19")
+
+    assert "csobpg.v19.api" not in modules
+    assert not any(module.startswith("Crypto") for module in modules)
+    assert "asyncio" not in modules
+
+
+def test_client_import_skips_asyncio():
+    """Test that importing the synchronous client does not import asyncio."""
+    modules = _modules_after("from csobpg.v19 import APIClient")
+
+    assert "csobpg.v19.api" in modules
+    assert "asyncio" not in modules
+
+
+def test_request_import_is_lazy():
+    """Test that only the used request module and no crypto is imported."""
+    modules = _modules_after(
+        "from csobpg.v19.request import PaymentStatusRequest"
+    )
+
+    assert "csobpg.v19.request.payment_status" in modules
+    assert "csobpg.v19.request.payment_init" not in modules
+    assert not any(module.startswith("Crypto") for module in modules)
+
+
+@pytest.mark.parametrize("package", [request, response])
+def test_lazy_attributes(package):
+    """Test that all exported names are resolved."""
+    for name in package.__all__:
+        assert getattr(package, name).__name__ == name
+        assert name in dir(package)
+
+    with pytest.raises(AttributeError):
+        getattr(package, "Unknown")
@@ -0,0 +1,177 @@
+"""Tests for the mock gateway."""
+
+import http.client
+from typing import Iterator
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+from httprest.http.errors import HTTPError
+
+from csobpg.v19.api import APIClient
+from csobpg.v19.errors import (
+    APIInternalError,
+    APIInvalidParamError,
+    APIPaymentInInvalidStateError,
+    APIPaymentNotFoundError,
+)
+from csobpg.v19.key import RAMRSAKey
+from csobpg.v19.mock import MockGateway, MockHTTPClient, MockServer
+from csobpg.v19.mock.gateway import request_sign_text
+from csobpg.v19.models import customer, order
+from csobpg.v19.models.cart import Cart, CartItem
+from csobpg.v19.models.payment import PaymentOperation
+from csobpg.v19.request import PaymentInitRequest
+from csobpg.v19.response import PaymentStatus
+
+_PRIVATE_KEY = RAMRSAKey("tests/v19/data/merchant.key")
+_PUBLIC_KEY = RAMRSAKey("tests/v19/data/merchant.pub")
+# responses are verified with the public part of the key
+_GATEWAY_KEY = RAMRSAKey("tests/keys/key.key")
+
+
+@pytest.fixture(name="gateway")
+def _gateway() -> MockGateway:
+    return MockGateway(_PUBLIC_KEY, _GATEWAY_KEY, seed=1)
+
+
+@pytest.fixture(name="server")
+def _server(gateway: MockGateway) -> Iterator[MockServer]:
+    with MockServer(gateway) as server:
+        yield server
+
+
+def _client(url: str, gateway: MockGateway, **kwargs) -> APIClient:
+    return APIClient(
+        "mid",
+        _PRIVATE_KEY,
+        _GATEWAY_KEY,
+        base_url=url,
+        **kwargs,
+    )
+
+
+def test_request_sign_text():
+    """Test that the gateway rebuilds the sign text of a request."""
+    request = PaymentInitRequest(
+        "mid",
+        _PRIVATE_KEY,
+        "order1",
+        300,
+        "https://shop.com",
+        cart=Cart([CartItem("a", 1, 100), CartItem("b", 2, 100, "desc")]),
+        customer=customer.CustomerData(
+            "name",
+            "a@b.cz",
+            mobile_phone=customer.PhoneNumber("420", "123456789"),
+            account=customer.AccountData("2024-01-01", order_history=3),
+            login=customer.LoginData(customer.AuthMethod.ACCOUNT),
+        ),
+        order=order.OrderData(
+            order.OrderType.PURCHASE,
+            delivery=order.DeliveryData(
+                order.DeliveryIndicator.SHIPPING, email="a@b.cz"
+            ),
+            name_match=False,
+            billing=order.AddressData("addr", "CZE", "Prague", "11000"),
+        ),
+        merchant_data=b"data",
+        payment_expiry=5,
+    )
+
+    assert (
+        request_sign_text("payment/init", request.to_json())  # type: ignore
+        == request.to_sign_text()
+    )
+
+
+def test_payment_lifecycle(gateway: MockGateway, server: MockServer):
+    """Test the payment lifecycle over HTTP."""
+    client = _client(server.url, gateway)
+
+    init = client.init_payment(
+        "order1", 100, "https://shop.com", close_payment=False
+    )
+    assert init.payment_status == PaymentStatus.INITIATED
+
+    url = urlsplit(client.get_payment_process_url(init.pay_id))
+    conn = http.client.HTTPConnection(url.netloc)
+    conn.request("GET", url.path)
+    redirect = conn.getresponse()
+    conn.close()
+    assert redirect.status == 303
+    location = urlsplit(redirect.headers["Location"])
+    assert location.netloc == "shop.com"
+    params = dict(parse_qsl(location.query))
+    processed = client.process_gateway_return(params)
+    assert processed.payment_status == PaymentStatus.CONFIRMED
+
+    closed = client.close_payment(init.pay_id, 50)
+    assert closed.payment_status == PaymentStatus.WAITING_SETTLEMENT
+    with pytest.raises(APIPaymentInInvalidStateError):
+        client.refund_payment(init.pay_id)
+
+    gateway.settle()
+    refund = client.refund_payment(init.pay_id, 20)
+    assert refund.payment_status == PaymentStatus.REFUND_PROCESSING
+    with pytest.raises(APIInvalidParamError):
+        client.refund_payment(init.pay_id, 40)
+
+    gateway.settle()
+    status = client.get_payment_status(init.pay_id)
+    assert status.payment_status == PaymentStatus.RETURNED
+    with pytest.raises(APIPaymentNotFoundError):
+        client.get_payment_status("unknown")
+
+
+def test_oneclick(gateway: MockGateway):
+    """Test the OneClick flow in-process."""
+    client = _client(
+        "http://mock/api/v1.9", gateway, http_client=MockHTTPClient(gateway)
+    )
+    template = client.init_payment(
+        "order1",
+        100,
+        "https://shop.com",
+        payment_operation=PaymentOperation.ONE_CLICK_PAYMENT,
+    )
+    gateway.authorize(template.pay_id)
+
+    client.oneclick_echo(template.pay_id)
+    init = client.oneclick_init_payment(
+        template.pay_id, "order2", "https://shop.com"
+    )
+    process = client.oneclick_process(init.pay_id)
+    assert process.payment_status == PaymentStatus.WAITING_SETTLEMENT
+
+    reverse = client.reverse_payment(init.pay_id)
+    assert reverse.payment_status == PaymentStatus.REVERSED
+    client.echo()
+
+
+def test_invalid_signature(gateway: MockGateway):
+    """Test that requests signed with another key are rejected."""
+    client = APIClient(
+        "mid",
+        _GATEWAY_KEY,
+        _GATEWAY_KEY,
+        http_client=MockHTTPClient(gateway),
+    )
+
+    with pytest.raises(APIInvalidParamError):
+        client.init_payment("order1", 100, "https://shop.com")
+
+
+def test_fault_injection():
+    """Test the error rate and result code injection."""
+    gateway = MockGateway(
+        _PUBLIC_KEY, _GATEWAY_KEY, result_codes={"payment/init": 900}
+    )
+    client = _client(
+        "http://mock/api/v1.9", gateway, http_client=MockHTTPClient(gateway)
+    )
+    with pytest.raises(APIInternalError):
+        client.init_payment("order1", 100, "https://shop.com")
+
+    gateway.error_rate = 1
+    with pytest.raises(HTTPError):
+        client.echo()
@@ -0,0 +1,169 @@
+"""Tests for the polling module."""
+
+import random
+from typing import Optional
+
+import pytest
+
+from csobpg.v19.cache import StatusCache
+from csobpg.v19.mock import MockGateway
+from csobpg.v19.polling import PollScheduler, TimingWheel
+from csobpg.v19.response import PaymentStatus
+from tests.v19.helpers import CountingHTTPClient, mock_client, mock_gateway
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_wheel():
+    """Test that keys expire at their deadlines across the levels."""
+    rand = random.Random(1)
+    wheel = TimingWheel(slots=4, levels=3)
+    deadlines = {}
+    for key in range(500):
+        deadlines[key] = rand.randint(-5, 150)
+        wheel.schedule(key, deadlines[key])
+    for key in range(0, 500, 7):
+        assert wheel.cancel(key)
+        del deadlines[key]
+    assert not wheel.cancel(0)
+    wheel.schedule(1, 3)
+    deadlines[1] = 3
+    assert len(wheel) == len(deadlines)
+
+    tick = 0
+    while deadlines:
+        previous, tick = tick, tick + rand.randint(1, 9)
+        expired = wheel.advance(tick)
+        assert sorted(expired) == sorted(
+            key
+            for key, deadline in deadlines.items()
+            if max(deadline, previous + 1) <= tick
+        )
+        for key in expired:
+            del deadlines[key]
+    assert not wheel
+    assert wheel.tick == tick
+
+
+def test_wheel_order():
+    """Test that each key expires exactly on its tick."""
+    wheel = TimingWheel(slots=4, levels=2)
+    for key in range(40):
+        wheel.schedule(key, 40 - key)
+    for tick in range(1, 41):
+        assert wheel.advance(tick) == [40 - tick]
+    with pytest.raises(ValueError):
+        TimingWheel(slots=1)
+
+
+def _scheduler(
+    gateway: MockGateway,
+    clock: _Clock,
+    status_cache: Optional[StatusCache] = None,
+    **kwargs,
+):
+    http_client = CountingHTTPClient(gateway)
+    client = mock_client(http_client, status_cache=status_cache)
+    results = {}
+
+    def callback(pay_id: str, response: Optional[object]) -> None:
+        results[pay_id] = response
+
+    scheduler = PollScheduler(client, callback, clock=clock, **kwargs)
+    return client, http_client, scheduler, results
+
+
+def test_next_delay():
+    """Test that the polls back off with the age up to the TTL end."""
+    clock = _Clock()
+    gateway = mock_gateway()
+    _, _, scheduler, _ = _scheduler(gateway, clock, backoff=2)
+    scheduler.add("pid", ttl_sec=300)
+    scheduler.add("old", ttl_sec=300, started=clock.now - 30)
+
+    assert scheduler.next_delay("pid") == 2
+    assert scheduler.next_delay("pid", clock.now + 10) == 10
+    assert scheduler.next_delay("pid", clock.now + 100) == 60
+    assert scheduler.next_delay("pid", clock.now + 300) == 5
+    assert scheduler.next_delay("old") == 30
+    assert len(scheduler) == 2
+    assert scheduler.remove("old")
+    assert not scheduler.remove("old")
+
+
+def test_poll():
+    """Test that payments are polled until they leave the pending statuses."""
+    clock = _Clock()
+    gateway = mock_gateway()
+    client, http_client, scheduler, results = _scheduler(
+        gateway, clock, backoff=2
+    )
+    paid, abandoned = (
+        client.init_payment(f"order{i}", 300, "https://shop.com").pay_id
+        for i in range(2)
+    )
+    http_client.methods.clear()
+    scheduler.add(paid, ttl_sec=300)
+    scheduler.add(abandoned, ttl_sec=300)
+
+    assert scheduler.poll() == 0
+    clock.now += 2
+    assert scheduler.poll() == 2
+    gateway.authorize(paid)
+    clock.now += 4
+    assert scheduler.poll() == 2
+
+    assert results[paid].payment_status == PaymentStatus.WAITING_SETTLEMENT
+    assert paid not in scheduler
+    polled = [2, 6]
+    while abandoned in scheduler:
+        clock.now += 1
+        if scheduler.poll():
+            polled.append(clock.now - 1000)
+    assert results[abandoned].payment_status == PaymentStatus.INITIATED
+    # the intervals double up to 60 s, the last poll is after the TTL
+    assert polled == [2, 6, 12, 24, 48, 96, 156, 216, 276, 305]
+    assert http_client.methods.count("get") == 12
+
+
+def test_poll_expiry():
+    """Test that failed polls are retried until the payment expiry."""
+    clock = _Clock()
+    gateway = mock_gateway(error_rate=1)
+    _, http_client, scheduler, results = _scheduler(gateway, clock)
+    scheduler.add("pid", ttl_sec=300, payment_expiry=1)
+
+    while "pid" in scheduler:
+        clock.now += 10
+        scheduler.poll()
+
+    assert results == {"pid": None}
+    assert clock.now == 1000 + 3610
+    # at most a poll per max_interval after the TTL
+    assert 60 < len(http_client.methods) < 80
+
+
+def test_poll_bypasses_cache():
+    """Test that a cached pending status does not hide a change."""
+    clock = _Clock()
+    gateway = mock_gateway()
+    client, _, scheduler, results = _scheduler(
+        gateway, clock, StatusCache(pending_ttl=3600)
+    )
+    pay_id = client.init_payment("order", 300, "https://shop.com").pay_id
+    assert client.get_payment_status(pay_id).payment_status == (
+        PaymentStatus.INITIATED
+    )
+    gateway.authorize(pay_id)
+    scheduler.add(pay_id)
+
+    clock.now += 2
+    scheduler.poll()
+
+    assert results[pay_id].payment_status == PaymentStatus.WAITING_SETTLEMENT
@@ -0,0 +1,89 @@
+"""Tests for the ratelimit module."""
+
+import asyncio
+import time
+
+import pytest
+from httprest.http.errors import HTTPTimeoutError
+from httprest.http.fake_client import FakeHTTPClient
+
+from csobpg.v19.api import APIClient
+from csobpg.v19.errors import APIRateLimitedError
+from csobpg.v19.key import RAMRSAKey
+from csobpg.v19.ratelimit import Limit, RateLimiter, TokenBucket
+
+_PRIVATE_KEY = RAMRSAKey("tests/v19/data/merchant.key")
+_PUBLIC_KEY = RAMRSAKey("tests/v19/data/merchant.pub")
+
+
+def test_token_bucket():
+    """Test that the bucket allows bursts and then spaces the calls."""
+    bucket = TokenBucket(Limit(rate=10, burst=2))
+
+    assert bucket.reserve() == (True, 0)
+    assert bucket.reserve() == (True, 0)
+    reserved, wait = bucket.reserve(0)
+    assert not reserved
+    assert 0 < wait <= 0.1
+    reserved, wait = bucket.reserve()
+    assert reserved
+    assert 0 < wait <= 0.1
+    assert 0.1 < bucket.reserve()[1] <= 0.2
+
+    with pytest.raises(ValueError):
+        TokenBucket(Limit(rate=0))
+
+
+def test_limits_per_merchant_and_family():
+    """Test that each merchant and endpoint family has its own bucket."""
+    limiter = RateLimiter(
+        {"status": Limit(1), "init": Limit(1)},
+        merchant_limits={"big": {"status": Limit(1, burst=3)}},
+    )
+
+    assert limiter.try_acquire("small", "payment/status")
+    assert not limiter.try_acquire("small", "payment/status")
+    assert limiter.try_acquire("small", "payment/init")
+    assert limiter.try_acquire("other", "payment/status")
+    assert all(limiter.try_acquire("big", "payment/status") for _ in "abc")
+    assert not limiter.try_acquire("big", "payment/status")
+    assert all(limiter.try_acquire("small", "payment/close") for _ in "abc")
+
+
+def test_acquire_waits():
+    """Test that acquire waits for a token up to max_wait."""
+    limiter = RateLimiter({"status": Limit(20)}, max_wait=0.1)
+    limiter.acquire("mid", "payment/status")
+
+    started = time.monotonic()
+    limiter.acquire("mid", "payment/status")
+    assert time.monotonic() - started >= 0.04
+
+    asyncio.run(limiter.aacquire("mid", "payment/status"))
+
+    limiter = RateLimiter({"status": Limit(1)}, max_wait=0.1)
+    limiter.acquire("mid", "payment/status")
+    with pytest.raises(APIRateLimitedError) as exc:
+        asyncio.run(limiter.aacquire("mid", "payment/status"))
+    assert exc.value.family == "status"
+    assert exc.value.merchant_id == "mid"
+    assert 0.1 < exc.value.retry_after <= 1
+
+
+def test_client_limited():
+    """Test that the client fails fast when the limit is exceeded."""
+    http_client = FakeHTTPClient(responses=[])
+    client = APIClient(
+        "mid",
+        _PRIVATE_KEY,
+        _PUBLIC_KEY,
+        "https://api.com",
+        http_client,
+        rate_limiter=RateLimiter({"other": Limit(1)}, max_wait=0),
+    )
+    with pytest.raises(HTTPTimeoutError):
+        client.echo()
+
+    with pytest.raises(APIRateLimitedError):
+        client.echo()
+    assert len(http_client.history) == 1
@@ -0,0 +1,192 @@
+"""Tests for the reconciliation module."""
+
+import os
+from functools import partial
+
+import pytest
+
+from csobpg.v19.api import APIClient
+from csobpg.v19.cache import StatusCache
+from csobpg.v19.key import RAMRSAKey
+from csobpg.v19.mock import MockGateway, MockHTTPClient, MockServer
+from csobpg.v19.mock.server import BASE_PATH
+from csobpg.v19.reconciliation import (
+    AHEAD,
+    BEHIND,
+    CONFLICT,
+    ERROR,
+    MISSING,
+    LedgerEntry,
+    Mismatch,
+    ReconciliationSummary,
+    Reconciler,
+    classify,
+    reconcile_sharded,
+    shard,
+)
+from csobpg.v19.response import PaymentStatus
+
+_PRIVATE_KEY = RAMRSAKey("tests/v19/data/merchant.key")
+_PUBLIC_KEY = RAMRSAKey("tests/v19/data/merchant.pub")
+_GATEWAY_KEY = RAMRSAKey("tests/keys/key.key")
+
+
+def _client(base_url: str) -> APIClient:
+    return APIClient("mid", _PRIVATE_KEY, _GATEWAY_KEY, base_url)
+
+
+def _broken_client() -> APIClient:
+    raise ValueError("no configuration")
+
+
+def _exiting_client() -> APIClient:
+    os._exit(3)  # pylint:disable=protected-access
+
+
+def test_classify():
+    """Test that transitions are classified by the payment lifecycle."""
+    assert classify(PaymentStatus.CONFIRMED, PaymentStatus.SETTLED) == AHEAD
+    assert classify(PaymentStatus.RETURNED, PaymentStatus.INITIATED) == (
+        BEHIND
+    )
+    assert classify(PaymentStatus.SETTLED, PaymentStatus.REVERSED) == (
+        CONFLICT
+    )
+    assert classify(PaymentStatus.DENIED, PaymentStatus.CANCELLED) == (
+        CONFLICT
+    )
+    assert classify(PaymentStatus.SETTLED, None) == CONFLICT
+    with pytest.raises(ValueError):
+        classify(PaymentStatus.SETTLED, PaymentStatus.SETTLED)
+
+
+def test_reconcile():
+    """Test that the mismatches are yielded and summarized."""
+    gateway = MockGateway(_PUBLIC_KEY, _GATEWAY_KEY, seed=1)
+    client = APIClient(
+        "mid",
+        _PRIVATE_KEY,
+        _GATEWAY_KEY,
+        base_url=f"http://mock{BASE_PATH}",
+        http_client=MockHTTPClient(gateway),
+        status_cache=StatusCache(),
+    )
+    settled, other, initiated = (
+        client.init_payment(f"order{i}", 300, "https://shop.com").pay_id
+        for i in range(3)
+    )
+    for pay_id in (settled, other):
+        gateway.authorize(pay_id)
+    gateway.settle()
+    entries = [
+        LedgerEntry(settled, PaymentStatus.SETTLED, 300),
+        LedgerEntry(settled, PaymentStatus.WAITING_SETTLEMENT, 300),
+        LedgerEntry(initiated, PaymentStatus.WAITING_SETTLEMENT, 200),
+        LedgerEntry(other, PaymentStatus.CANCELLED, 100),
+        LedgerEntry("unknown", PaymentStatus.SETTLED, 50),
+    ]
+    summary = ReconciliationSummary()
+
+    mismatches = list(Reconciler(client, 2).run(entries, summary))
+
+    assert sorted(
+        (mismatch.entry.pay_id, mismatch.kind, mismatch.actual)
+        for mismatch in mismatches
+    ) == sorted(
+        [
+            (settled, AHEAD, PaymentStatus.SETTLED),
+            (initiated, BEHIND, PaymentStatus.INITIATED),
+            (other, CONFLICT, PaymentStatus.SETTLED),
+            ("unknown", MISSING, None),
+        ]
+    )
+    assert summary.matched == 1
+    assert summary.total == 5
+    assert summary.amounts == {
+        AHEAD: 300,
+        BEHIND: 200,
+        CONFLICT: 100,
+        MISSING: 50,
+    }
+    assert (
+        summary.transitions[
+            (PaymentStatus.WAITING_SETTLEMENT, PaymentStatus.SETTLED)
+        ]
+        == 1
+    )
+    assert str(summary) == (
+        "ReconciliationSummary(total=5, matched=1, "
+        "kinds=[ahead=1, behind=1, conflict=1, missing=1])"
+    )
+
+
+def test_reconcile_sharded():
+    """Test that shards are reconciled in worker processes."""
+    gateway = MockGateway(_PUBLIC_KEY, _GATEWAY_KEY, seed=1)
+    with MockServer(gateway) as server:
+        client = _client(server.url)
+        pay_ids = [
+            client.init_payment(f"order{i}", 300, "https://shop.com").pay_id
+            for i in range(20)
+        ]
+        entries = [
+            LedgerEntry(
+                pay_id,
+                (
+                    PaymentStatus.INITIATED
+                    if i % 4
+                    else PaymentStatus.CONFIRMED
+                ),
+            )
+            for i, pay_id in enumerate(pay_ids)
+        ]
+        summary = ReconciliationSummary()
+
+        mismatches = list(
+            reconcile_sharded(
+                partial(_client, server.url),
+                iter(entries),
+                processes=3,
+                concurrency=2,
+                summary=summary,
+                batch_size=2,
+            )
+        )
+
+        assert sorted(mismatch.entry.pay_id for mismatch in mismatches) == (
+            sorted(pay_ids[::4])
+        )
+        assert all(mismatch.kind == BEHIND for mismatch in mismatches)
+        assert summary.matched == 15
+        assert summary.total == 20
+
+        with pytest.raises(RuntimeError, match="failed"):
+            list(reconcile_sharded(_broken_client, iter(entries), 2))
+        with pytest.raises(RuntimeError, match="exited unexpectedly"):
+            list(reconcile_sharded(_exiting_client, iter(entries), 2))
+
+
+def test_shard():
+    """Test that shards are stable and cover all of them."""
+    assert shard("abc", 4) == shard("abc", 4)
+    assert {shard(f"pid{i}", 4) for i in range(100)} == {0, 1, 2, 3}
+
+
+def test_error_mismatch():
+    """Test that a status which cannot be requested is an error."""
+    gateway = MockGateway(_PUBLIC_KEY, _GATEWAY_KEY, seed=1, error_rate=1)
+    client = APIClient(
+        "mid",
+        _PRIVATE_KEY,
+        _GATEWAY_KEY,
+        base_url=f"http://mock{BASE_PATH}",
+        http_client=MockHTTPClient(gateway),
+    )
+
+    (mismatch,) = Reconciler(client).run(
+        [LedgerEntry("pid", PaymentStatus.SETTLED)]
+    )
+
+    assert isinstance(mismatch, Mismatch)
+    assert mismatch.kind == ERROR
+    assert mismatch.error
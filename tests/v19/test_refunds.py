@@ -0,0 +1,189 @@
+"""Tests for the refunds module."""
+
+import io
+import json
+import threading
+
+import pytest
+from httprest.http.errors import HTTPConnectionError
+
+from csobpg.v19.api import APIClient
+from csobpg.v19.cache import StatusCache
+from csobpg.v19.mock import MockGateway, MockHTTPClient
+from csobpg.v19.refunds import RefundPipeline, RefundRow, read_refunds
+from csobpg.v19.response import PaymentStatus
+from csobpg.v19.retry import RetryPolicy
+from tests.v19.helpers import CountingHTTPClient, mock_client, mock_gateway
+
+
+class _RefundHTTPClient(CountingHTTPClient):
+    def __init__(self, gateway: MockGateway) -> None:
+        super().__init__(gateway)
+        self.fail_puts = False
+        self.puts_in_flight = 0
+        self.max_puts_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _request(self, method: str, url: str, *args, **kwargs):
+        if method != "put":
+            return super()._request(method, url, *args, **kwargs)
+        if self.fail_puts:
+            self.methods.append(method)
+            raise HTTPConnectionError("connection refused")
+        with self._lock:
+            self.puts_in_flight += 1
+            self.max_puts_in_flight = max(
+                self.max_puts_in_flight, self.puts_in_flight
+            )
+        try:
+            return super()._request(method, url, *args, **kwargs)
+        finally:
+            with self._lock:
+                self.puts_in_flight -= 1
+
+
+@pytest.fixture(name="gateway")
+def _gateway() -> MockGateway:
+    return mock_gateway()
+
+
+def _settled(client: APIClient, gateway: MockGateway, count: int):
+    pay_ids = []
+    for i in range(count):
+        pay_id = client.init_payment(
+            f"order{i}", 300, "https://shop.com"
+        ).pay_id
+        gateway.authorize(pay_id)
+        pay_ids.append(pay_id)
+    gateway.settle()
+    return pay_ids
+
+
+def test_read_csv(tmp_path):
+    """Test that CSV rows are parsed and invalid ones reported."""
+    path = tmp_path / "refunds.csv"
+    path.write_text("pay_id,amount\nabc,100\ndef,\nghi,-5\n,10\njkl, 7 \n")
+
+    assert list(read_refunds(str(path))) == [
+        RefundRow(2, "abc", 100),
+        RefundRow(3, "def", None),
+        RefundRow(4, "ghi", error="amount must be a positive integer"),
+        RefundRow(5, "", error="missing pay_id"),
+        RefundRow(6, "jkl", 7),
+    ]
+
+
+def test_read_jsonl(tmp_path):
+    """Test that JSON Lines rows are parsed and invalid ones reported."""
+    path = tmp_path / "refunds.txt"
+    path.write_text(
+        '{"pay_id": "abc", "amount": 100}\n'
+        "\n"
+        '{"pay_id": "def"}\n'
+        '{"pay_id": "ghi", "amount": 1.5}\n'
+        '{"pay_id": "jkl", "amount": true}\n'
+        "[1]\n"
+        '{"pay_id": "broken\n'
+    )
+
+    assert list(read_refunds(str(path), "jsonl")) == [
+        RefundRow(1, "abc", 100),
+        RefundRow(3, "def", None),
+        RefundRow(4, "ghi", error="amount must be a positive integer"),
+        RefundRow(5, "jkl", error="amount must be a positive integer"),
+        RefundRow(6, "", error="invalid JSON"),
+        RefundRow(7, "", error="invalid JSON"),
+    ]
+    with pytest.raises(ValueError):
+        list(read_refunds(str(path), "xml"))
+
+
+def test_refunds(gateway: MockGateway, tmp_path):
+    """Test that valid rows are refunded and the results written."""
+    http_client = _RefundHTTPClient(gateway)
+    client = mock_client(http_client, status_cache=StatusCache())
+    full, partial, excess = _settled(client, gateway, 3)
+    pending = client.init_payment("order", 300, "https://shop.com").pay_id
+    path = tmp_path / "refunds.csv"
+    path.write_text(
+        "pay_id,amount\n"
+        f"{full},\n{partial},100\n{partial},100\n{excess},400\n"
+        f"{pending},100\n{full},0\n"
+    )
+    client.get_payment_status(excess)
+    http_client.methods.clear()
+    output = io.StringIO()
+
+    summary = RefundPipeline(client, concurrency=1).run(
+        read_refunds(str(path)), output
+    )
+
+    assert summary.refunded == 3
+    assert summary.refunded_amount == 200
+    assert summary.invalid == 2
+    assert summary.error_codes == {110: 1}
+    assert str(summary) == (
+        "RefundSummary(total=6, refunded=3, refunded_amount=200, "
+        "invalid=2, error_codes=[110=1], failed=0)"
+    )
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [(record["line"], record["state"]) for record in records] == [
+        (2, "refunded"),
+        (3, "refunded"),
+        (4, "refunded"),
+        (5, "rejected"),
+        (6, "invalid"),
+        (7, "invalid"),
+    ]
+    assert records[4]["error"] == "payment status INITIATED is not refundable"
+    # the status of excess is cached, the invalid amount is not requested
+    assert http_client.methods.count("get") == 4
+    assert http_client.methods.count("put") == 4
+    assert gateway.payment_status(partial) == PaymentStatus.REFUND_PROCESSING
+
+
+def test_refunds_failed(gateway: MockGateway):
+    """Test that rows failed without an API result are reported."""
+    client = mock_client(MockHTTPClient(gateway))
+    gateway.error_rate = 1
+    output = io.StringIO()
+
+    summary = RefundPipeline(client).run([RefundRow(1, "pid", 100)], output)
+
+    assert summary.failed == 1
+    assert json.loads(output.getvalue())["state"] == "failed"
+
+
+def test_same_payment_serialized():
+    """Test that rows of the same payment are not refunded concurrently."""
+    gateway = mock_gateway(latency=0.01)
+    http_client = _RefundHTTPClient(gateway)
+    client = mock_client(http_client)
+    (pay_id,) = _settled(client, gateway, 1)
+    output = io.StringIO()
+
+    summary = RefundPipeline(client, concurrency=4).run(
+        [RefundRow(i, pay_id, 100) for i in range(4)], output
+    )
+
+    assert summary.refunded == 3
+    assert summary.error_codes == {110: 1}
+    assert http_client.max_puts_in_flight == 1
+
+
+def test_lost_partial_refund_failed(gateway: MockGateway):
+    """Test that a lost refund of a refunded payment is not refunded."""
+    http_client = _RefundHTTPClient(gateway)
+    client = mock_client(
+        http_client, retry=RetryPolicy(backoff=0, jitter=False)
+    )
+    (pay_id,) = _settled(client, gateway, 1)
+    client.refund_payment(pay_id, 100)
+    http_client.fail_puts = True
+    output = io.StringIO()
+
+    summary = RefundPipeline(client).run([RefundRow(1, pay_id, 100)], output)
+
+    assert summary.failed == 1
+    assert summary.refunded == 0
+    assert json.loads(output.getvalue())["state"] == "failed"
@@ -0,0 +1,252 @@
+"""Tests for the retry module."""
+
+import asyncio
+import json as jsonlib
+
+import pytest
+from httprest.http.errors import (
+    HTTPConnectionError,
+    HTTPError,
+    HTTPTimeoutError,
+)
+from httprest.http.fake_client import FakeHTTPClient, HTTPResponse
+
+from csobpg.v19.api import APIClient
+from csobpg.v19.async_api import AsyncAPIClient
+from csobpg.v19.key import RAMRSAKey
+from csobpg.v19.mock import MockGateway, MockHTTPClient
+from csobpg.v19.mock.server import BASE_PATH
+from csobpg.v19.response import PaymentStatus
+from csobpg.v19.response.payment_close import PaymentCloseResponse
+from csobpg.v19.response.payment_refund import PaymentRefundResponse
+from csobpg.v19.response.payment_status import PaymentStatusResponse
+from csobpg.v19.retry import RetryMode, RetryPolicy
+from csobpg.v19.signature import sign
+from csobpg.v19.transport import ExecutorAsyncHTTPClient
+
+_PRIVATE_KEY = RAMRSAKey("tests/v19/data/merchant.key")
+_PUBLIC_KEY = RAMRSAKey("tests/v19/data/merchant.pub")
+_GATEWAY_KEY = RAMRSAKey("tests/keys/key.key")
+_POLICY = RetryPolicy(max_attempts=3, backoff=0, jitter=False)
+
+
+class _FailingHTTPClient(MockHTTPClient):
+    """Mock HTTP client failing the PUT calls before they are sent."""
+
+    def __init__(self, gateway: MockGateway) -> None:
+        super().__init__(gateway)
+        self.fail = False
+        self.methods = []
+
+    def _request(self, method: str, url: str, *args, **kwargs):
+        self.methods.append(method)
+        if self.fail and method == "put":
+            raise HTTPConnectionError("connection refused")
+        return super()._request(method, url, *args, **kwargs)
+
+
+def _json_response(response, data: dict) -> HTTPResponse:
+    data["signature"] = sign(
+        response.to_sign_text().encode(), str(_PRIVATE_KEY)
+    )
+    return HTTPResponse(
+        200,
+        jsonlib.dumps(data).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+
+
+def _status_response(status: PaymentStatus) -> HTTPResponse:
+    resp = PaymentStatusResponse("pid", "20240919164156", 0, "OK", status)
+    return _json_response(
+        resp,
+        {
+            "payId": resp.pay_id,
+            "dttm": resp.dttm,
+            "resultCode": resp.result_code,
+            "resultMessage": resp.result_message,
+            "paymentStatus": status.value,
+        },
+    )
+
+
+def _close_response() -> HTTPResponse:
+    resp = PaymentCloseResponse(
+        "pid", "20240919164156", 0, "OK", PaymentStatus.WAITING_SETTLEMENT
+    )
+    return _json_response(
+        resp,
+        {
+            "payId": resp.pay_id,
+            "dttm": resp.dttm,
+            "resultCode": resp.result_code,
+            "resultMessage": resp.result_message,
+            "paymentStatus": resp.payment_status.value,  # type: ignore
+        },
+    )
+
+
+def _client(http_client: FakeHTTPClient, retry=_POLICY) -> APIClient:
+    return APIClient(
+        "mid", _PRIVATE_KEY, _PUBLIC_KEY, "https://api.com", http_client, retry
+    )
+
+
+def test_delay():
+    """Test that the delay grows exponentially up to the maximum."""
+    policy = RetryPolicy(backoff=1, max_backoff=3, jitter=False)
+    assert [policy.delay(attempt) for attempt in (1, 2, 3)] == [1, 2, 3]
+    assert 0 <= RetryPolicy(backoff=1).delay(5) <= 10
+
+
+def test_safe_operation_retried():
+    """Test that a safe operation is retried with a fresh request."""
+    http_client = FakeHTTPClient(
+        responses=[
+            HTTPTimeoutError("timeout"),
+            HTTPResponse(503, b"", {}),
+            _status_response(PaymentStatus.IN_PROGRESS),
+        ]
+    )
+
+    response = _client(http_client).get_payment_status("pid")
+
+    assert response.payment_status == PaymentStatus.IN_PROGRESS
+    assert len(http_client.history) == 3
+
+
+def test_attempts_exhausted():
+    """Test that the last error is raised when attempts are exhausted."""
+    http_client = FakeHTTPClient(
+        responses=[HTTPTimeoutError("timeout"), HTTPResponse(503, b"", {})]
+    )
+
+    with pytest.raises(HTTPError):
+        _client(http_client, RetryPolicy(2, 0)).get_payment_status("pid")
+
+
+def test_not_retried_without_policy():
+    """Test that nothing is retried if there is no policy."""
+    http_client = FakeHTTPClient(responses=[HTTPTimeoutError("timeout")])
+
+    with pytest.raises(HTTPTimeoutError):
+        _client(http_client, None).get_payment_status("pid")
+    assert len(http_client.history) == 1
+
+
+def test_never_mode_not_retried():
+    """Test that an operation in the NEVER mode is not retried."""
+    http_client = FakeHTTPClient(responses=[HTTPTimeoutError("timeout")])
+    policy = RetryPolicy(backoff=0, modes={"payment/status": RetryMode.NEVER})
+
+    with pytest.raises(HTTPTimeoutError):
+        _client(http_client, policy).get_payment_status("pid")
+    assert len(http_client.history) == 1
+
+
+def test_applied_operation_not_repeated():
+    """Test that an applied close is recognized using the payment status."""
+    http_client = FakeHTTPClient(
+        responses=[
+            HTTPTimeoutError("timeout"),
+            _status_response(PaymentStatus.WAITING_SETTLEMENT),
+        ]
+    )
+
+    response = _client(http_client).close_payment("pid")
+
+    assert isinstance(response, PaymentCloseResponse)
+    assert response.payment_status == PaymentStatus.WAITING_SETTLEMENT
+    assert [call["method"] for call in http_client.history] == ["put", "get"]
+
+
+def test_not_applied_operation_repeated():
+    """Test that close is repeated if the status shows it was not applied."""
+    http_client = FakeHTTPClient(
+        responses=[
+            HTTPTimeoutError("timeout"),
+            _status_response(PaymentStatus.CONFIRMED),
+            _close_response(),
+        ]
+    )
+
+    response = _client(http_client).close_payment("pid")
+
+    assert response.payment_status == PaymentStatus.WAITING_SETTLEMENT
+    assert [call["method"] for call in http_client.history] == [
+        "put",
+        "get",
+        "put",
+    ]
+
+
+def test_async_retry():
+    """Test that the asynchronous client retries as well."""
+    http_client = FakeHTTPClient(
+        responses=[
+            HTTPTimeoutError("timeout"),
+            _status_response(PaymentStatus.REVERSED),
+        ]
+    )
+    client = AsyncAPIClient(
+        "mid",
+        _PRIVATE_KEY,
+        _PUBLIC_KEY,
+        "https://api.com",
+        ExecutorAsyncHTTPClient(http_client),
+        retry=_POLICY,
+    )
+
+    response = asyncio.run(client.reverse_payment("pid"))
+
+    assert response.payment_status == PaymentStatus.REVERSED
+    assert [call["method"] for call in http_client.history] == ["put", "get"]
+
+
+def test_applied_refund_not_repeated():
+    """Test that a refund of a settled payment is recognized as applied."""
+    http_client = FakeHTTPClient(
+        responses=[
+            _status_response(PaymentStatus.SETTLED),
+            HTTPTimeoutError("timeout"),
+            _status_response(PaymentStatus.REFUND_PROCESSING),
+        ]
+    )
+
+    response = _client(http_client).refund_payment("pid", 100)
+
+    assert isinstance(response, PaymentRefundResponse)
+    assert response.payment_status == PaymentStatus.REFUND_PROCESSING
+    assert [call["method"] for call in http_client.history] == [
+        "get",
+        "put",
+        "get",
+    ]
+
+
+def test_partial_refund_not_assumed_applied():
+    """Test that a lost refund of a refunded payment is not a success."""
+    gateway = MockGateway(_PUBLIC_KEY, _GATEWAY_KEY, seed=1)
+    http_client = _FailingHTTPClient(gateway)
+    client = APIClient(
+        "mid",
+        _PRIVATE_KEY,
+        _GATEWAY_KEY,
+        base_url=f"http://mock{BASE_PATH}",
+        http_client=http_client,
+        retry=_POLICY,
+    )
+    pay_id = client.init_payment("order", 300, "https://shop.com").pay_id
+    gateway.authorize(pay_id)
+    gateway.settle()
+    client.refund_payment(pay_id, 100)
+    http_client.fail = True
+    http_client.methods.clear()
+
+    with pytest.raises(HTTPConnectionError):
+        client.refund_payment(pay_id, 100)
+
+    assert http_client.methods == ["get", "put"]
+    http_client.fail = False
+    client.refund_payment(pay_id, 200)
+    assert gateway.payment_status(pay_id) == PaymentStatus.REFUND_PROCESSING
@@ -0,0 +1,111 @@
+"""Tests for the settlement module."""
+
+import json
+
+import pytest
+
+from csobpg.v19.api import APIClient
+from csobpg.v19.cache import StatusCache
+from csobpg.v19.mock import MockGateway, MockHTTPClient
+from csobpg.v19.response import PaymentStatus
+from csobpg.v19.settlement import Journal, SettlementRunner
+from tests.v19.helpers import CountingHTTPClient, mock_client, mock_gateway
+
+
+@pytest.fixture(name="gateway")
+def _gateway() -> MockGateway:
+    return mock_gateway()
+
+
+def _payments(client: APIClient, gateway: MockGateway, count: int):
+    pay_ids = []
+    for i in range(count):
+        pay_id = client.init_payment(
+            f"order{i}", 300, "https://shop.com", close_payment=False
+        ).pay_id
+        gateway.authorize(pay_id)
+        pay_ids.append(pay_id)
+    return pay_ids
+
+
+def test_settlement(gateway: MockGateway, tmp_path):
+    """Test that payments are closed and the outcomes summarized."""
+    client = mock_client(MockHTTPClient(gateway))
+    pay_ids = _payments(client, gateway, 4)
+    pending = client.init_payment("order", 300, "https://shop.com").pay_id
+    journal = str(tmp_path / "journal.jsonl")
+
+    summary = SettlementRunner(client, journal, concurrency=2).run(
+        [(pay_id, 200) for pay_id in [*pay_ids, pending, pay_ids[0]]]
+    )
+
+    assert summary.statuses == {PaymentStatus.WAITING_SETTLEMENT: 4}
+    assert summary.error_codes == {150: 1}
+    assert summary.total == 5
+    assert str(summary) == (
+        "SettlementSummary(total=5, statuses=[WAITING_SETTLEMENT=4], "
+        "error_codes=[150=1], failed=0, resumed=0)"
+    )
+    assert {
+        pay_id: record["state"]
+        for pay_id, record in Journal(journal).read().items()
+    } == {pay_id: "done" for pay_id in [*pay_ids, pending]}
+
+
+def test_resume(gateway: MockGateway, tmp_path):
+    """Test that a restarted runner continues where it stopped."""
+    http_client = CountingHTTPClient(gateway)
+    client = mock_client(http_client)
+    done, closed, started, new = _payments(client, gateway, 4)
+    client.close_payment(done)
+    client.close_payment(closed)
+    journal = tmp_path / "journal.jsonl"
+    journal.write_text(
+        "\n".join(
+            json.dumps(record)
+            for record in (
+                {"pay_id": done, "state": "started"},
+                {"pay_id": closed, "state": "started"},
+                {"pay_id": started, "state": "started"},
+                {"pay_id": done, "state": "done", "status": 7, "code": 0},
+            )
+        )
+        + '\n{"pay_id": "crashed'
+    )
+    http_client.methods.clear()
+
+    summary = SettlementRunner(client, str(journal)).run(
+        (pay_id, None) for pay_id in (done, closed, started, new)
+    )
+
+    assert summary.statuses == {PaymentStatus.WAITING_SETTLEMENT: 4}
+    assert summary.resumed == 1
+    # closed and started are checked, started and new closed
+    assert sorted(http_client.methods) == ["get", "get", "put", "put"]
+    for pay_id in (started, new):
+        assert gateway.payment_status(pay_id) == (
+            PaymentStatus.WAITING_SETTLEMENT
+        )
+    records = Journal(str(journal)).read()
+    assert {record["state"] for record in records.values()} == {"done"}
+    assert len(records) == 4
+
+
+def test_resume_bypasses_cache(gateway: MockGateway, tmp_path):
+    """Test that a started payment is checked with a fresh status."""
+    http_client = CountingHTTPClient(gateway)
+    client = mock_client(http_client, status_cache=StatusCache())
+    (closed,) = _payments(client, gateway, 1)
+    assert client.get_payment_status(closed).payment_status == (
+        PaymentStatus.CONFIRMED
+    )
+    # closed by the crashed run, the cached status is stale
+    mock_client(MockHTTPClient(gateway)).close_payment(closed)
+    journal = tmp_path / "journal.jsonl"
+    journal.write_text(json.dumps({"pay_id": closed, "state": "started"}))
+    http_client.methods.clear()
+
+    summary = SettlementRunner(client, str(journal)).run([(closed, None)])
+
+    assert summary.statuses == {PaymentStatus.WAITING_SETTLEMENT: 1}
+    assert http_client.methods == ["get"]
@@ -0,0 +1,69 @@
+"""Tests for signatures."""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from csobpg.v19.crypto import PycryptodomeBackend
+from csobpg.v19.key import RAMRSAKey
+from csobpg.v19.signature import SignedModel, sign, verify_many
+
+_PRIVATE_KEY = RAMRSAKey("tests/v19/data/merchant.key")
+_PUBLIC_KEY = RAMRSAKey("tests/v19/data/merchant.pub")
+
+
+class _Model(SignedModel):
+    def __init__(self, *params) -> None:
+        self.params = params
+
+    def _get_params_sequence(self) -> tuple:
+        return self.params
+
+
+def test_sign_text():
+    """Test that nested models are written into the sign text in place."""
+    model = _Model(
+        "a",
+        None,
+        1,
+        True,
+        _Model("b", _Model(), _Model(None), False),
+        _Model(),
+        "c",
+    )
+
+    assert model.to_sign_text() == "a|1|true|b|||false||c"
+    assert _Model().to_sign_text() == ""
+
+
+def _items() -> list:
+    items = [(sign(b"%d" % i, _PRIVATE_KEY), b"%d" % i) for i in range(5)]
+    items[1] = (items[1][0], b"other")
+    items[3] = ("not base64", items[3][1])
+    return items
+
+
+_EXPECTED = [True, False, True, False, True]
+
+
+@pytest.mark.parametrize(
+    "key",
+    [_PUBLIC_KEY, str(_PUBLIC_KEY), PycryptodomeBackend().signer(_PUBLIC_KEY)],
+    ids=["RSAKey", "PEM", "Signer"],
+)
+def test_verify_many(key):
+    """Test verifying many signatures."""
+    assert verify_many(_items(), key) == _EXPECTED
+    assert not verify_many([], key)
+
+
+@pytest.mark.parametrize(
+    "executor_cls", [ThreadPoolExecutor, ProcessPoolExecutor]
+)
+def test_verify_many_executor(executor_cls):
+    """Test verifying many signatures in an executor."""
+    with executor_cls(2) as executor:
+        assert (
+            verify_many(_items(), _PUBLIC_KEY, executor, chunk_size=2)
+            == _EXPECTED
+        )
@@ -0,0 +1,62 @@
+"""Tests for the process pool signer."""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+import pytest
+
+from csobpg.v19.errors import APIInvalidSignatureError
+from csobpg.v19.key import RAMRSAKey
+from csobpg.v19.request import PaymentStatusRequest
+from csobpg.v19.response import PaymentStatusResponse
+from csobpg.v19.signature import sign, verify
+from csobpg.v19.signer import ProcessPoolSigner
+
+_PRIVATE_KEY = RAMRSAKey("tests/v19/data/merchant.key")
+_PUBLIC_KEY = RAMRSAKey("tests/v19/data/merchant.pub")
+
+
+@pytest.fixture(name="pool", scope="module")
+def _pool() -> Iterator[ProcessPoolExecutor]:
+    with ProcessPoolExecutor(2) as pool:
+        yield pool
+
+
+def test_sign_verify(pool: ProcessPoolExecutor):
+    """Test signing and verification in worker processes."""
+    signer = ProcessPoolSigner(_PRIVATE_KEY, pool)
+    verifier = ProcessPoolSigner(_PUBLIC_KEY.parsed, pool)
+
+    signature = sign(b"text", signer)
+    assert signature == sign(b"text", _PRIVATE_KEY)
+    verify(signature, b"text", verifier)
+    with pytest.raises(APIInvalidSignatureError):
+        verify(signature, b"other", verifier)
+
+
+def test_request_response(pool: ProcessPoolExecutor):
+    """Test that requests and responses use the signer transparently."""
+    request = PaymentStatusRequest(
+        "mid", ProcessPoolSigner(_PRIVATE_KEY, pool), "payId"
+    )
+    verify(request.signature, request.to_sign_text().encode(), _PUBLIC_KEY)
+
+    body = {
+        "payId": "payId",
+        "dttm": "dttm",
+        "resultCode": 0,
+        "resultMessage": "OK",
+        "signature": sign(b"payId|dttm|0|OK", _PRIVATE_KEY),
+    }
+    response = PaymentStatusResponse.from_json(
+        body, ProcessPoolSigner(_PUBLIC_KEY, pool)
+    )
+    assert response.pay_id == "payId"
+
+
+def test_own_pool():
+    """Test that the signer shuts down the pool it created."""
+    with ProcessPoolSigner(_PRIVATE_KEY, max_workers=1) as signer:
+        assert sign(b"text", signer)
+    with pytest.raises(RuntimeError):
+        sign(b"text", signer)
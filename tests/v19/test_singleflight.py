@@ -0,0 +1,126 @@
+"""Tests for the singleflight module."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from csobpg.v19.async_api import AsyncAPIClient
+from csobpg.v19.mock.server import BASE_PATH
+from csobpg.v19.singleflight import AsyncSingleFlight, SingleFlight
+from csobpg.v19.transport import ExecutorAsyncHTTPClient
+from tests.v19.helpers import (
+    GATEWAY_KEY,
+    PRIVATE_KEY,
+    CountingHTTPClient,
+    mock_client,
+    mock_gateway,
+)
+
+
+def test_coalesced_threads():
+    """Test that concurrent calls with the same key run once."""
+    flights = SingleFlight()
+    started = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return object()
+
+    with ThreadPoolExecutor(4) as executor:
+        first = executor.submit(flights.do, "key", call)
+        started.wait()
+        others = [executor.submit(flights.do, "key", call) for _ in range(3)]
+        results = {id(f.result()) for f in [first, *others]}
+
+    assert len(calls) == 1
+    assert len(results) == 1
+    assert len(flights) == 0
+    assert flights.do("key", lambda: 1) == 1
+
+
+def test_error_shared():
+    """Test that the error of the call is raised to all callers."""
+    flights = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("failed")
+
+    with ThreadPoolExecutor(2) as executor:
+        first = executor.submit(flights.do, "key", fail)
+        started.wait()
+        second = executor.submit(flights.do, "key", fail)
+        for future in (first, second):
+            with pytest.raises(ValueError):
+                future.result()
+
+
+def test_coalesced_coroutines():
+    """Test that a cancelled waiter does not cancel the call."""
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def run():
+        cancelled = asyncio.ensure_future(flights.do("key", call))
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(flights.do("key", call))
+        other = asyncio.ensure_future(flights.do("other", call))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        return await asyncio.gather(waiting, other)
+
+    assert asyncio.run(run()) == [2, 2]
+    assert len(calls) == 2
+    assert len(flights) == 0
+
+
+def test_client_coalesces():
+    """Test that the client sends concurrent status calls once."""
+    gateway = mock_gateway()
+    http_client = CountingHTTPClient(gateway)
+    client = mock_client(http_client, coalesce=True)
+    pay_id = client.init_payment("order1", 300, "https://shop.com").pay_id
+    gateway.latency = 0.2
+
+    with ThreadPoolExecutor(4) as executor:
+        statuses = list(executor.map(client.get_payment_status, [pay_id] * 4))
+
+    assert len({id(status) for status in statuses}) == 1
+    assert http_client.methods == ["post", "get"]
+
+
+def test_async_client_coalesces():
+    """Test that the asynchronous client sends concurrent echoes once."""
+    gateway = mock_gateway(latency=0.1)
+    http_client = CountingHTTPClient(gateway)
+    client = AsyncAPIClient(
+        "mid",
+        PRIVATE_KEY,
+        GATEWAY_KEY,
+        base_url=f"http://mock{BASE_PATH}",
+        http_client=ExecutorAsyncHTTPClient(http_client),
+        coalesce=True,
+    )
+
+    async def run():
+        async with client:
+            await asyncio.gather(
+                *(client.googlepay_echo() for _ in range(3)),
+                client.applepay_echo(),
+            )
+
+    asyncio.run(run())
+    assert http_client.methods == ["post", "post"]
@@ -0,0 +1,52 @@
+"""Tests for slot-based models and responses."""
+
+import pkgutil
+from importlib import import_module
+
+import pytest
+
+from csobpg.v19 import models, response
+from csobpg.v19.models.cart import CartItem
+from csobpg.v19.signature import SignedModel
+
+# import all models and responses to collect the subclasses
+for _package in (models, response):
+    for _module in pkgutil.walk_packages(
+        _package.__path__, f"{_package.__name__}."
+    ):
+        import_module(_module.name)
+
+
+def _subclasses(cls: type) -> list:
+    return [
+        sub
+        for direct in cls.__subclasses__()
+        for sub in [direct, *_subclasses(direct)]
+    ]
+
+
+@pytest.mark.parametrize(
+    "cls",
+    [
+        cls
+        for cls in _subclasses(SignedModel)
+        if cls.__module__.startswith(
+            ("csobpg.v19.models.", "csobpg.v19.response.")
+        )
+    ],
+    ids=lambda cls: cls.__name__,
+)
+def test_no_instance_dict(cls: type):
+    """Test that instances of models and responses have no __dict__."""
+    assert all("__dict__" not in vars(base) for base in cls.__mro__)
+
+
+def test_fields_validated():
+    """Test that the field descriptors validate slot-based models."""
+    item = CartItem("name", 1, 100)
+
+    with pytest.raises(ValueError):
+        item.quantity = 0
+    assert item.quantity == 1
+    with pytest.raises(AttributeError):
+        item.unknown = 1  # type: ignore  # pylint:disable=W0201
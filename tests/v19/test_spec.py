@@ -0,0 +1,100 @@
+"""Tests for the declarative field specs."""
+
+from enum import Enum
+from typing import Optional
+
+import pytest
+
+from csobpg.v19.mock.gateway import flatten_sign_values
+from csobpg.v19.models import order
+from csobpg.v19.models.currency import Currency
+from csobpg.v19.models.fingerprint import Browser, Fingerprint
+from csobpg.v19.signature import SignedModel
+from csobpg.v19.spec import Field, enum_value
+
+
+class _Color(Enum):
+    RED = "red"
+
+
+class _Inner(SignedModel):
+    _fields = (Field("color", "color", enum_value),)
+
+    def __init__(self, color: Optional[_Color] = None) -> None:
+        self.color = color
+
+
+class _Outer(SignedModel):
+    _fields = (
+        Field("name", "name"),
+        Field("secret"),
+        Field("inner.color", "innerColor", enum_value),
+        Field("size", "size", str),
+        Field("inner", "inner", nested=True),
+        Field("flag", "flag"),
+    )
+
+    def __init__(self, inner: Optional[_Inner] = None, **kwargs) -> None:
+        self.name = kwargs.get("name")
+        self.secret = kwargs.get("secret")
+        self.size = kwargs.get("size")
+        self.flag = kwargs.get("flag")
+        self.inner = inner
+
+
+def test_compiled_model():
+    """Test the sign text and JSON compiled from the fields."""
+    model = _Outer(_Inner(_Color.RED), name="a", secret="s", size=1, flag=0)
+
+    assert model.to_sign_text() == "a|s|red|1|red|0"
+    assert list(model.as_json().items()) == [
+        ("name", "a"),
+        ("innerColor", "red"),
+        ("size", "1"),
+        ("inner", {"color": "red"}),
+        ("flag", 0),
+    ]
+
+
+def test_compiled_model_none():
+    """Test that None values and missing parents are skipped."""
+    model = _Outer(flag=False)
+
+    assert model.to_sign_text() == "false"
+    assert model.as_json() == {"flag": False}
+
+
+def test_model_without_fields():
+    """Test that a model without fields cannot be serialized."""
+
+    class _Empty(SignedModel):
+        pass
+
+    with pytest.raises(TypeError):
+        _Empty().to_sign_text()
+    with pytest.raises(TypeError):
+        _Empty().as_json()
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        order.OrderData(
+            order.OrderType.PURCHASE,
+            delivery=order.DeliveryData(
+                order.DeliveryIndicator.DIGITAL, email="a@b.cz"
+            ),
+            name_match=False,
+            billing=order.AddressData("address", "CZE", "city", "zip"),
+            gift_cards=order.GiftCardsData(100, Currency.CZK, 2),
+        ),
+        Fingerprint(
+            Browser("ua", "*/*", "cs", False, timezone=0, java_enabled=False)
+        ),
+    ],
+)
+def test_json_matches_sign_text(model: SignedModel):
+    """Test that JSON holds the signed values in the sign text order."""
+    assert "|".join(flatten_sign_values(model.as_json())) == (
+        model.to_sign_text()
+    )
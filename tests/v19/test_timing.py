@@ -0,0 +1,142 @@
+"""Tests for the timing module."""
+
+import asyncio
+import json as jsonlib
+from typing import List
+
+import pytest
+from httprest.http.errors import HTTPTimeoutError
+from httprest.http.fake_client import FakeHTTPClient, HTTPResponse
+
+from csobpg.v19.api import APIClient
+from csobpg.v19.async_api import AsyncAPIClient
+from csobpg.v19.errors import APIPaymentNotFoundError
+from csobpg.v19.key import RAMRSAKey
+from csobpg.v19.response import PaymentStatus
+from csobpg.v19.response.payment_status import PaymentStatusResponse
+from csobpg.v19.signature import sign
+from csobpg.v19.timing import CallTiming, HistogramAggregator
+from csobpg.v19.transport import ExecutorAsyncHTTPClient
+
+_PRIVATE_KEY = RAMRSAKey("tests/v19/data/merchant.key")
+_PUBLIC_KEY = RAMRSAKey("tests/v19/data/merchant.pub")
+
+
+def _status_response() -> HTTPResponse:
+    resp = PaymentStatusResponse(
+        "pid", "20240919164156", 0, "OK", PaymentStatus.IN_PROGRESS
+    )
+    data = {
+        "payId": resp.pay_id,
+        "dttm": resp.dttm,
+        "resultCode": resp.result_code,
+        "resultMessage": resp.result_message,
+        "paymentStatus": resp.payment_status.value,  # type: ignore
+        "signature": sign(resp.to_sign_text().encode(), _PRIVATE_KEY),
+    }
+    return HTTPResponse(
+        200,
+        jsonlib.dumps(data).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+
+
+def _client(http_client: FakeHTTPClient, hooks: list) -> APIClient:
+    return APIClient(
+        "mid",
+        _PRIVATE_KEY,
+        _PUBLIC_KEY,
+        "https://api.com",
+        http_client,
+        timing_hooks=hooks,
+    )
+
+
+def test_call_timing():
+    """Test that hooks receive the timing record of each call."""
+    timings: List[CallTiming] = []
+    response = _status_response()
+    client = _client(FakeHTTPClient(responses=[response]), [timings.append])
+
+    client.get_payment_status("pid")
+
+    (timing,) = timings
+    assert timing.operation == "payment/status"
+    assert timing.result_code == 0
+    assert timing.error is None
+    assert timing.sign > 0
+    assert timing.verify > 0
+    assert timing.total >= timing.sign + timing.verify
+    assert timing.request_bytes > 0
+    assert timing.response_bytes == len(response.body)
+
+
+def test_failed_call_timing():
+    """Test that failed calls are timed as well."""
+    timings: List[CallTiming] = []
+    error_response = HTTPResponse(
+        200,
+        b'{"resultCode": 140, "resultMessage": "not found"}',
+        headers={"Content-Type": "application/json"},
+    )
+    client = _client(
+        FakeHTTPClient(
+            responses=[HTTPTimeoutError("timeout"), error_response]
+        ),
+        [],
+    )
+    client.add_timing_hook(timings.append)
+
+    with pytest.raises(HTTPTimeoutError):
+        client.close_payment("pid")
+    with pytest.raises(APIPaymentNotFoundError):
+        client.close_payment("pid")
+
+    assert isinstance(timings[0].error, HTTPTimeoutError)
+    assert timings[0].result_code is None
+    assert isinstance(timings[1].error, APIPaymentNotFoundError)
+    assert timings[1].result_code == 140
+
+
+def test_async_call_timing():
+    """Test that the asynchronous client times calls."""
+    histogram = HistogramAggregator()
+    client = AsyncAPIClient(
+        "mid",
+        _PRIVATE_KEY,
+        _PUBLIC_KEY,
+        "https://api.com",
+        ExecutorAsyncHTTPClient(
+            FakeHTTPClient(responses=[_status_response()])
+        ),
+        timing_hooks=[histogram],
+    )
+
+    asyncio.run(client.get_payment_status("pid"))
+
+    summary = histogram.summary()["payment/status"]
+    assert summary["sign"]["count"] == 1
+    assert summary["verify"]["mean"] > 0
+
+
+def test_histogram():
+    """Test for the histogram aggregator."""
+    histogram = HistogramAggregator(bounds=(0.01, 0.1, 1))
+    for http in (0.005, 0.05, 0.05, 0.5, 5):
+        timing = CallTiming("echo", "post")
+        timing.http = http
+        histogram(timing)
+    timing = CallTiming("echo", "post")
+    timing.error = HTTPTimeoutError("timeout")
+    histogram(timing)
+
+    assert histogram.percentile("echo", "http", 0.5) == 0.1
+    assert histogram.percentile("echo", "http", 1) == 5
+    assert histogram.percentile("echo", "sign", 0.5) == 0
+    summary = histogram.summary()["echo"]
+    assert summary["http"]["count"] == 6
+    assert summary["http"]["max"] == 5
+    assert summary["errors"] == {"count": 1}
+
+    histogram.reset()
+    assert histogram.summary() == {}
@@ -0,0 +1,152 @@
+"""Tests for the pooled HTTP client."""
+
+import json as jsonlib
+import ssl
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List
+
+import pytest
+from httprest.http import errors as http_errors
+
+from csobpg.v19.transport.pool import PooledHTTPClient
+
+_CERT = "tests/v19/data/server.crt"
+_KEY = "tests/v19/data/server.key"
+
+
+class _Server(ThreadingHTTPServer):
+    """HTTPS server which tracks the accepted connections."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(_CERT, _KEY)
+        self.socket = context.wrap_socket(self.socket, server_side=True)
+        self.connections: List[ssl.SSLSocket] = []
+        self.sessions_reused: List[bool] = []
+        self.bodies: List[dict] = []
+
+    def get_request(self):
+        request = super().get_request()
+        self.connections.append(request[0])
+        # the handshake is done on accept. The attribute is None once the
+        # socket is closed, so record it now
+        self.sessions_reused.append(request[0].session_reused)
+        return request
+
+    @property
+    def url(self) -> str:
+        """Return the server URL."""
+        return f"https://localhost:{self.server_port}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_PUT(self):  # pylint:disable=invalid-name
+        """Echo the JSON body, or drop the connection if asked to."""
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        data = jsonlib.loads(body)
+        self.server.bodies.append(data)
+        if data.get("drop"):
+            self.close_connection = True
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_):
+        pass
+
+
+@pytest.fixture(name="server")
+def _server() -> Iterator[_Server]:
+    server = _Server()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(**kwargs) -> PooledHTTPClient:
+    return PooledHTTPClient(
+        ssl_context=ssl.create_default_context(cafile=_CERT), **kwargs
+    )
+
+
+def test_connection_reuse(server: _Server):
+    """Test that a single connection is used for sequential requests."""
+    with _client() as client:
+        for i in range(3):
+            response = client.request("put", server.url, json={"i": i})
+            assert response.json == {"i": i}
+
+    assert len(server.connections) == 1
+
+
+def test_no_keep_alive(server: _Server):
+    """Test that connections are not reused if keep-alive is disabled."""
+    with _client(keep_alive=False) as client:
+        for i in range(3):
+            client.request("put", server.url, json={"i": i})
+
+    assert len(server.connections) == 3
+
+
+def test_tls_session_reuse(server: _Server):
+    """Test that new connections resume the TLS session."""
+    with _client() as client:
+        client.request("put", server.url, json={"i": 1})
+        client.close()
+        client.request("put", server.url, json={"i": 2})
+
+    assert server.sessions_reused == [False, True]
+
+
+def test_max_connections_per_host(server: _Server):
+    """Test that the number of connections per host is limited."""
+    with _client(max_connections_per_host=2) as client:
+        threads = [
+            threading.Thread(
+                target=client.request,
+                args=("put", server.url),
+                kwargs={"json": {"i": i}},
+            )
+            for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(server.connections) <= 2
+
+
+def test_stale_connection_is_replaced(server: _Server):
+    """Test that a connection closed by the server is transparently replaced."""
+    with _client() as client:
+        client.request("put", server.url, json={"i": 1})
+        for conn in server.connections:
+            conn.shutdown(2)
+            conn.close()
+
+        response = client.request("put", server.url, json={"i": 2})
+
+    assert jsonlib.loads(response.body) == {"i": 2}
+    assert len(server.connections) == 2
+
+
+def test_sent_request_not_repeated(server: _Server):
+    """Test that a PUT is not sent again if its connection was dropped."""
+    with _client() as client:
+        client.request("put", server.url, json={"i": 1})
+        with pytest.raises(http_errors.HTTPConnectionError):
+            client.request("put", server.url, json={"drop": True})
+
+    assert server.bodies == [{"i": 1}, {"drop": True}]
+    assert len(server.connections) == 1